@@ -0,0 +1,49 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+class ArchiveCompoundsModel(QAbstractTableModel):
+    HEADERS = ["Название", "Формула", "Молярная масса", "Дата создания", "Теги"]
+
+    def __init__(self, archive, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+
+    def set_archive(self, archive):
+        self.beginResetModel()
+        self.archive = archive
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.archive is None:
+            return 0
+        return len(self.archive)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or self.archive is None or index.row() >= len(self.archive):
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return self.archive.string('name', row)
+            if column == 1:
+                return self.archive.string('formula', row)
+            if column == 2:
+                return f"{self.archive.molar_masses[row]:.4f} г/моль"
+            if column == 3:
+                return self.archive.string('created_date', row)
+            return self.archive.string('tags', row)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.archive.composition_string(row)
+        if role == Qt.ItemDataRole.UserRole:
+            return self.archive.row(row)
+        return None
\ No newline at end of file
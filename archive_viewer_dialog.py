@@ -0,0 +1,67 @@
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableView, QPushButton, QHeaderView, QMessageBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from archive_compounds_model import ArchiveCompoundsModel
+from compound_archive import CompoundArchive
+
+class ArchiveViewerDialog(QDialog):
+    def __init__(self, db_manager, filename, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.filename = filename
+        self.imported = 0
+        started = time.perf_counter()
+        self.archive = CompoundArchive(filename)
+        self.open_time = time.perf_counter() - started
+        self.setWindowTitle("Архив соединений")
+        self.resize(800, 500)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        title_label = QLabel(f"Архив соединений: {self.filename}")
+        title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.model = ArchiveCompoundsModel(self.archive, self)
+        self.compounds_view = QTableView()
+        self.compounds_view.setModel(self.model)
+        self.compounds_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.compounds_view.verticalHeader().setDefaultSectionSize(self.compounds_view.fontMetrics().height() + 6)
+        self.compounds_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.stats_label = QLabel(f"Соединений: {len(self.archive)}, открыт за {self.open_time * 1000:.1f} мс")
+        self.import_button = QPushButton("Импортировать в мои соединения")
+        self.import_button.clicked.connect(self.import_archive)
+        self.close_button = QPushButton("Закрыть")
+        self.close_button.clicked.connect(self.close)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.stats_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.close_button)
+        layout.addWidget(title_label)
+        layout.addWidget(self.compounds_view)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def import_archive(self):
+        reply = QMessageBox.question(
+            self, "Подтверждение",
+            f"Импортировать {len(self.archive)} соединений в базу?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        result = self.db_manager.import_compound_archive(self.filename)
+        if result >= 0:
+            self.imported = result
+            self.import_button.setEnabled(False)
+            QMessageBox.information(self, "Успех", f"Импортировано соединений: {result}")
+        else:
+            QMessageBox.warning(self, "Ошибка", "Не удалось импортировать архив соединений!")
+
+    def done(self, result):
+        self.model.set_archive(None)
+        self.archive.close()
+        super().done(result)
\ No newline at end of file
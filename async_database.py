@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+
+class DatabaseWorker(QThread):
+    completed = pyqtSignal(str, object, object)
+    failed = pyqtSignal(str, object, str)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.pending = OrderedDict()
+        self.condition = threading.Condition()
+        self.stopping = False
+
+    def submit(self, key, operation, args, callback):
+        with self.condition:
+            coalesced = key in self.pending
+            self.pending[key] = (operation, args, callback)
+            self.condition.notify()
+        return not coalesced
+
+    def stop(self):
+        with self.condition:
+            self.stopping = True
+            self.pending.clear()
+            self.condition.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopping:
+                    self.condition.wait()
+                if self.stopping:
+                    return
+                key, (operation, args, callback) = self.pending.popitem(last=False)
+            try:
+                function = operation if callable(operation) else getattr(self.db_manager, operation)
+                result = function(*args)
+            except Exception as error:
+                self.failed.emit(key, callback, str(error))
+                continue
+            self.completed.emit(key, callback, result)
+
+class AsyncDatabase(QObject):
+    loading = pyqtSignal(str, bool)
+    failed = pyqtSignal(str, str)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.outstanding = {}
+        self.worker = DatabaseWorker(db_manager)
+        self.worker.completed.connect(self.on_completed)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def request(self, key, operation, *args, callback):
+        if not self.worker.submit(key, operation, args, callback):
+            return
+        self.outstanding[key] = self.outstanding.get(key, 0) + 1
+        if self.outstanding[key] == 1:
+            self.loading.emit(key, True)
+
+    def is_loading(self, key):
+        return self.outstanding.get(key, 0) > 0
+
+    def finish(self, key):
+        self.outstanding[key] -= 1
+        if self.outstanding[key] > 0:
+            return False
+        del self.outstanding[key]
+        self.loading.emit(key, False)
+        return True
+
+    def on_completed(self, key, callback, result):
+        if self.finish(key):
+            callback(result)
+
+    def on_failed(self, key, callback, message):
+        if self.finish(key):
+            self.failed.emit(key, message)
+
+    def get_all_elements(self, key, callback):
+        self.request(key, 'get_all_elements', callback=callback)
+
+    def get_element_records(self, key, callback):
+        self.request(key, 'get_element_records', callback=callback)
+
+    def search_elements(self, key, query, callback):
+        self.request(key, 'search_elements', query, callback=callback)
+
+    def get_saved_compounds(self, key, callback):
+        self.request(key, 'get_saved_compounds', callback=callback)
+
+    def find_compounds_by_mass_percent(self, key, ranges, callback):
+        self.request(key, 'find_compounds_by_mass_percent', ranges, callback=callback)
+
+    def stop(self):
+        self.worker.stop()
\ No newline at end of file
@@ -0,0 +1,104 @@
+from collections import ChainMap, namedtuple
+from itertools import islice
+import numpy as np
+from formula_parser import parse_composition
+from uncertainty import UncertaintyCalculator
+
+BASE_DATASET = 0
+
+AtomicWeights = namedtuple('AtomicWeights', ['dataset_id', 'name', 'masses', 'uncertainties'])
+DatasetComparison = namedtuple('DatasetComparison', ['source', 'compound_id', 'name', 'formula', 'first_mass', 'second_mass', 'difference', 'ppm'])
+
+class AtomicWeightLibrary:
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.reload()
+
+    def reload(self):
+        self.base_masses = self.db_manager.get_atomic_masses()
+        self.base_uncertainties = self.db_manager.get_atomic_mass_uncertainties()
+        self.datasets = {}
+        self.layers = {}
+        for dataset_id, name, version, base_id, description, created_date, overrides in self.db_manager.get_atomic_weight_datasets():
+            self.datasets[dataset_id] = (f"{name} {version}".strip(), base_id)
+            self.layers[dataset_id] = ({}, {})
+        for dataset_id, symbol, atomic_mass, uncertainty in self.db_manager.get_atomic_weight_overrides():
+            if dataset_id in self.layers:
+                self.layers[dataset_id][0][symbol] = atomic_mass
+                self.layers[dataset_id][1][symbol] = uncertainty
+        self.views = {}
+        self.active = self.weights(self.active_dataset_id())
+
+    def active_dataset_id(self):
+        dataset_id = int(self.db_manager.get_setting('active_dataset', BASE_DATASET))
+        return dataset_id if dataset_id in self.datasets else BASE_DATASET
+
+    def dataset_name(self, dataset_id):
+        if dataset_id == BASE_DATASET:
+            return "Таблица элементов"
+        return self.datasets[dataset_id][0]
+
+    def chain(self, dataset_id):
+        chain = []
+        while dataset_id in self.datasets and dataset_id not in chain:
+            chain.append(dataset_id)
+            dataset_id = self.datasets[dataset_id][1]
+        return chain
+
+    def weights(self, dataset_id):
+        if dataset_id not in self.views:
+            chain = self.chain(dataset_id)
+            masses = ChainMap(*[self.layers[layer][0] for layer in chain], self.base_masses)
+            uncertainties = ChainMap(*[self.layers[layer][1] for layer in chain], self.base_uncertainties)
+            self.views[dataset_id] = AtomicWeights(dataset_id, self.dataset_name(dataset_id), masses, uncertainties)
+        return self.views[dataset_id]
+
+    def activate(self, dataset_id):
+        self.active = self.weights(dataset_id)
+        self.db_manager.set_setting('active_dataset', dataset_id)
+        return self.active
+
+    def set_override(self, dataset_id, symbol, atomic_mass, uncertainty=0.0):
+        symbol = symbol.upper()
+        if not self.db_manager.set_atomic_weight(dataset_id, symbol, atomic_mass, uncertainty):
+            return False
+        self.layers[dataset_id][0][symbol] = atomic_mass
+        self.layers[dataset_id][1][symbol] = uncertainty
+        return True
+
+    def remove_override(self, dataset_id, symbol):
+        self.db_manager.remove_atomic_weight(dataset_id, symbol)
+        self.layers[dataset_id][0].pop(symbol, None)
+        self.layers[dataset_id][1].pop(symbol, None)
+
+    def source_of(self, dataset_id, symbol):
+        for layer in self.chain(dataset_id):
+            if symbol in self.layers[layer][0]:
+                return layer
+        return BASE_DATASET
+
+    def compare(self, first_id, second_id, compounds, block_size=50000):
+        first = self.weights(first_id)
+        second = self.weights(second_id)
+        calculator = UncertaintyCalculator(first.masses, first.uncertainties)
+        second_masses = np.array([second.masses.get(symbol, np.nan) for symbol in calculator.symbols])
+        missing_symbols = np.isnan(second_masses)
+        second_masses[missing_symbols] = 0.0
+        compounds = iter(compounds)
+        results = []
+        while True:
+            block = list(islice(compounds, block_size))
+            if not block:
+                break
+            counts, valid = calculator.composition_matrix([parse_composition(compound[4]) for compound in block])
+            first_values = counts @ calculator.masses
+            second_values = counts @ second_masses
+            first_values[~valid] = np.nan
+            second_values[~valid | ((counts != 0) & missing_symbols).any(axis=1)] = np.nan
+            differences = second_values - first_values
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ppm = differences / first_values * 1e6
+            results.extend(DatasetComparison(compound[0], compound[1], compound[2], compound[3], first_value, second_value, difference, part)
+                           for compound, first_value, second_value, difference, part
+                           in zip(block, first_values.tolist(), second_values.tolist(), differences.tolist(), ppm.tolist()))
+        return results
\ No newline at end of file
@@ -0,0 +1,300 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QTableView, QPushButton,
+                             QHeaderView, QComboBox, QListWidget, QListWidgetItem,
+                             QTabWidget, QWidget, QSplitter, QMessageBox,
+                             QInputDialog, QFileDialog, QCheckBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QColor
+from atomic_weights import BASE_DATASET
+from comparison_model import DatasetComparisonModel
+from comparison_worker import DatasetComparisonWorker
+
+class AtomicWeightsDialog(QDialog):
+    def __init__(self, db_manager, library, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.library = library
+        self.parent = parent
+        self.updating_table = False
+        self.comparison_worker = None
+        self.setWindowTitle("Наборы атомных масс")
+        self.resize(900, 550)
+        self.init_ui()
+        self.load_datasets()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        title_label = QLabel("Наборы атомных масс")
+        title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.tab_widget = QTabWidget()
+        self.tab_widget.addTab(self.create_datasets_tab(), "Наборы")
+        self.tab_widget.addTab(self.create_compare_tab(), "Сравнение")
+        self.close_button = QPushButton("Закрыть")
+        self.close_button.clicked.connect(self.close)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+        layout.addWidget(title_label)
+        layout.addWidget(self.tab_widget)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def create_datasets_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout()
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.datasets_list = QListWidget()
+        self.datasets_list.currentItemChanged.connect(self.show_dataset)
+        self.weights_table = QTableWidget()
+        self.weights_table.setColumnCount(4)
+        self.weights_table.setHorizontalHeaderLabels(["Символ", "Атомная масса", "Погрешность", "Источник"])
+        self.weights_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.weights_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.weights_table.itemChanged.connect(self.on_weight_changed)
+        splitter.addWidget(self.datasets_list)
+        splitter.addWidget(self.weights_table)
+        splitter.setSizes([250, 650])
+        button_layout = QHBoxLayout()
+        self.activate_button = QPushButton("Сделать активным")
+        self.activate_button.clicked.connect(self.activate_dataset)
+        self.create_button = QPushButton("Новый набор...")
+        self.create_button.clicked.connect(self.create_dataset)
+        self.import_button = QPushButton("Импорт CSV...")
+        self.import_button.clicked.connect(self.import_dataset)
+        self.delete_button = QPushButton("Удалить набор")
+        self.delete_button.clicked.connect(self.delete_dataset)
+        self.reset_button = QPushButton("Сбросить значение")
+        self.reset_button.clicked.connect(self.reset_weights)
+        button_layout.addWidget(self.activate_button)
+        button_layout.addWidget(self.create_button)
+        button_layout.addWidget(self.import_button)
+        button_layout.addWidget(self.delete_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.reset_button)
+        layout.addWidget(splitter)
+        layout.addLayout(button_layout)
+        tab.setLayout(layout)
+        return tab
+
+    def create_compare_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout()
+        options_layout = QHBoxLayout()
+        self.first_combo = QComboBox()
+        self.second_combo = QComboBox()
+        self.changed_only_check = QCheckBox("Только изменившиеся")
+        self.changed_only_check.setChecked(True)
+        self.compare_button = QPushButton("Сравнить")
+        self.compare_button.clicked.connect(self.compare_datasets)
+        options_layout.addWidget(QLabel("Набор A:"))
+        options_layout.addWidget(self.first_combo)
+        options_layout.addWidget(QLabel("Набор B:"))
+        options_layout.addWidget(self.second_combo)
+        options_layout.addWidget(self.changed_only_check)
+        options_layout.addWidget(self.compare_button)
+        self.compare_model = DatasetComparisonModel(self)
+        self.compare_table = QTableView()
+        self.compare_table.setModel(self.compare_model)
+        self.compare_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.compare_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.compare_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.compare_stats_label = QLabel()
+        layout.addLayout(options_layout)
+        layout.addWidget(self.compare_table)
+        layout.addWidget(self.compare_stats_label)
+        tab.setLayout(layout)
+        return tab
+
+    def dataset_ids(self):
+        return [BASE_DATASET] + sorted(self.library.datasets, key=self.library.dataset_name)
+
+    def load_datasets(self, selected_id=None):
+        if selected_id is None:
+            selected_id = self.current_dataset_id()
+        self.datasets_list.clear()
+        for combo in (self.first_combo, self.second_combo):
+            combo.clear()
+        for dataset_id in self.dataset_ids():
+            name = self.library.dataset_name(dataset_id)
+            label = f"{name} (активный)" if dataset_id == self.library.active.dataset_id else name
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, dataset_id)
+            self.datasets_list.addItem(item)
+            if dataset_id == selected_id:
+                self.datasets_list.setCurrentItem(item)
+            self.first_combo.addItem(name, dataset_id)
+            self.second_combo.addItem(name, dataset_id)
+        if self.datasets_list.currentItem() is None:
+            self.datasets_list.setCurrentRow(0)
+        self.second_combo.setCurrentIndex(self.second_combo.findData(self.library.active.dataset_id))
+
+    def current_dataset_id(self):
+        item = self.datasets_list.currentItem()
+        return item.data(Qt.ItemDataRole.UserRole) if item else self.library.active.dataset_id
+
+    def show_dataset(self, item=None, previous=None):
+        dataset_id = self.current_dataset_id()
+        weights = self.library.weights(dataset_id)
+        symbols = sorted(weights.masses)
+        self.updating_table = True
+        self.weights_table.setRowCount(len(symbols))
+        editable = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+        if dataset_id != BASE_DATASET:
+            editable |= Qt.ItemFlag.ItemIsEditable
+        for row, symbol in enumerate(symbols):
+            source = self.library.source_of(dataset_id, symbol)
+            symbol_item = QTableWidgetItem(symbol)
+            symbol_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
+            mass_item = QTableWidgetItem(f"{weights.masses[symbol]:.6f}")
+            mass_item.setFlags(editable)
+            uncertainty_item = QTableWidgetItem(f"{weights.uncertainties.get(symbol, 0.0):.6f}")
+            uncertainty_item.setFlags(editable)
+            source_item = QTableWidgetItem(self.library.dataset_name(source))
+            source_item.setFlags(Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled)
+            if source == dataset_id and dataset_id != BASE_DATASET:
+                for cell in (mass_item, uncertainty_item, source_item):
+                    cell.setForeground(QColor("#1565c0"))
+            self.weights_table.setItem(row, 0, symbol_item)
+            self.weights_table.setItem(row, 1, mass_item)
+            self.weights_table.setItem(row, 2, uncertainty_item)
+            self.weights_table.setItem(row, 3, source_item)
+        self.updating_table = False
+        self.delete_button.setEnabled(dataset_id != BASE_DATASET)
+        self.reset_button.setEnabled(dataset_id != BASE_DATASET)
+
+    def on_weight_changed(self, item):
+        if self.updating_table or item.column() not in (1, 2):
+            return
+        dataset_id = self.current_dataset_id()
+        row = item.row()
+        symbol = self.weights_table.item(row, 0).text()
+        try:
+            atomic_mass = float(self.weights_table.item(row, 1).text().replace(',', '.'))
+            uncertainty = float(self.weights_table.item(row, 2).text().replace(',', '.'))
+        except ValueError:
+            QMessageBox.warning(self, "Ошибка", "Атомная масса и погрешность должны быть числами!")
+            self.show_dataset()
+            return
+        if atomic_mass <= 0 or uncertainty < 0:
+            QMessageBox.warning(self, "Ошибка", "Атомная масса должна быть положительной, погрешность неотрицательной!")
+            self.show_dataset()
+            return
+        if not self.library.set_override(dataset_id, symbol, atomic_mass, uncertainty):
+            QMessageBox.warning(self, "Ошибка", "Не удалось сохранить значение!")
+        self.show_dataset()
+        self.notify_changed()
+
+    def reset_weights(self):
+        dataset_id = self.current_dataset_id()
+        rows = sorted({index.row() for index in self.weights_table.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.warning(self, "Ошибка", "Выберите элементы для сброса!")
+            return
+        for row in rows:
+            self.library.remove_override(dataset_id, self.weights_table.item(row, 0).text())
+        self.show_dataset()
+        self.notify_changed()
+
+    def ask_dataset_name(self, title):
+        name, ok = QInputDialog.getText(self, title, "Название набора:")
+        if not ok or not name.strip():
+            return None
+        version, ok = QInputDialog.getText(self, title, "Версия (например, 2021):")
+        if not ok:
+            return None
+        return name.strip(), version.strip()
+
+    def base_for_new_dataset(self):
+        dataset_id = self.current_dataset_id()
+        return None if dataset_id == BASE_DATASET else dataset_id
+
+    def create_dataset(self):
+        result = self.ask_dataset_name("Новый набор")
+        if result is None:
+            return
+        base_id = self.base_for_new_dataset()
+        dataset_id = self.db_manager.create_atomic_weight_dataset(result[0], result[1], base_id,
+                                                                  f"На основе: {self.library.dataset_name(base_id or BASE_DATASET)}")
+        if dataset_id is None:
+            QMessageBox.warning(self, "Ошибка", "Набор с таким названием и версией уже существует!")
+            return
+        self.library.reload()
+        self.load_datasets(dataset_id)
+
+    def import_dataset(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Импорт набора атомных масс", "", "CSV Files (*.csv)")
+        if not filename:
+            return
+        result = self.ask_dataset_name("Импорт набора")
+        if result is None:
+            return
+        count = self.db_manager.import_atomic_weight_dataset(filename, result[0], result[1], self.base_for_new_dataset(), f"Импорт из {filename}")
+        if count < 0:
+            QMessageBox.warning(self, "Ошибка", "Не удалось импортировать набор атомных масс!")
+            return
+        self.library.reload()
+        self.load_datasets()
+        QMessageBox.information(self, "Успех", f"Импортировано значений: {count}")
+
+    def delete_dataset(self):
+        dataset_id = self.current_dataset_id()
+        if dataset_id == BASE_DATASET:
+            return
+        reply = QMessageBox.question(
+            self, "Подтверждение",
+            f"Удалить набор '{self.library.dataset_name(dataset_id)}'? Производные наборы будут опираться на его основу.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        was_active = dataset_id == self.library.active.dataset_id
+        self.db_manager.delete_atomic_weight_dataset(dataset_id)
+        self.library.reload()
+        self.load_datasets(BASE_DATASET)
+        if was_active:
+            self.notify_changed()
+
+    def activate_dataset(self):
+        self.library.activate(self.current_dataset_id())
+        self.load_datasets()
+        self.notify_changed()
+
+    def notify_changed(self):
+        if self.parent:
+            self.parent.on_atomic_weights_changed()
+
+    def compare_datasets(self):
+        if self.comparison_worker is not None:
+            return
+        first_id = self.first_combo.currentData()
+        second_id = self.second_combo.currentData()
+        self.library.weights(first_id)
+        self.library.weights(second_id)
+        self.comparison_worker = DatasetComparisonWorker(self.db_manager, self.library, first_id, second_id,
+                                                         self.changed_only_check.isChecked(), self)
+        self.comparison_worker.compared.connect(self.on_datasets_compared)
+        self.comparison_worker.failed.connect(self.on_comparison_failed)
+        self.comparison_worker.finished.connect(self.on_comparison_finished)
+        self.compare_button.setEnabled(False)
+        self.compare_stats_label.setText("Сравнение...")
+        self.comparison_worker.start()
+
+    def on_datasets_compared(self, total, results):
+        self.compare_model.set_results(results)
+        self.compare_stats_label.setText(f"Соединений в библиотеке: {total}, показано: {len(results)}")
+
+    def on_comparison_failed(self, message):
+        self.compare_stats_label.setText("")
+        QMessageBox.warning(self, "Ошибка", f"Не удалось сравнить наборы: {message}")
+
+    def on_comparison_finished(self):
+        self.compare_button.setEnabled(True)
+        self.comparison_worker.deleteLater()
+        self.comparison_worker = None
+
+    def done(self, result):
+        if self.comparison_worker is not None:
+            self.comparison_worker.requestInterruption()
+            self.comparison_worker.wait()
+        super().done(result)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+
+REQUIRED_TABLES = ('elements', 'saved_compounds', 'common_compounds')
+
+class BackupManager:
+    def __init__(self, db_name="chemical_elements.db", backup_dir=None, schema_version=None, pages=256, sleep=0.005, keep=24):
+        self.db_name = db_name
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(db_name)), 'backups')
+        self.schema_version = schema_version
+        self.pages = pages
+        self.sleep = sleep
+        self.keep = keep
+
+    def snapshot_prefix(self):
+        return os.path.splitext(os.path.basename(self.db_name))[0] + '-'
+
+    def snapshot_name(self):
+        base = os.path.join(self.backup_dir, self.snapshot_prefix() + datetime.now().strftime('%Y%m%d-%H%M%S'))
+        filename = base + '.db'
+        suffix = 1
+        while os.path.exists(filename):
+            filename = f"{base}-{suffix}.db"
+            suffix += 1
+        return filename
+
+    def backup(self, filename=None, progress=None):
+        if filename is None:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            filename = self.snapshot_name()
+        partial = filename + '.part'
+        source = sqlite3.connect(self.db_name, timeout=30)
+        target = sqlite3.connect(partial)
+        try:
+            source.backup(target, pages=self.pages, progress=progress, sleep=self.sleep)
+        except Exception:
+            target.close()
+            os.remove(partial)
+            raise
+        finally:
+            source.close()
+        target.close()
+        os.replace(partial, filename)
+        return filename
+
+    def snapshot(self, progress=None):
+        filename = self.backup(progress=progress)
+        self.prune()
+        return filename
+
+    def list_snapshots(self):
+        if not os.path.isdir(self.backup_dir):
+            return []
+        prefix = self.snapshot_prefix()
+        snapshots = [os.path.join(self.backup_dir, name) for name in os.listdir(self.backup_dir)
+                     if name.startswith(prefix) and name.endswith('.db')]
+        return sorted(snapshots, key=os.path.getmtime, reverse=True)
+
+    def prune(self, keep=None):
+        keep = self.keep if keep is None else keep
+        removed = []
+        for filename in self.list_snapshots()[keep:]:
+            os.remove(filename)
+            removed.append(filename)
+        return removed
+
+    def check(self, filename):
+        if not os.path.isfile(filename):
+            return ["Файл не найден"]
+        problems = []
+        conn = sqlite3.connect(Path(filename).absolute().as_uri() + '?mode=ro', uri=True)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('PRAGMA integrity_check')
+            result = [row[0] for row in cursor.fetchall()]
+            if result != ['ok']:
+                problems.extend(result)
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            problems.extend(f"Нет таблицы {table}" for table in REQUIRED_TABLES if table not in tables)
+            cursor.execute('PRAGMA user_version')
+            version = cursor.fetchone()[0]
+            if self.schema_version is not None and version > self.schema_version:
+                problems.append(f"Версия схемы {version} новее поддерживаемой ({self.schema_version})")
+        except sqlite3.DatabaseError as error:
+            problems.append(str(error))
+        finally:
+            conn.close()
+        return problems
+
+    def restore(self, filename, progress=None):
+        problems = self.check(filename)
+        if problems:
+            return problems
+        if os.path.exists(self.db_name):
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self.backup(self.snapshot_name())
+        source = sqlite3.connect(Path(filename).absolute().as_uri() + '?mode=ro', uri=True)
+        target = sqlite3.connect(self.db_name, timeout=30)
+        try:
+            source.backup(target, progress=progress)
+        finally:
+            source.close()
+            target.close()
+        return []
+
+def main():
+    parser = argparse.ArgumentParser(description="Резервное копирование базы данных калькулятора")
+    parser.add_argument('--db', default='chemical_elements.db', help="файл базы данных")
+    parser.add_argument('--dir', default=None, help="каталог снимков (по умолчанию backups рядом с базой)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    backup_parser = subparsers.add_parser('backup', help="создать копию базы")
+    backup_parser.add_argument('-o', '--output', default=None, help="файл копии (по умолчанию новый снимок)")
+    backup_parser.add_argument('--keep', type=int, default=24, help="сколько снимков хранить")
+    backup_parser.add_argument('--pages', type=int, default=256, help="страниц за один шаг копирования")
+    subparsers.add_parser('list', help="список снимков")
+    check_parser = subparsers.add_parser('check', help="проверить копию")
+    check_parser.add_argument('file', help="файл копии")
+    restore_parser = subparsers.add_parser('restore', help="восстановить базу из копии")
+    restore_parser.add_argument('file', help="файл копии")
+    args = parser.parse_args()
+    from database_manager import DatabaseManager
+    db_manager = DatabaseManager(args.db)
+    manager = BackupManager(args.db, args.dir, db_manager.schema_version())
+    if args.command == 'backup':
+        manager.pages = args.pages
+        manager.keep = args.keep
+        filename = manager.backup(args.output) if args.output else manager.snapshot()
+        print(f"Копия сохранена: {filename}")
+    elif args.command == 'list':
+        for filename in manager.list_snapshots():
+            print(f"{datetime.fromtimestamp(os.path.getmtime(filename)):%Y-%m-%d %H:%M:%S}  {os.path.getsize(filename):>10}  {filename}")
+    else:
+        problems = manager.check(args.file) if args.command == 'check' else manager.restore(args.file)
+        if problems:
+            for problem in problems:
+                print(problem, file=sys.stderr)
+            sys.exit(1)
+        if args.command == 'restore':
+            db_manager.migrate_database()
+            print(f"База восстановлена из {args.file}")
+        else:
+            print("Копия исправна")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
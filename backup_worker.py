@@ -0,0 +1,20 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class BackupWorker(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, operation, *args, parent=None):
+        super().__init__(parent)
+        self.operation = operation
+        self.args = args
+
+    def report_progress(self, status, remaining, total):
+        self.progress.emit(total - remaining, total)
+
+    def run(self):
+        try:
+            self.completed.emit(self.operation(*self.args, progress=self.report_progress))
+        except Exception as error:
+            self.failed.emit(str(error))
\ No newline at end of file
@@ -0,0 +1,221 @@
+import argparse
+import os
+import sys
+from collections import deque, namedtuple
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from formula_parser import FormulaError, parse_formula, parse_composition, format_composition
+from uncertainty import UncertaintyCalculator, ANALYTIC, MONTE_CARLO
+from compound_archive import CompoundArchive, ARCHIVE_EXTENSION
+from molecule_reader import MOLECULE_EXTENSIONS, read_molecule_file
+from report_generator import ReportGenerator, records_from_batch_results, element_table_from_rows, report_format_for
+
+BatchResult = namedtuple('BatchResult', ['line_number', 'name', 'formula', 'molar_mass', 'composition', 'error', 'uncertainty'])
+
+_worker_shm = None
+_worker_calculator = None
+_worker_method = ANALYTIC
+
+def _init_worker(shm_name, symbols, method, samples):
+    global _worker_shm, _worker_calculator, _worker_method
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    values = np.frombuffer(_worker_shm.buf, dtype=np.float64, count=2 * len(symbols))
+    _worker_calculator = UncertaintyCalculator.from_arrays(symbols, values[:len(symbols)], values[len(symbols):], samples=samples)
+    _worker_method = method
+
+def parse_batch_line(line):
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    for separator in ('\t', ';'):
+        if separator in line:
+            name, formula = line.split(separator, 1)
+            return name.strip(), formula.strip()
+    return line, line
+
+def calculate_records(records, calculator, method=ANALYTIC):
+    results = [None] * len(records)
+    parsed = []
+    for i, (line_number, name, formula) in enumerate(records):
+        try:
+            composition = parse_formula(formula)
+            for symbol in composition:
+                if symbol not in calculator.columns:
+                    raise FormulaError(f"Элемент '{symbol}' не найден в базе данных")
+        except FormulaError as e:
+            results[i] = BatchResult(line_number, name, formula, None, None, str(e), None)
+            continue
+        parsed.append((i, composition))
+    if parsed:
+        counts, _ = calculator.composition_matrix([composition for _, composition in parsed])
+        values, sigmas = calculator.analytic(counts)
+        if method == MONTE_CARLO:
+            sigmas = calculator.monte_carlo(counts)[1]
+        for (i, composition), value, sigma in zip(parsed, values.tolist(), sigmas.tolist()):
+            line_number, name, formula = records[i]
+            results[i] = BatchResult(line_number, name, formula, value, format_composition(composition), None, sigma)
+    return results
+
+def calculate_chunk(first_line_number, lines):
+    records = []
+    for line_number, line in enumerate(lines, first_line_number):
+        record = parse_batch_line(line)
+        if record is not None:
+            records.append((line_number, record[0], record[1]))
+    return calculate_records(records, _worker_calculator, _worker_method)
+
+class BatchCalculator:
+    def __init__(self, atomic_masses, workers=None, chunk_size=2000, max_pending=None,
+                 uncertainties=None, method=ANALYTIC, samples=10000):
+        self.atomic_masses = atomic_masses
+        self.uncertainties = uncertainties or {}
+        self.method = method
+        self.samples = samples
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+
+    def read_chunks(self, lines):
+        first_line_number = 1
+        chunk = []
+        for line in lines:
+            chunk.append(line)
+            if len(chunk) >= self.chunk_size:
+                yield first_line_number, chunk
+                first_line_number += len(chunk)
+                chunk = []
+        if chunk:
+            yield first_line_number, chunk
+
+    def calculate(self, lines):
+        symbols = list(self.atomic_masses)
+        values = np.array([self.atomic_masses[symbol] for symbol in symbols]
+                          + [self.uncertainties.get(symbol, 0.0) for symbol in symbols], dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            shm.buf[:values.nbytes] = values.tobytes()
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(shm.name, symbols, self.method, self.samples)) as executor:
+                pending = deque()
+                for first_line_number, chunk in self.read_chunks(lines):
+                    if len(pending) >= self.max_pending:
+                        yield from pending.popleft().result()
+                    pending.append(executor.submit(calculate_chunk, first_line_number, chunk))
+                while pending:
+                    yield from pending.popleft().result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def calculate_archive(self, archive):
+        values, sigmas, valid = archive.calculate(self.atomic_masses, self.uncertainties)
+        calculator = UncertaintyCalculator(self.atomic_masses, self.uncertainties, samples=self.samples) if self.method == MONTE_CARLO else None
+        for start in range(0, len(archive), self.chunk_size):
+            stop = min(start + self.chunk_size, len(archive))
+            rows = list(archive.iter_rows(start, stop))
+            block_sigmas = sigmas[start:stop].tolist()
+            if calculator is not None:
+                block_sigmas = calculator.calculate([parse_composition(row[4]) for row in rows], MONTE_CARLO)[1].tolist()
+            for row_number, (compound_id, name, formula, molar_mass, composition, created_date, tags), value, sigma, ok in zip(
+                    range(start + 1, stop + 1), rows, values[start:stop].tolist(), block_sigmas, valid[start:stop].tolist()):
+                if ok:
+                    yield BatchResult(row_number, name, formula, value, composition, None, sigma)
+                else:
+                    yield BatchResult(row_number, name, formula, None, None, "Состав содержит элементы, которых нет в базе данных", None)
+
+    def calculate_molecules(self, records):
+        calculator = UncertaintyCalculator(self.atomic_masses, self.uncertainties, samples=self.samples)
+        records = iter(records)
+        while True:
+            block = list(islice(records, self.chunk_size))
+            if not block:
+                break
+            results = iter(calculate_records([(record.record_number, record.name, record.formula) for record in block if record.error is None],
+                                             calculator, self.method))
+            for record in block:
+                if record.error is None:
+                    yield next(results)
+                else:
+                    yield BatchResult(record.record_number, record.name, record.formula, None, None, record.error, None)
+
+def save_batch_results(db_manager, results, batch_size=1000):
+    batch = []
+    for result in results:
+        if result.error is None:
+            batch.append((result.name, result.formula, result.composition))
+            if len(batch) >= batch_size:
+                if db_manager.save_compounds(batch) < 0:
+                    raise OSError("Не удалось сохранить соединения в базу данных")
+                batch = []
+        yield result
+    if batch and db_manager.save_compounds(batch) < 0:
+        raise OSError("Не удалось сохранить соединения в базу данных")
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетный расчет молярных масс по файлу формул")
+    parser.add_argument('input', help=f"файл с формулами (по одной в строке, '-' для stdin), архив соединений {ARCHIVE_EXTENSION} "
+                                      f"или файл молекул ({', '.join(MOLECULE_EXTENSIONS)})")
+    parser.add_argument('-o', '--output', default='-', help="файл результатов ('-' для stdout)")
+    parser.add_argument('-f', '--format', choices=['csv', 'json', 'txt'], default=None,
+                        help="формат отчета (по умолчанию по расширению файла, иначе csv)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="число процессов")
+    parser.add_argument('-u', '--uncertainty', choices=[ANALYTIC, MONTE_CARLO], default=ANALYTIC,
+                        help="способ распространения погрешности")
+    parser.add_argument('--samples', type=int, default=10000, help="число испытаний Монте-Карло")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="строк в одном задании")
+    parser.add_argument('--db', default='chemical_elements.db', help="файл базы данных")
+    parser.add_argument('--save', action='store_true', help="сохранить рассчитанные соединения в базу данных")
+    parser.add_argument('--dataset', default=None, help="набор атомных масс (номер или название; по умолчанию активный)")
+    args = parser.parse_args()
+    from database_manager import DatabaseManager
+    from atomic_weights import AtomicWeightLibrary
+    db_manager = DatabaseManager(args.db)
+    library = AtomicWeightLibrary(db_manager)
+    weights = library.active
+    if args.dataset is not None:
+        matches = [dataset_id for dataset_id in [0, *library.datasets]
+                   if args.dataset in (str(dataset_id), library.dataset_name(dataset_id))]
+        if not matches:
+            parser.error(f"набор атомных масс '{args.dataset}' не найден")
+        weights = library.weights(matches[0])
+    calculator = BatchCalculator(weights.masses, args.workers, args.chunk_size,
+                                 uncertainties=weights.uncertainties,
+                                 method=args.uncertainty, samples=args.samples)
+    element_table = {symbol: (name, weights.masses.get(symbol, atomic_mass))
+                     for symbol, (name, atomic_mass) in element_table_from_rows(db_manager.get_all_elements()).items()}
+    report_format = args.format or report_format_for(args.output, default='csv')
+    errors = 0
+
+    def counted(results):
+        nonlocal errors
+        for result in results:
+            if result.error:
+                errors += 1
+            yield result
+
+    if args.input.endswith(ARCHIVE_EXTENSION):
+        input_file = CompoundArchive(args.input)
+        results = calculator.calculate_archive(input_file)
+    elif args.input.lower().endswith(MOLECULE_EXTENSIONS):
+        input_file = read_molecule_file(args.input)
+        results = calculator.calculate_molecules(input_file)
+    else:
+        input_file = sys.stdin if args.input == '-' else open(args.input, 'r', encoding='utf-8')
+        results = calculator.calculate(input_file)
+    output_file = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        if args.save:
+            results = save_batch_results(db_manager, results)
+        records = records_from_batch_results(counted(results), element_table)
+        processed = ReportGenerator().write_to(records, output_file, report_format)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+    print(f"Обработано формул: {processed}, с ошибками: {errors}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
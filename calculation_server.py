@@ -0,0 +1,315 @@
+import argparse
+import asyncio
+import json
+import math
+import queue
+import sqlite3
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs, unquote
+from formula_parser import FormulaError, parse_formula, calculate_molar_mass
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                413: 'Payload Too Large', 500: 'Internal Server Error'}
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ReadOnlyConnectionPool:
+    def __init__(self, db_name, size=4):
+        uri = Path(db_name).absolute().as_uri() + '?mode=ro'
+        self.connections = queue.Queue()
+        for _ in range(size):
+            self.connections.put(sqlite3.connect(uri, uri=True, check_same_thread=False))
+        self.executor = ThreadPoolExecutor(max_workers=size)
+        self.size = size
+
+    def _fetchall(self, sql, params):
+        conn = self.connections.get()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            self.connections.put(conn)
+
+    async def fetchall(self, sql, params=()):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._fetchall, sql, params)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for _ in range(self.size):
+            self.connections.get().close()
+
+class ElementCache:
+    def __init__(self, pool):
+        self.pool = pool
+        self.elements = {}
+        self.atomic_masses = {}
+
+    async def refresh(self):
+        rows = await self.pool.fetchall('SELECT symbol, name, atomic_mass, atomic_number, category FROM elements ORDER BY atomic_number')
+        self.elements = {row[0]: row for row in rows}
+        self.atomic_masses = {row[0]: row[2] for row in rows}
+
+    async def keep_warm(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except sqlite3.Error:
+                pass
+
+class LatencyMetrics:
+    def __init__(self, window=1000):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def record(self, route, seconds, failed):
+        self.samples[route].append(seconds * 1000)
+        self.counts[route] += 1
+        if failed:
+            self.errors[route] += 1
+
+    def snapshot(self):
+        result = {}
+        for route, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[route] = {
+                'count': self.counts[route],
+                'errors': self.errors[route],
+                'mean_ms': round(sum(ordered) / len(ordered), 3),
+                'p50_ms': round(ordered[int(len(ordered) * 0.50)], 3),
+                'p95_ms': round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 3),
+                'p99_ms': round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)], 3),
+                'max_ms': round(ordered[-1], 3),
+            }
+        return result
+
+class CalculationServer:
+    def __init__(self, db_name="chemical_elements.db", pool_size=4, refresh_interval=30):
+        self.pool = ReadOnlyConnectionPool(db_name, pool_size)
+        self.cache = ElementCache(self.pool)
+        self.metrics = LatencyMetrics()
+        self.refresh_interval = refresh_interval
+
+    def calculate(self, formula):
+        if not isinstance(formula, str):
+            raise FormulaError("Формула должна быть строкой")
+        composition = parse_formula(formula)
+        return {
+            'formula': formula,
+            'molar_mass': calculate_molar_mass(composition, self.cache.atomic_masses),
+            'composition': composition,
+        }
+
+    async def handle_molar_mass(self, query, body):
+        try:
+            return self.calculate(body.get('formula'))
+        except FormulaError as e:
+            raise HTTPError(400, str(e))
+
+    async def handle_molar_mass_batch(self, query, body):
+        formulas = body.get('formulas')
+        if not isinstance(formulas, list):
+            raise HTTPError(400, "Ожидается список 'formulas'")
+        results = []
+        for formula in formulas:
+            try:
+                results.append(self.calculate(formula))
+            except FormulaError as e:
+                results.append({'formula': formula, 'error': str(e)})
+        return {'results': results}
+
+    async def handle_elements(self, query, body):
+        return {'elements': [self.element_to_dict(row) for row in self.cache.elements.values()]}
+
+    async def handle_element(self, query, body, symbol):
+        row = self.cache.elements.get(symbol.upper())
+        if row is None:
+            raise HTTPError(404, f"Элемент '{symbol}' не найден")
+        return self.element_to_dict(row)
+
+    async def handle_compound_search(self, query, body):
+        text = query.get('q', [''])[0]
+        try:
+            limit = int(query.get('limit', ['50'])[0])
+        except ValueError:
+            raise HTTPError(400, "Параметр 'limit' должен быть числом")
+        if limit < 1:
+            raise HTTPError(400, "Параметр 'limit' должен быть положительным")
+        limit = min(limit, 1000)
+        rows = await self.pool.fetchall(
+            'SELECT id, name, formula, molar_mass, composition, created_date FROM saved_compounds '
+            'WHERE name LIKE ? OR formula LIKE ? ORDER BY created_date DESC LIMIT ?',
+            (f'%{text}%', f'%{text}%', limit))
+        return {'compounds': [
+            {'id': row[0], 'name': row[1], 'formula': row[2], 'molar_mass': row[3],
+             'composition': row[4], 'created_date': row[5]}
+            for row in rows
+        ]}
+
+    async def handle_compounds_by_mass(self, query, body):
+        try:
+            molar_mass = float(query['mass'][0])
+            tolerance = float(query.get('tolerance', ['0.5'])[0])
+            limit = int(query.get('limit', ['50'])[0])
+        except KeyError:
+            raise HTTPError(400, "Не указан параметр 'mass'")
+        except ValueError:
+            raise HTTPError(400, "Параметры 'mass', 'tolerance' и 'limit' должны быть числами")
+        if not math.isfinite(molar_mass) or not 0 <= tolerance < math.inf:
+            raise HTTPError(400, "Недопустимая масса или допуск")
+        if limit < 1:
+            raise HTTPError(400, "Параметр 'limit' должен быть положительным")
+        rows = await self.pool.fetchall('''
+            SELECT source, id, name, formula, molar_mass, molar_mass - ? AS error FROM (
+                SELECT 'saved' AS source, id, name, formula, molar_mass FROM saved_compounds WHERE molar_mass BETWEEN ? AND ?
+                UNION ALL
+                SELECT 'common' AS source, id, name, formula, molar_mass FROM common_compounds WHERE molar_mass BETWEEN ? AND ?
+            ) ORDER BY ABS(error) LIMIT ?
+        ''', (molar_mass, molar_mass - tolerance, molar_mass + tolerance, molar_mass - tolerance, molar_mass + tolerance, min(limit, 1000)))
+        return {'compounds': [
+            {'source': row[0], 'id': row[1], 'name': row[2], 'formula': row[3], 'molar_mass': row[4], 'error': row[5]}
+            for row in rows
+        ]}
+
+    async def handle_metrics(self, query, body):
+        return self.metrics.snapshot()
+
+    def element_to_dict(self, row):
+        symbol, name, atomic_mass, atomic_number, category = row
+        return {'symbol': symbol, 'name': name, 'atomic_mass': atomic_mass,
+                'atomic_number': atomic_number, 'category': category}
+
+    def route(self, method, path):
+        routes = {
+            ('GET', '/elements'): self.handle_elements,
+            ('POST', '/molar-mass'): self.handle_molar_mass,
+            ('POST', '/molar-mass/batch'): self.handle_molar_mass_batch,
+            ('GET', '/compounds/search'): self.handle_compound_search,
+            ('GET', '/compounds/by-mass'): self.handle_compounds_by_mass,
+            ('GET', '/metrics'): self.handle_metrics,
+        }
+        handler = routes.get((method, path))
+        if handler:
+            return path, handler, ()
+        if path.startswith('/elements/') and path.count('/') == 2:
+            if method != 'GET':
+                raise HTTPError(405, "Метод не поддерживается")
+            return '/elements/{symbol}', self.handle_element, (unquote(path[len('/elements/'):]),)
+        if any(route_path == path for _, route_path in routes):
+            raise HTTPError(405, "Метод не поддерживается")
+        raise HTTPError(404, "Ресурс не найден")
+
+    async def read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Некорректная строка запроса")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+        length = headers.get('content-length', '') or '0'
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, "Некорректный заголовок Content-Length")
+        length = int(length)
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Слишком большой запрос")
+        body = await reader.readexactly(length) if length else b''
+        keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+        return method, target, body, keep_alive
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as e:
+                    await self.write_response(writer, e.status, {'error': str(e)}, False)
+                    break
+                if request is None:
+                    break
+                method, target, raw_body, keep_alive = request
+                status, payload = await self.dispatch(method, target, raw_body)
+                await self.write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, raw_body):
+        started = time.perf_counter()
+        url = urlsplit(target)
+        route_name = '<unmatched>'
+        status = 200
+        try:
+            route_name, handler, args = self.route(method, url.path.rstrip('/') or '/')
+            body = {}
+            if raw_body:
+                try:
+                    body = json.loads(raw_body)
+                except ValueError:
+                    raise HTTPError(400, "Тело запроса должно быть JSON-объектом")
+                if not isinstance(body, dict):
+                    raise HTTPError(400, "Тело запроса должно быть JSON-объектом")
+            payload = await handler(parse_qs(url.query), body, *args)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        self.metrics.record(f"{method} {route_name}", time.perf_counter() - started, status >= 400)
+        return status, payload
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(headers.encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        await self.cache.refresh()
+        refresher = asyncio.create_task(self.cache.keep_warm(self.refresh_interval))
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            refresher.cancel()
+            self.pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный HTTP-сервис расчета молярной массы")
+    parser.add_argument('--host', default='127.0.0.1', help="адрес для прослушивания")
+    parser.add_argument('--port', type=int, default=8765, help="порт")
+    parser.add_argument('--db', default='chemical_elements.db', help="файл базы данных")
+    parser.add_argument('--pool-size', type=int, default=4, help="число соединений только для чтения")
+    args = parser.parse_args()
+    server = CalculationServer(args.db, args.pool_size)
+    print(f"Сервис запущен на http://{args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class CommonCompoundsModel(QAbstractListModel):
+    def __init__(self, db_manager, page_size=200, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.page_size = page_size
+        self.compounds = []
+        self.filter_text = ""
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.compounds)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.compounds):
+            return None
+        compound_id, name, formula, molar_mass, description, composition = self.compounds[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{name} - {formula} ({molar_mass:.3f} г/моль)"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return description
+        if role == Qt.ItemDataRole.UserRole:
+            return self.compounds[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        rows = self.db_manager.get_common_compounds_page(self.filter_text, len(self.compounds), self.page_size)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.compounds), len(self.compounds) + len(rows) - 1)
+            self.compounds.extend(rows)
+            self.endInsertRows()
+
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.filter_text = text
+        self.compounds = []
+        self.exhausted = False
+        self.endResetModel()
+
+    def reload(self):
+        self.set_filter(self.filter_text)
\ No newline at end of file
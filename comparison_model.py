@@ -0,0 +1,50 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from mass_index import SAVED_COMPOUND
+
+class DatasetComparisonModel(QAbstractTableModel):
+    HEADERS = ["Источник", "Название", "Формула", "M (A)", "M (B)", "Разница, ppm"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+
+    def set_results(self, results):
+        self.beginResetModel()
+        self.results = results
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.results)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.results):
+            return None
+        result = self.results[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return "Мои соединения" if result.source == SAVED_COMPOUND else "Распространенные"
+            if column == 1:
+                return result.name
+            if column == 2:
+                return result.formula
+            if column == 3:
+                return f"{result.first_mass:.4f}"
+            if column == 4:
+                return f"{result.second_mass:.4f}"
+            return f"{result.ppm:+.1f}"
+        if role == Qt.ItemDataRole.UserRole:
+            return result
+        return None
\ No newline at end of file
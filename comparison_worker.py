@@ -0,0 +1,34 @@
+import math
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class DatasetComparisonWorker(QThread):
+    compared = pyqtSignal(int, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_manager, library, first_id, second_id, changed_only, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.library = library
+        self.first_id = first_id
+        self.second_id = second_id
+        self.changed_only = changed_only
+
+    def compounds(self):
+        for compound in self.db_manager.iter_compound_compositions():
+            if self.isInterruptionRequested():
+                return
+            yield compound
+
+    def run(self):
+        try:
+            results = self.library.compare(self.first_id, self.second_id, self.compounds())
+        except Exception as error:
+            self.failed.emit(str(error))
+            return
+        if self.isInterruptionRequested():
+            return
+        total = len(results)
+        if self.changed_only:
+            results = [result for result in results if result.difference != 0.0]
+        results.sort(key=lambda result: -abs(result.ppm) if not math.isnan(result.ppm) else math.inf)
+        self.compared.emit(total, results)
\ No newline at end of file
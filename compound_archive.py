@@ -0,0 +1,154 @@
+import json
+import mmap
+import os
+from array import array
+import numpy as np
+from formula_parser import parse_composition
+
+MAGIC = b'CCOLUMN1'
+ARCHIVE_EXTENSION = '.ccol'
+ALIGNMENT = 64
+STRING_COLUMNS = ('name', 'formula', 'created_date', 'tags')
+
+class StringColumnWriter:
+    def __init__(self):
+        self.offsets = array('q', [0])
+        self.blob = bytearray()
+
+    def append(self, value):
+        self.blob += (value or "").encode('utf-8')
+        self.offsets.append(len(self.blob))
+
+class CompoundArchiveWriter:
+    def __init__(self):
+        self.ids = array('q')
+        self.molar_masses = array('d')
+        self.strings = {column: StringColumnWriter() for column in STRING_COLUMNS}
+        self.symbols = {}
+        self.composition_offsets = array('q', [0])
+        self.composition_symbols = array('H')
+        self.composition_counts = array('d')
+
+    def add(self, compound_id, name, formula, molar_mass, composition, created_date, tags):
+        self.ids.append(compound_id)
+        self.molar_masses.append(molar_mass)
+        for column, value in zip(STRING_COLUMNS, (name, formula, created_date, tags)):
+            self.strings[column].append(value)
+        for symbol, count in parse_composition(composition).items():
+            self.composition_symbols.append(self.symbols.setdefault(symbol, len(self.symbols)))
+            self.composition_counts.append(count)
+        self.composition_offsets.append(len(self.composition_counts))
+
+    def columns(self):
+        yield 'id', 'int64', self.ids
+        yield 'molar_mass', 'float64', self.molar_masses
+        for column in STRING_COLUMNS:
+            yield f'{column}.offsets', 'int64', self.strings[column].offsets
+            yield f'{column}.data', 'uint8', self.strings[column].blob
+        yield 'composition.offsets', 'int64', self.composition_offsets
+        yield 'composition.symbols', 'uint16', self.composition_symbols
+        yield 'composition.counts', 'float64', self.composition_counts
+
+    def write(self, filename):
+        columns = list(self.columns())
+        layout = {}
+        position = 0
+        for column, dtype, data in columns:
+            size = len(memoryview(data).cast('B'))
+            layout[column] = {'dtype': dtype, 'offset': position, 'size': size}
+            position += -(-size // ALIGNMENT) * ALIGNMENT
+        header = json.dumps({'rows': len(self.ids), 'symbols': list(self.symbols), 'columns': layout}).encode('utf-8')
+        data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+        partial = filename + '.part'
+        with open(partial, 'wb') as file:
+            file.write(MAGIC)
+            file.write(len(header).to_bytes(8, 'little'))
+            file.write(header)
+            for column, dtype, data in columns:
+                file.write(b'\0' * (data_start + layout[column]['offset'] - file.tell()))
+                file.write(memoryview(data).cast('B'))
+        os.replace(partial, filename)
+        return len(self.ids)
+
+def write_compound_archive(filename, compounds):
+    writer = CompoundArchiveWriter()
+    for compound in compounds:
+        writer.add(*compound)
+    return writer.write(filename)
+
+class CompoundArchive:
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("Файл не является архивом соединений")
+        header_size = int.from_bytes(self.buffer[len(MAGIC):len(MAGIC) + 8], 'little')
+        header = json.loads(self.buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_size].decode('utf-8'))
+        data_start = -(-(len(MAGIC) + 8 + header_size) // ALIGNMENT) * ALIGNMENT
+        self.rows = header['rows']
+        self.symbols = header['symbols']
+        self.columns = {}
+        for column, info in header['columns'].items():
+            dtype = np.dtype(info['dtype']).newbyteorder('<')
+            self.columns[column] = np.frombuffer(self.buffer, dtype=dtype, count=info['size'] // dtype.itemsize,
+                                                 offset=data_start + info['offset'])
+        self.ids = self.columns['id']
+        self.molar_masses = self.columns['molar_mass']
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.columns = {}
+        self.ids = self.molar_masses = None
+        try:
+            self.buffer.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+    def string(self, column, row):
+        offsets = self.columns[f'{column}.offsets']
+        return self.columns[f'{column}.data'][offsets[row]:offsets[row + 1]].tobytes().decode('utf-8')
+
+    def composition(self, row):
+        offsets = self.columns['composition.offsets']
+        start, end = offsets[row], offsets[row + 1]
+        symbols = self.columns['composition.symbols'][start:end]
+        counts = self.columns['composition.counts'][start:end]
+        composition = {}
+        for symbol, count in zip(symbols.tolist(), counts.tolist()):
+            composition[self.symbols[symbol]] = composition.get(self.symbols[symbol], 0.0) + count
+        return composition
+
+    def composition_string(self, row):
+        return ";".join(f"{symbol}:{count}" for symbol, count in self.composition(row).items())
+
+    def row(self, row):
+        return (int(self.ids[row]), self.string('name', row), self.string('formula', row), float(self.molar_masses[row]),
+                self.composition_string(row), self.string('created_date', row), self.string('tags', row))
+
+    def iter_rows(self, start=0, stop=None):
+        for row in range(start, self.rows if stop is None else min(stop, self.rows)):
+            yield self.row(row)
+
+    def calculate(self, atomic_masses, uncertainties=None):
+        uncertainties = uncertainties or {}
+        masses = np.array([atomic_masses.get(symbol, np.nan) for symbol in self.symbols], dtype=np.float64)
+        sigmas = np.array([uncertainties.get(symbol, 0.0) for symbol in self.symbols], dtype=np.float64)
+        offsets = self.columns['composition.offsets']
+        symbols = self.columns['composition.symbols']
+        counts = self.columns['composition.counts']
+        rows = np.repeat(np.arange(self.rows), np.diff(offsets))
+        values = np.bincount(rows, weights=counts * masses[symbols], minlength=self.rows)
+        variances = np.bincount(rows, weights=(counts * sigmas[symbols]) ** 2, minlength=self.rows)
+        valid = ~np.isnan(values)
+        return values, np.sqrt(variances), valid
\ No newline at end of file
@@ -0,0 +1,176 @@
+COMMON_COMPOUNDS = [
+    ('Вода', 'H2O', 'Основной растворитель'),
+    ('Поваренная соль', 'NaCl', 'Хлорид натрия'),
+    ('Серная кислота', 'H2SO4', 'Сильная кислота'),
+    ('Глюкоза', 'C6H12O6', 'Углевод'),
+    ('Метан', 'CH4', 'Природный газ'),
+    ('Этанол', 'C2H5OH', 'Спирт'),
+    ('Пероксид водорода', 'H2O2', 'Окислитель'),
+    ('Аммиак', 'NH3', 'Газ с резким запахом'),
+    ('Углекислый газ', 'CO2', 'Диоксид углерода'),
+    ('Угарный газ', 'CO', 'Монооксид углерода'),
+    ('Кислород', 'O2', 'Простое вещество'),
+    ('Озон', 'O3', 'Аллотроп кислорода'),
+    ('Азот', 'N2', 'Простое вещество'),
+    ('Водород', 'H2', 'Простое вещество'),
+    ('Хлор', 'Cl2', 'Простое вещество'),
+    ('Фтор', 'F2', 'Простое вещество'),
+    ('Оксид азота(II)', 'NO', 'Монооксид азота'),
+    ('Оксид азота(IV)', 'NO2', 'Диоксид азота'),
+    ('Оксид азота(I)', 'N2O', 'Веселящий газ'),
+    ('Сернистый газ', 'SO2', 'Диоксид серы'),
+    ('Серный ангидрид', 'SO3', 'Триоксид серы'),
+    ('Сероводород', 'H2S', 'Ядовитый газ'),
+    ('Соляная кислота', 'HCl', 'Хлороводород'),
+    ('Плавиковая кислота', 'HF', 'Фтороводород'),
+    ('Азотная кислота', 'HNO3', 'Сильная кислота'),
+    ('Азотистая кислота', 'HNO2', 'Слабая кислота'),
+    ('Фосфорная кислота', 'H3PO4', 'Ортофосфорная кислота'),
+    ('Угольная кислота', 'H2CO3', 'Слабая кислота'),
+    ('Сернистая кислота', 'H2SO3', 'Слабая кислота'),
+    ('Хлорная кислота', 'HClO4', 'Сильная кислота'),
+    ('Борная кислота', 'H3BO3', 'Слабая кислота'),
+    ('Кремниевая кислота', 'H2SiO3', 'Слабая кислота'),
+    ('Гидроксид натрия', 'NaOH', 'Едкий натр'),
+    ('Гидроксид калия', 'KOH', 'Едкое кали'),
+    ('Гидроксид кальция', 'Ca(OH)2', 'Гашеная известь'),
+    ('Гидроксид магния', 'Mg(OH)2', 'Основание'),
+    ('Гидроксид алюминия', 'Al(OH)3', 'Амфотерный гидроксид'),
+    ('Гидроксид железа(III)', 'Fe(OH)3', 'Основание'),
+    ('Гидроксид меди(II)', 'Cu(OH)2', 'Основание'),
+    ('Гидроксид лития', 'LiOH', 'Щелочь'),
+    ('Оксид кальция', 'CaO', 'Негашеная известь'),
+    ('Оксид магния', 'MgO', 'Жженая магнезия'),
+    ('Оксид алюминия', 'Al2O3', 'Глинозем'),
+    ('Оксид кремния', 'SiO2', 'Кварц'),
+    ('Оксид железа(III)', 'Fe2O3', 'Гематит'),
+    ('Оксид железа(II,III)', 'Fe3O4', 'Магнетит'),
+    ('Оксид меди(II)', 'CuO', 'Тенорит'),
+    ('Оксид цинка', 'ZnO', 'Цинковые белила'),
+    ('Оксид свинца(II)', 'PbO', 'Глет'),
+    ('Оксид ртути(II)', 'HgO', 'Оксид'),
+    ('Оксид фосфора(V)', 'P4O10', 'Фосфорный ангидрид'),
+    ('Хлорид калия', 'KCl', 'Сильвин'),
+    ('Хлорид кальция', 'CaCl2', 'Осушитель'),
+    ('Хлорид магния', 'MgCl2', 'Соль'),
+    ('Хлорид аммония', 'NH4Cl', 'Нашатырь'),
+    ('Хлорид железа(III)', 'FeCl3', 'Соль'),
+    ('Хлорид меди(II)', 'CuCl2', 'Соль'),
+    ('Хлорид цинка', 'ZnCl2', 'Соль'),
+    ('Хлорид серебра', 'AgCl', 'Нерастворимая соль'),
+    ('Хлорид алюминия', 'AlCl3', 'Кислота Льюиса'),
+    ('Хлорид ртути(II)', 'HgCl2', 'Сулема'),
+    ('Фторид натрия', 'NaF', 'Соль'),
+    ('Фторид кальция', 'CaF2', 'Флюорит'),
+    ('Карбонат натрия', 'Na2CO3', 'Кальцинированная сода'),
+    ('Гидрокарбонат натрия', 'NaHCO3', 'Пищевая сода'),
+    ('Карбонат кальция', 'CaCO3', 'Мел, мрамор'),
+    ('Карбонат калия', 'K2CO3', 'Поташ'),
+    ('Карбонат магния', 'MgCO3', 'Магнезит'),
+    ('Карбонат аммония', '(NH4)2CO3', 'Соль'),
+    ('Сульфат натрия', 'Na2SO4', 'Соль'),
+    ('Сульфат калия', 'K2SO4', 'Удобрение'),
+    ('Сульфат кальция', 'CaSO4', 'Ангидрит'),
+    ('Гипс', 'CaSO4·2H2O', 'Дигидрат сульфата кальция'),
+    ('Сульфат магния', 'MgSO4', 'Английская соль'),
+    ('Сульфат меди(II)', 'CuSO4', 'Соль'),
+    ('Медный купорос', 'CuSO4·5H2O', 'Пентагидрат сульфата меди(II)'),
+    ('Сульфат железа(II)', 'FeSO4', 'Соль'),
+    ('Железный купорос', 'FeSO4·7H2O', 'Гептагидрат сульфата железа(II)'),
+    ('Сульфат цинка', 'ZnSO4', 'Соль'),
+    ('Сульфат алюминия', 'Al2(SO4)3', 'Коагулянт'),
+    ('Сульфат аммония', '(NH4)2SO4', 'Удобрение'),
+    ('Сульфат свинца(II)', 'PbSO4', 'Нерастворимая соль'),
+    ('Алюмокалиевые квасцы', 'KAl(SO4)2·12H2O', 'Квасцы'),
+    ('Нитрат натрия', 'NaNO3', 'Чилийская селитра'),
+    ('Нитрат калия', 'KNO3', 'Калийная селитра'),
+    ('Нитрат аммония', 'NH4NO3', 'Аммиачная селитра'),
+    ('Нитрат серебра', 'AgNO3', 'Ляпис'),
+    ('Нитрат кальция', 'Ca(NO3)2', 'Кальциевая селитра'),
+    ('Нитрат свинца(II)', 'Pb(NO3)2', 'Соль'),
+    ('Нитрат меди(II)', 'Cu(NO3)2', 'Соль'),
+    ('Фосфат кальция', 'Ca3(PO4)2', 'Соль'),
+    ('Фосфат натрия', 'Na3PO4', 'Соль'),
+    ('Дигидрофосфат аммония', 'NH4H2PO4', 'Удобрение'),
+    ('Сульфид железа(II)', 'FeS', 'Соль'),
+    ('Пирит', 'FeS2', 'Дисульфид железа'),
+    ('Сульфид цинка', 'ZnS', 'Сфалерит'),
+    ('Сульфид свинца(II)', 'PbS', 'Галенит'),
+    ('Сульфид ртути(II)', 'HgS', 'Киноварь'),
+    ('Хлорат калия', 'KClO3', 'Бертолетова соль'),
+    ('Гипохлорит натрия', 'NaClO', 'Отбеливатель'),
+    ('Силикат натрия', 'Na2SiO3', 'Жидкое стекло'),
+    ('Карбид кальция', 'CaC2', 'Источник ацетилена'),
+    ('Карбид кремния', 'SiC', 'Карборунд'),
+    ('Нитрид бора', 'BN', 'Сверхтвердый материал'),
+    ('Бура', 'Na2B4O7·10H2O', 'Тетраборат натрия'),
+    ('Гексацианоферрат(II) калия', 'K4[Fe(CN)6]', 'Желтая кровяная соль'),
+    ('Гексацианоферрат(III) калия', 'K3[Fe(CN)6]', 'Красная кровяная соль'),
+    ('Этан', 'C2H6', 'Алкан'),
+    ('Пропан', 'C3H8', 'Алкан'),
+    ('Бутан', 'C4H10', 'Алкан'),
+    ('Пентан', 'C5H12', 'Алкан'),
+    ('Гексан', 'C6H14', 'Алкан'),
+    ('Октан', 'C8H18', 'Алкан'),
+    ('Этилен', 'C2H4', 'Алкен'),
+    ('Пропилен', 'C3H6', 'Алкен'),
+    ('Ацетилен', 'C2H2', 'Алкин'),
+    ('Бензол', 'C6H6', 'Ароматический углеводород'),
+    ('Толуол', 'C7H8', 'Ароматический углеводород'),
+    ('Нафталин', 'C10H8', 'Ароматический углеводород'),
+    ('Циклогексан', 'C6H12', 'Циклоалкан'),
+    ('Метанол', 'CH3OH', 'Спирт'),
+    ('Пропанол', 'C3H7OH', 'Спирт'),
+    ('Этиленгликоль', 'C2H4(OH)2', 'Двухатомный спирт'),
+    ('Глицерин', 'C3H5(OH)3', 'Трехатомный спирт'),
+    ('Фенол', 'C6H5OH', 'Ароматический спирт'),
+    ('Формальдегид', 'HCHO', 'Альдегид'),
+    ('Ацетальдегид', 'CH3CHO', 'Альдегид'),
+    ('Ацетон', 'CH3COCH3', 'Кетон'),
+    ('Муравьиная кислота', 'HCOOH', 'Карбоновая кислота'),
+    ('Уксусная кислота', 'CH3COOH', 'Карбоновая кислота'),
+    ('Щавелевая кислота', 'H2C2O4', 'Дикарбоновая кислота'),
+    ('Лимонная кислота', 'C6H8O7', 'Трикарбоновая кислота'),
+    ('Молочная кислота', 'C3H6O3', 'Гидроксикислота'),
+    ('Бензойная кислота', 'C6H5COOH', 'Ароматическая кислота'),
+    ('Салициловая кислота', 'C7H6O3', 'Гидроксикислота'),
+    ('Ацетилсалициловая кислота', 'C9H8O4', 'Аспирин'),
+    ('Стеариновая кислота', 'C17H35COOH', 'Жирная кислота'),
+    ('Олеиновая кислота', 'C18H34O2', 'Жирная кислота'),
+    ('Ацетат натрия', 'CH3COONa', 'Соль'),
+    ('Этилацетат', 'CH3COOC2H5', 'Сложный эфир'),
+    ('Диэтиловый эфир', '(C2H5)2O', 'Простой эфир'),
+    ('Хлороформ', 'CHCl3', 'Растворитель'),
+    ('Тетрахлорметан', 'CCl4', 'Растворитель'),
+    ('Дихлорметан', 'CH2Cl2', 'Растворитель'),
+    ('Винилхлорид', 'C2H3Cl', 'Мономер'),
+    ('Мочевина', 'CO(NH2)2', 'Карбамид'),
+    ('Анилин', 'C6H5NH2', 'Ароматический амин'),
+    ('Нитробензол', 'C6H5NO2', 'Нитросоединение'),
+    ('Тринитротолуол', 'C7H5N3O6', 'Взрывчатое вещество'),
+    ('Метиламин', 'CH3NH2', 'Амин'),
+    ('Глицин', 'C2H5NO2', 'Аминокислота'),
+    ('Аланин', 'C3H7NO2', 'Аминокислота'),
+    ('Серин', 'C3H7NO3', 'Аминокислота'),
+    ('Цистеин', 'C3H7NO2S', 'Аминокислота'),
+    ('Глутаминовая кислота', 'C5H9NO4', 'Аминокислота'),
+    ('Лизин', 'C6H14N2O2', 'Аминокислота'),
+    ('Фенилаланин', 'C9H11NO2', 'Аминокислота'),
+    ('Триптофан', 'C11H12N2O2', 'Аминокислота'),
+    ('Фруктоза', 'C6H12O6', 'Углевод'),
+    ('Сахароза', 'C12H22O11', 'Дисахарид'),
+    ('Лактоза', 'C12H22O11', 'Дисахарид'),
+    ('Рибоза', 'C5H10O5', 'Моносахарид'),
+    ('Аскорбиновая кислота', 'C6H8O6', 'Витамин C'),
+    ('Кофеин', 'C8H10N4O2', 'Алкалоид'),
+    ('Никотин', 'C10H14N2', 'Алкалоид'),
+    ('Парацетамол', 'C8H9NO2', 'Лекарственное вещество'),
+    ('Ибупрофен', 'C13H18O2', 'Лекарственное вещество'),
+    ('Холестерин', 'C27H46O', 'Стерин'),
+    ('Аденин', 'C5H5N5', 'Азотистое основание'),
+    ('Гуанин', 'C5H5N5O', 'Азотистое основание'),
+    ('Цитозин', 'C4H5N3O', 'Азотистое основание'),
+    ('Тимин', 'C5H6N2O2', 'Азотистое основание'),
+    ('Урацил', 'C4H4N2O2', 'Азотистое основание'),
+    ('Аденозинтрифосфат', 'C10H16N5O13P3', 'АТФ'),
+]
\ No newline at end of file
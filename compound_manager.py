@@ -1,13 +1,23 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                              QTableWidget, QTableWidgetItem, QPushButton,
-                             QHeaderView, QMessageBox, QGroupBox, QTextEdit)
+                             QHeaderView, QMessageBox, QGroupBox, QTextEdit,
+                             QInputDialog, QFileDialog, QComboBox,
+                             QDoubleSpinBox)
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from report_generator import (ReportGenerator, REPORT_FORMATS, report_format_for,
+                              records_from_saved_compounds, element_table_from_rows)
+from uncertainty import UncertaintyCalculator
 
 class CompoundManager(QWidget):
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, async_db, element_model, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.async_db = async_db
+        self.element_model = element_model
         self.parent = parent
+        self.async_db.loading.connect(self.on_loading)
+        self.async_db.failed.connect(self.on_failed)
         self.init_ui()
         self.load_saved_compounds()
 
@@ -15,13 +25,42 @@ class CompoundManager(QWidget):
         layout = QVBoxLayout()
         title_label = QLabel("Мои сохраненные соединения")
         title_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        filter_group = QGroupBox("Фильтр по массовой доле элемента")
+        filter_layout = QHBoxLayout()
+        self.filter_element_combo = QComboBox()
+        self.filter_element_combo.setModel(self.element_model)
+        self.filter_min_input = QDoubleSpinBox()
+        self.filter_min_input.setRange(0.0, 100.0)
+        self.filter_min_input.setDecimals(2)
+        self.filter_min_input.setSuffix(" %")
+        self.filter_max_input = QDoubleSpinBox()
+        self.filter_max_input.setRange(0.0, 100.0)
+        self.filter_max_input.setDecimals(2)
+        self.filter_max_input.setSuffix(" %")
+        self.filter_max_input.setValue(100.0)
+        self.filter_button = QPushButton("Применить")
+        self.filter_button.clicked.connect(self.apply_mass_percent_filter)
+        self.reset_filter_button = QPushButton("Сбросить")
+        self.reset_filter_button.clicked.connect(self.load_saved_compounds)
+        filter_layout.addWidget(QLabel("Элемент:"))
+        filter_layout.addWidget(self.filter_element_combo)
+        filter_layout.addWidget(QLabel("от"))
+        filter_layout.addWidget(self.filter_min_input)
+        filter_layout.addWidget(QLabel("до"))
+        filter_layout.addWidget(self.filter_max_input)
+        filter_layout.addWidget(self.filter_button)
+        filter_layout.addWidget(self.reset_filter_button)
+        filter_layout.addStretch()
+        filter_group.setLayout(filter_layout)
         self.compounds_table = QTableWidget()
-        self.compounds_table.setColumnCount(4)
+        self.compounds_table.setColumnCount(5)
         self.compounds_table.setHorizontalHeaderLabels([
-            "Название", "Формула", "Молярная масса", "Дата создания"
+            "Название", "Формула", "Молярная масса", "Дата создания", "Теги"
         ])
         self.compounds_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.compounds_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.compounds_table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.compounds_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.compounds_table.doubleClicked.connect(self.view_compound_details)
         details_group = QGroupBox("Детали соединения")
         details_layout = QVBoxLayout()
@@ -35,14 +74,24 @@ class CompoundManager(QWidget):
         self.view_button.clicked.connect(self.view_compound_details)
         self.delete_button = QPushButton("Удалить")
         self.delete_button.clicked.connect(self.delete_selected_compound)
+        self.rename_button = QPushButton("Переименовать")
+        self.rename_button.clicked.connect(self.rename_selected_compounds)
+        self.tags_button = QPushButton("Теги")
+        self.tags_button.clicked.connect(self.tag_selected_compounds)
+        self.report_button = QPushButton("Отчет...")
+        self.report_button.clicked.connect(self.export_report)
         self.refresh_button = QPushButton("Обновить")
         self.refresh_button.clicked.connect(self.load_saved_compounds)
         control_layout.addWidget(self.view_button)
         control_layout.addWidget(self.delete_button)
+        control_layout.addWidget(self.rename_button)
+        control_layout.addWidget(self.tags_button)
+        control_layout.addWidget(self.report_button)
         control_layout.addStretch()
         control_layout.addWidget(self.refresh_button)
         self.stats_label = QLabel()
         layout.addWidget(title_label)
+        layout.addWidget(filter_group)
         layout.addWidget(self.compounds_table)
         layout.addWidget(details_group)
         layout.addLayout(control_layout)
@@ -50,30 +99,71 @@ class CompoundManager(QWidget):
         self.setLayout(layout)
 
     def load_saved_compounds(self):
-        compounds = self.db_manager.get_saved_compounds()
-        self.display_compounds(compounds)
+        self.async_db.get_saved_compounds('saved_compounds', self.display_compounds)
+
+    def on_loading(self, key, loading):
+        if key == 'elements':
+            self.filter_element_combo.setEnabled(not loading)
+        elif key == 'saved_compounds':
+            self.refresh_button.setEnabled(not loading)
+            self.filter_button.setEnabled(not loading)
+            if loading:
+                self.stats_label.setText("Загрузка соединений...")
+        elif key == 'report':
+            self.report_button.setEnabled(not loading)
+            if loading and self.parent:
+                self.parent.status_bar.showMessage("Формирование отчета...")
+
+    def on_failed(self, key, message):
+        if key == 'report':
+            QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить отчет: {message}")
+
+    def apply_mass_percent_filter(self):
+        symbol = self.filter_element_combo.currentData()
+        low = self.filter_min_input.value()
+        high = self.filter_max_input.value()
+        if symbol is None:
+            return
+        if low > high:
+            QMessageBox.warning(self, "Ошибка", "Нижняя граница больше верхней!")
+            return
+
+        def display_filtered(compounds):
+            self.display_compounds(compounds)
+            self.stats_label.setText(f"Найдено соединений с {symbol} от {low:.2f}% до {high:.2f}%: {len(compounds)}")
+
+        self.async_db.find_compounds_by_mass_percent('saved_compounds', {symbol: (low, high)}, display_filtered)
 
     def display_compounds(self, compounds):
         self.compounds_table.setRowCount(len(compounds))
-        for row, (name, formula, molar_mass, composition, created_date) in enumerate(compounds):
-            self.compounds_table.setItem(row, 0, QTableWidgetItem(name))
+        for row, (compound_id, name, formula, molar_mass, composition, created_date, tags) in enumerate(compounds):
+            name_item = QTableWidgetItem(name)
+            name_item.setData(Qt.ItemDataRole.UserRole, compound_id)
+            self.compounds_table.setItem(row, 0, name_item)
             self.compounds_table.setItem(row, 1, QTableWidgetItem(formula))
             self.compounds_table.setItem(row, 2, QTableWidgetItem(f"{molar_mass:.4f} г/моль"))
             self.compounds_table.setItem(row, 3, QTableWidgetItem(created_date))
+            self.compounds_table.setItem(row, 4, QTableWidgetItem(tags))
         self.stats_label.setText(f"Всего сохраненных соединений: {len(compounds)}")
         self.details_text.clear()
 
+    def selected_compound_ids(self):
+        rows = self.compounds_table.selectionModel().selectedRows()
+        return [self.compounds_table.item(index.row(), 0).data(Qt.ItemDataRole.UserRole) for index in rows]
+
     def view_compound_details(self):
         current_row = self.compounds_table.currentRow()
         if current_row >= 0:
-            compounds = self.db_manager.get_saved_compounds()
-            if current_row < len(compounds):
-                full_name, full_formula, full_molar_mass, composition, full_date = compounds[current_row]
+            compound_id = self.compounds_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
+            compound = self.db_manager.get_saved_compound(compound_id)
+            if compound:
+                full_id, full_name, full_formula, full_molar_mass, composition, full_date, tags = compound
                 details_text = f"""
                 <h3>{full_name}</h3>
                 <b>Формула:</b> {full_formula}<br>
                 <b>Молярная масса:</b> {full_molar_mass:.4f} г/моль<br>
                 <b>Дата создания:</b> {full_date}<br>
+                <b>Теги:</b> {tags}<br>
                 <b>Состав:</b> {composition}
                 """
                 self.details_text.setHtml(details_text)
@@ -81,15 +171,74 @@ class CompoundManager(QWidget):
             QMessageBox.warning(self, "Ошибка", "Выберите соединение для просмотра!")
 
     def delete_selected_compound(self):
-        current_row = self.compounds_table.currentRow()
-        if current_row >= 0:
-            name = self.compounds_table.item(current_row, 0).text()
+        compound_ids = self.selected_compound_ids()
+        if compound_ids:
+            if len(compound_ids) == 1:
+                name = self.compounds_table.item(self.compounds_table.selectionModel().selectedRows()[0].row(), 0).text()
+                question = f"Вы уверены, что хотите удалить соединение '{name}'?"
+            else:
+                question = f"Вы уверены, что хотите удалить выбранные соединения ({len(compound_ids)})?"
             reply = QMessageBox.question(
-                self, "Подтверждение",
-                f"Вы уверены, что хотите удалить соединение '{name}'?",
+                self, "Подтверждение", question,
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                QMessageBox.information(self, "Информация", "В реальном приложении здесь будет удаление соединения из базы данных.")
+                deleted = self.db_manager.delete_compounds(compound_ids)
+                if deleted >= 0:
+                    if self.parent:
+                        self.parent.on_compounds_deleted(compound_ids)
+                    self.load_saved_compounds()
+                    if self.parent:
+                        self.parent.status_bar.showMessage(f"Удалено соединений: {deleted}")
+                else:
+                    QMessageBox.warning(self, "Ошибка", "Не удалось удалить соединения!")
         else:
-            QMessageBox.warning(self, "Ошибка", "Выберите соединение для удаления!")
\ No newline at end of file
+            QMessageBox.warning(self, "Ошибка", "Выберите соединение для удаления!")
+
+    def rename_selected_compounds(self):
+        compound_ids = self.selected_compound_ids()
+        if not compound_ids:
+            QMessageBox.warning(self, "Ошибка", "Выберите соединения для переименования!")
+            return
+        current_name = self.compounds_table.item(self.compounds_table.selectionModel().selectedRows()[0].row(), 0).text()
+        name, ok = QInputDialog.getText(self, "Переименование", f"Новое название ({len(compound_ids)} шт.):", text=current_name)
+        if not ok or not name.strip():
+            return
+        if self.db_manager.rename_compounds(compound_ids, name.strip()) >= 0:
+            self.load_saved_compounds()
+        else:
+            QMessageBox.warning(self, "Ошибка", "Не удалось переименовать соединения!")
+
+    def tag_selected_compounds(self):
+        compound_ids = self.selected_compound_ids()
+        if not compound_ids:
+            QMessageBox.warning(self, "Ошибка", "Выберите соединения для назначения тегов!")
+            return
+        current_tags = self.compounds_table.item(self.compounds_table.selectionModel().selectedRows()[0].row(), 4).text()
+        tags, ok = QInputDialog.getText(self, "Теги", f"Теги через запятую ({len(compound_ids)} шт.):", text=current_tags)
+        if not ok:
+            return
+        tags = ", ".join(tag.strip() for tag in tags.split(",") if tag.strip())
+        if self.db_manager.set_compound_tags(compound_ids, tags) >= 0:
+            self.load_saved_compounds()
+        else:
+            QMessageBox.warning(self, "Ошибка", "Не удалось изменить теги!")
+
+    def export_report(self):
+        compound_ids = self.selected_compound_ids() or None
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Отчет по соединениям", "compounds_report.csv", ";;".join(REPORT_FORMATS.values()))
+        if not filename:
+            return
+        report_format = report_format_for(filename, selected_filter)
+        self.async_db.request('report', self.write_report, compound_ids, filename, report_format,
+                              callback=lambda count: self.on_report_written(count, filename))
+
+    def write_report(self, compound_ids, filename, report_format):
+        element_table = element_table_from_rows(self.db_manager.get_all_elements())
+        calculator = UncertaintyCalculator(self.db_manager.get_atomic_masses(), self.db_manager.get_atomic_mass_uncertainties())
+        records = records_from_saved_compounds(self.db_manager.iter_saved_compounds(compound_ids), element_table, calculator)
+        return ReportGenerator().write(records, filename, report_format)
+
+    def on_report_written(self, count, filename):
+        if self.parent:
+            self.parent.status_bar.showMessage(f"Отчет сохранен: {count} соединений в {filename}")
\ No newline at end of file
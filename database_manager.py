@@ -1,7 +1,12 @@
 import sqlite3
 import os
 import csv
+import json
+import time
 from PyQt6.QtWidgets import QMessageBox
+from formula_parser import FormulaError, parse_formula, parse_composition, calculate_molar_mass, calculate_mass_percents, format_composition, composition_key
+from compound_library import COMMON_COMPOUNDS
+from compound_archive import CompoundArchive, write_compound_archive
 
 class DatabaseManager:
     def __init__(self, db_name="chemical_elements.db"):
@@ -13,6 +18,317 @@ class DatabaseManager:
             self.create_tables()
             self.populate_elements()
             self.create_compounds_table()
+        self.migrate_database()
+
+    def migrations(self):
+        return [
+            self.migrate_compound_tags,
+            self.migrate_mass_percents,
+            self.migrate_molar_mass_indexes,
+            self.migrate_common_compound_library,
+            self.migrate_atomic_mass_uncertainties,
+            self.migrate_mass_change_log,
+            self.migrate_atomic_weight_datasets,
+            self.migrate_calculation_history,
+            self.migrate_composition_keys,
+            self.migrate_change_tracking,
+        ]
+
+    def schema_version(self):
+        return len(self.migrations())
+
+    def migrate_database(self):
+        migrations = self.migrations()
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+        for target_version in range(version + 1, len(migrations) + 1):
+            migrations[target_version - 1](cursor)
+            cursor.execute(f'PRAGMA user_version = {target_version}')
+            conn.commit()
+        conn.close()
+
+    def migrate_compound_tags(self, cursor):
+        cursor.execute("ALTER TABLE saved_compounds ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+
+    def migrate_mass_percents(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS compound_mass_percents (
+                compound_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                mass_percent REAL NOT NULL,
+                PRIMARY KEY (compound_id, symbol)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_mass_percents_symbol ON compound_mass_percents (symbol, mass_percent)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS saved_compounds_delete_mass_percents
+            AFTER DELETE ON saved_compounds
+            BEGIN
+                DELETE FROM compound_mass_percents WHERE compound_id = OLD.id;
+            END
+        ''')
+        cursor.execute('SELECT id, composition FROM saved_compounds')
+        compounds = cursor.fetchall()
+        atomic_masses = self.read_atomic_masses(cursor)
+        for compound_id, composition in compounds:
+            self.store_mass_percents(cursor, compound_id, composition, atomic_masses)
+
+    def migrate_molar_mass_indexes(self, cursor):
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_saved_compounds_molar_mass ON saved_compounds (molar_mass)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_common_compounds_molar_mass ON common_compounds (molar_mass)')
+
+    def migrate_common_compound_library(self, cursor):
+        cursor.execute("ALTER TABLE common_compounds ADD COLUMN composition TEXT NOT NULL DEFAULT ''")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_common_compounds_name ON common_compounds (name)')
+        cursor.execute('SELECT name, formula FROM common_compounds')
+        existing = set(cursor.fetchall())
+        cursor.executemany('INSERT INTO common_compounds (name, formula, molar_mass, description) VALUES (?, ?, 0, ?)',
+                           [compound for compound in COMMON_COMPOUNDS if compound[:2] not in existing])
+        self.refresh_common_compounds(cursor)
+
+    def refresh_common_compounds(self, cursor):
+        atomic_masses = self.read_atomic_masses(cursor)
+        cursor.execute('SELECT id, formula FROM common_compounds')
+        updates = []
+        for compound_id, formula in cursor.fetchall():
+            try:
+                composition = parse_formula(formula)
+                updates.append((calculate_molar_mass(composition, atomic_masses), format_composition(composition), compound_id))
+            except FormulaError:
+                continue
+        cursor.executemany('UPDATE common_compounds SET molar_mass = ?, composition = ? WHERE id = ?', updates)
+        return len(updates)
+
+    def migrate_atomic_mass_uncertainties(self, cursor):
+        cursor.execute('ALTER TABLE elements ADD COLUMN atomic_mass_uncertainty REAL NOT NULL DEFAULT 0')
+        uncertainties = [
+            (0.0002, 'H'), (0.0001, 'HE'), (0.06, 'LI'), (0.0001, 'BE'), (0.02, 'B'),
+            (0.002, 'C'), (0.001, 'N'), (0.001, 'O'), (0.001, 'F'), (0.001, 'NE'),
+            (0.001, 'NA'), (0.002, 'MG'), (0.001, 'AL'), (0.001, 'SI'), (0.001, 'P'),
+            (0.02, 'S'), (0.01, 'CL'), (0.001, 'AR'), (0.001, 'K'), (0.004, 'CA'),
+            (0.002, 'FE'), (0.003, 'CU'), (0.02, 'ZN'), (0.01, 'AG'), (0.01, 'AU'),
+            (0.01, 'HG'), (1.1, 'PB')
+        ]
+        cursor.executemany('UPDATE elements SET atomic_mass_uncertainty = ? WHERE symbol = ?', uncertainties)
+
+    def migrate_mass_change_log(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS element_mass_changes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                old_mass REAL,
+                new_mass REAL,
+                changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                applied INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_element_mass_changes_pending ON element_mass_changes (applied, id)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS elements_log_mass_insert
+            AFTER INSERT ON elements
+            BEGIN
+                INSERT INTO element_mass_changes (symbol, old_mass, new_mass) VALUES (NEW.symbol, NULL, NEW.atomic_mass);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS elements_log_mass_update
+            AFTER UPDATE OF symbol, atomic_mass ON elements
+            WHEN OLD.symbol IS NOT NEW.symbol OR OLD.atomic_mass IS NOT NEW.atomic_mass
+            BEGIN
+                INSERT INTO element_mass_changes (symbol, old_mass, new_mass)
+                SELECT OLD.symbol, OLD.atomic_mass, NULL WHERE OLD.symbol IS NOT NEW.symbol;
+                INSERT INTO element_mass_changes (symbol, old_mass, new_mass) VALUES (NEW.symbol, OLD.atomic_mass, NEW.atomic_mass);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS elements_log_mass_delete
+            AFTER DELETE ON elements
+            BEGIN
+                INSERT INTO element_mass_changes (symbol, old_mass, new_mass) VALUES (OLD.symbol, OLD.atomic_mass, NULL);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS common_compound_elements (
+                compound_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                PRIMARY KEY (compound_id, symbol)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_common_compound_elements_symbol ON common_compound_elements (symbol)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS common_compounds_delete_elements
+            AFTER DELETE ON common_compounds
+            BEGIN
+                DELETE FROM common_compound_elements WHERE compound_id = OLD.id;
+            END
+        ''')
+        self.index_common_compounds(cursor)
+
+    def migrate_atomic_weight_datasets(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS atomic_weight_datasets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                version TEXT NOT NULL DEFAULT '',
+                base_id INTEGER REFERENCES atomic_weight_datasets (id),
+                description TEXT NOT NULL DEFAULT '',
+                created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (name, version)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS atomic_weights (
+                dataset_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                atomic_mass REAL NOT NULL,
+                atomic_mass_uncertainty REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (dataset_id, symbol)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS atomic_weight_datasets_delete_weights
+            AFTER DELETE ON atomic_weight_datasets
+            BEGIN
+                DELETE FROM atomic_weights WHERE dataset_id = OLD.id;
+            END
+        ''')
+
+    def migrate_calculation_history(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS calculation_history (
+                id INTEGER PRIMARY KEY,
+                created_at REAL NOT NULL,
+                name TEXT NOT NULL,
+                formula TEXT NOT NULL,
+                molar_mass REAL NOT NULL,
+                uncertainty REAL,
+                composition TEXT NOT NULL,
+                dataset TEXT NOT NULL DEFAULT ''
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_calculation_history_created_at ON calculation_history (created_at)')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS calculation_history_append_only
+            BEFORE UPDATE ON calculation_history
+            BEGIN
+                SELECT RAISE(ABORT, 'calculation_history is append-only');
+            END
+        ''')
+
+    def index_common_compounds(self, cursor):
+        cursor.execute('SELECT id, formula FROM common_compounds WHERE id NOT IN (SELECT compound_id FROM common_compound_elements)')
+        entries = []
+        for compound_id, formula in cursor.fetchall():
+            try:
+                entries.extend((compound_id, symbol) for symbol in parse_formula(formula))
+            except FormulaError:
+                continue
+        cursor.executemany('INSERT OR IGNORE INTO common_compound_elements (compound_id, symbol) VALUES (?, ?)', entries)
+
+    def read_atomic_mass_uncertainties(self, cursor):
+        cursor.execute('SELECT symbol, atomic_mass_uncertainty FROM elements')
+        return dict(cursor.fetchall())
+
+    def migrate_composition_keys(self, cursor):
+        cursor.execute('ALTER TABLE saved_compounds ADD COLUMN composition_key TEXT')
+        cursor.execute('SELECT id, composition FROM saved_compounds')
+        cursor.executemany('UPDATE saved_compounds SET composition_key = ? WHERE id = ?',
+                           [(composition_key(parse_composition(composition)) or None, compound_id) for compound_id, composition in cursor.fetchall()])
+        cursor.execute('''
+            SELECT composition_key, MIN(id), group_concat(tags, ',') FROM saved_compounds
+            WHERE composition_key IS NOT NULL GROUP BY composition_key HAVING COUNT(*) > 1
+        ''')
+        for key, kept_id, tags in cursor.fetchall():
+            merged_tags = ",".join(dict.fromkeys(tag.strip() for tag in tags.split(",") if tag.strip()))
+            cursor.execute('UPDATE saved_compounds SET tags = ? WHERE id = ?', (merged_tags, kept_id))
+            cursor.execute('DELETE FROM saved_compounds WHERE composition_key = ? AND id != ?', (key, kept_id))
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_saved_compounds_composition_key ON saved_compounds (composition_key)')
+
+    TRACKED_TABLES = {
+        'elements': ('symbol', ('name', 'atomic_mass', 'atomic_number', 'category', 'discovered_year', 'atomic_mass_uncertainty')),
+        'saved_compounds': ('composition_key', ('name', 'formula', 'molar_mass', 'composition', 'tags')),
+    }
+
+    def track_change_sql(self, table, key, deleted, condition='1'):
+        next_change = '(SELECT COALESCE(MAX(change_id), 0) + 1 FROM row_changes)'
+        return f'''
+            UPDATE row_changes SET change_id = {next_change}, deleted = {deleted}, origin = NULL
+            WHERE table_name = '{table}' AND row_key = {key} AND {condition};
+            INSERT INTO row_changes (table_name, row_key, change_id, deleted)
+            SELECT '{table}', {key}, {next_change}, {deleted}
+            WHERE {key} IS NOT NULL AND {condition}
+                AND NOT EXISTS (SELECT 1 FROM row_changes WHERE table_name = '{table}' AND row_key = {key});
+        '''
+
+    def migrate_change_tracking(self, cursor):
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS row_changes (
+                table_name TEXT NOT NULL,
+                row_key TEXT NOT NULL,
+                change_id INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                origin TEXT,
+                PRIMARY KEY (table_name, row_key)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_row_changes_change_id ON row_changes (change_id)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sync_peers (
+                database_id TEXT PRIMARY KEY,
+                imported_change INTEGER NOT NULL DEFAULT 0,
+                acknowledged_change INTEGER NOT NULL DEFAULT 0,
+                synced_at TIMESTAMP
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('database_id', lower(hex(randomblob(16))))")
+        for table, (key, columns) in self.TRACKED_TABLES.items():
+            changed = ' OR '.join(f'OLD.{column} IS NOT NEW.{column}' for column in (key, *columns))
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_track_insert
+                AFTER INSERT ON {table}
+                BEGIN
+                    {self.track_change_sql(table, f'NEW.{key}', 0)}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_track_update
+                AFTER UPDATE ON {table}
+                WHEN {changed}
+                BEGIN
+                    {self.track_change_sql(table, f'OLD.{key}', 1, f'OLD.{key} IS NOT NEW.{key}')}
+                    {self.track_change_sql(table, f'NEW.{key}', 0)}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_track_delete
+                AFTER DELETE ON {table}
+                BEGIN
+                    {self.track_change_sql(table, f'OLD.{key}', 1)}
+                END
+            ''')
+            cursor.execute('SELECT COALESCE(MAX(change_id), 0) FROM row_changes')
+            cursor.execute(f'''
+                INSERT INTO row_changes (table_name, row_key, change_id, deleted)
+                SELECT '{table}', {key}, ? + ROW_NUMBER() OVER (ORDER BY id), 0 FROM {table} WHERE {key} IS NOT NULL
+            ''', cursor.fetchone())
+
+    def read_atomic_masses(self, cursor):
+        cursor.execute('SELECT symbol, atomic_mass FROM elements')
+        return dict(cursor.fetchall())
+
+    def store_mass_percents(self, cursor, compound_id, composition, atomic_masses):
+        mass_percents = calculate_mass_percents(parse_composition(composition), atomic_masses)
+        cursor.execute('DELETE FROM compound_mass_percents WHERE compound_id = ?', (compound_id,))
+        cursor.executemany('INSERT INTO compound_mass_percents (compound_id, symbol, mass_percent) VALUES (?, ?, ?)',
+                           [(compound_id, symbol, percent) for symbol, percent in mass_percents.items()])
 
     def create_tables(self):
         conn = sqlite3.connect(self.db_name)
@@ -92,18 +408,6 @@ class DatabaseManager:
             INSERT OR IGNORE INTO elements (symbol, name, atomic_mass, atomic_number, category, discovered_year)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', elements)
-        compounds = [
-            ('Вода', 'H2O', 18.015, 'Основной растворитель'),
-            ('Поваренная соль', 'NaCl', 58.44, 'Хлорид натрия'),
-            ('Серная кислота', 'H2SO4', 98.079, 'Сильная кислота'),
-            ('Глюкоза', 'C6H12O6', 180.156, 'Углевод'),
-            ('Метан', 'CH4', 16.04, 'Природный газ'),
-            ('Этанол', 'C2H5OH', 46.07, 'Спирт')
-        ]
-        cursor.executemany('''
-            INSERT OR IGNORE INTO common_compounds (name, formula, molar_mass, description)
-            VALUES (?, ?, ?, ?)
-        ''', compounds)
         conn.commit()
         conn.close()
 
@@ -115,6 +419,14 @@ class DatabaseManager:
         conn.close()
         return elements
 
+    def get_element_records(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT symbol, name, atomic_mass, category, atomic_number, discovered_year FROM elements ORDER BY atomic_number')
+        elements = cursor.fetchall()
+        conn.close()
+        return elements
+
     def get_element_by_symbol(self, symbol):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
@@ -123,6 +435,208 @@ class DatabaseManager:
         conn.close()
         return element
 
+    def get_atomic_masses(self):
+        conn = sqlite3.connect(self.db_name)
+        atomic_masses = self.read_atomic_masses(conn.cursor())
+        conn.close()
+        return atomic_masses
+
+    def get_atomic_mass_uncertainties(self):
+        conn = sqlite3.connect(self.db_name)
+        uncertainties = self.read_atomic_mass_uncertainties(conn.cursor())
+        conn.close()
+        return uncertainties
+
+    def get_setting(self, key, default=None):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT value FROM settings WHERE key = ?', (key,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else default
+
+    def set_setting(self, key, value):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('INSERT INTO settings (key, value) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET value = excluded.value', (key, str(value)))
+            conn.commit()
+            success = True
+        except Exception:
+            success = False
+        finally:
+            conn.close()
+        return success
+
+    def get_atomic_weight_datasets(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT d.id, d.name, d.version, d.base_id, d.description, d.created_date, COUNT(w.symbol)
+            FROM atomic_weight_datasets d LEFT JOIN atomic_weights w ON w.dataset_id = d.id
+            GROUP BY d.id ORDER BY d.name, d.version
+        ''')
+        datasets = cursor.fetchall()
+        conn.close()
+        return datasets
+
+    def get_atomic_weight_overrides(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT dataset_id, symbol, atomic_mass, atomic_mass_uncertainty FROM atomic_weights')
+        overrides = cursor.fetchall()
+        conn.close()
+        return overrides
+
+    def create_atomic_weight_dataset(self, name, version="", base_id=None, description="", weights=()):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('INSERT INTO atomic_weight_datasets (name, version, base_id, description) VALUES (?, ?, ?, ?)', (name, version, base_id, description))
+            dataset_id = cursor.lastrowid
+            cursor.executemany('INSERT OR REPLACE INTO atomic_weights (dataset_id, symbol, atomic_mass, atomic_mass_uncertainty) VALUES (?, ?, ?, ?)',
+                               [(dataset_id, symbol.upper(), atomic_mass, uncertainty) for symbol, atomic_mass, uncertainty in weights])
+            conn.commit()
+        except sqlite3.IntegrityError:
+            dataset_id = None
+        finally:
+            conn.close()
+        return dataset_id
+
+    def delete_atomic_weight_dataset(self, dataset_id):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('UPDATE atomic_weight_datasets SET base_id = (SELECT base_id FROM atomic_weight_datasets WHERE id = ?) WHERE base_id = ?', (dataset_id, dataset_id))
+            cursor.execute('DELETE FROM atomic_weight_datasets WHERE id = ?', (dataset_id,))
+            cursor.execute("DELETE FROM settings WHERE key = 'active_dataset' AND value = ?", (str(dataset_id),))
+            conn.commit()
+            success = True
+        except Exception:
+            success = False
+        finally:
+            conn.close()
+        return success
+
+    def set_atomic_weight(self, dataset_id, symbol, atomic_mass, atomic_mass_uncertainty=0.0):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('INSERT OR REPLACE INTO atomic_weights (dataset_id, symbol, atomic_mass, atomic_mass_uncertainty) VALUES (?, ?, ?, ?)',
+                           (dataset_id, symbol.upper(), atomic_mass, atomic_mass_uncertainty))
+            conn.commit()
+            success = True
+        except Exception:
+            success = False
+        finally:
+            conn.close()
+        return success
+
+    def remove_atomic_weight(self, dataset_id, symbol):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM atomic_weights WHERE dataset_id = ? AND symbol = ?', (dataset_id, symbol))
+        conn.commit()
+        conn.close()
+
+    def import_atomic_weight_dataset(self, filename, name, version="", base_id=None, description=""):
+        try:
+            weights = []
+            with open(filename, 'r', encoding='utf-8') as file:
+                reader = csv.reader(file)
+                next(reader)
+                for row in reader:
+                    if len(row) >= 2:
+                        uncertainty = float(row[2]) if len(row) > 2 and row[2].strip() else 0.0
+                        weights.append((row[0].strip(), float(row[1]), uncertainty))
+            dataset_id = self.create_atomic_weight_dataset(name, version, base_id, description, weights)
+            return len(weights) if dataset_id else -1
+        except Exception:
+            return -1
+
+    def append_history(self, entries):
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        cursor = conn.cursor()
+        try:
+            cursor.executemany('INSERT INTO calculation_history (created_at, name, formula, molar_mass, uncertainty, composition, dataset) VALUES (?, ?, ?, ?, ?, ?, ?)', entries)
+            conn.commit()
+            success = True
+        except Exception:
+            conn.rollback()
+            success = False
+        finally:
+            conn.close()
+        return success
+
+    def get_history_page(self, before=None, limit=200, since=None, until=None):
+        conditions = []
+        params = []
+        if before is not None:
+            conditions.append('(created_at, id) < (?, ?)')
+            params.extend(before)
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('created_at < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT id, created_at, name, formula, molar_mass, uncertainty, composition, dataset FROM calculation_history {where} ORDER BY created_at DESC, id DESC LIMIT ?',
+                       (*params, limit))
+        entries = cursor.fetchall()
+        conn.close()
+        return entries
+
+    def get_history_after(self, after_id, limit=1000):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, created_at, name, formula, molar_mass, uncertainty, composition, dataset FROM calculation_history WHERE id > ? ORDER BY id LIMIT ?',
+                       (after_id, limit))
+        entries = cursor.fetchall()
+        conn.close()
+        return entries[::-1]
+
+    def count_history(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*) FROM calculation_history')
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
+
+    def compact_history(self, max_age_days=None, max_entries=None):
+        if max_age_days is None:
+            max_age_days = float(self.get_setting('history_retention_days', 365))
+        if max_entries is None:
+            max_entries = int(self.get_setting('history_max_entries', 1000000))
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        cursor = conn.cursor()
+        try:
+            removed = 0
+            if max_age_days > 0:
+                cursor.execute('DELETE FROM calculation_history WHERE created_at < ?', (time.time() - max_age_days * 86400,))
+                removed += cursor.rowcount
+            if max_entries > 0:
+                cursor.execute('SELECT id FROM calculation_history ORDER BY id DESC LIMIT 1 OFFSET ?', (max_entries,))
+                row = cursor.fetchone()
+                if row:
+                    cursor.execute('DELETE FROM calculation_history WHERE id <= ?', (row[0],))
+                    removed += cursor.rowcount
+            conn.commit()
+            cursor.execute('PRAGMA freelist_count')
+            free_pages = cursor.fetchone()[0]
+            cursor.execute('PRAGMA page_count')
+            if removed and free_pages * 4 > cursor.fetchone()[0]:
+                cursor.execute('VACUUM')
+        except Exception:
+            conn.rollback()
+            removed = -1
+        finally:
+            conn.close()
+        return removed
+
     def search_elements(self, query):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
@@ -131,11 +645,11 @@ class DatabaseManager:
         conn.close()
         return elements
 
-    def add_element(self, symbol, name, atomic_mass, atomic_number, category="", discovered_year=None):
+    def add_element(self, symbol, name, atomic_mass, atomic_number, category="", discovered_year=None, atomic_mass_uncertainty=0.0):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
         try:
-            cursor.execute('INSERT INTO elements (symbol, name, atomic_mass, atomic_number, category, discovered_year) VALUES (?, ?, ?, ?, ?, ?)', (symbol, name, atomic_mass, atomic_number, category, discovered_year))
+            cursor.execute('INSERT INTO elements (symbol, name, atomic_mass, atomic_number, category, discovered_year, atomic_mass_uncertainty) VALUES (?, ?, ?, ?, ?, ?, ?)', (symbol, name, atomic_mass, atomic_number, category, discovered_year, atomic_mass_uncertainty))
             conn.commit()
             success = True
         except sqlite3.IntegrityError:
@@ -170,6 +684,103 @@ class DatabaseManager:
             conn.close()
         return success
 
+    def get_pending_mass_changes(self):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT symbol, old_mass, new_mass, changed_at FROM element_mass_changes WHERE applied = 0 ORDER BY id')
+        changes = cursor.fetchall()
+        conn.close()
+        return changes
+
+    def recalculate_changed_masses(self):
+        conn = sqlite3.connect(self.db_name, timeout=30)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT MAX(id) FROM element_mass_changes WHERE applied = 0')
+            last_change = cursor.fetchone()[0]
+            if last_change is None:
+                conn.rollback()
+                return {'elements': [], 'saved_compounds': 0, 'common_compounds': 0}
+            cursor.execute('SELECT DISTINCT symbol FROM element_mass_changes WHERE applied = 0 AND id <= ? ORDER BY symbol', (last_change,))
+            symbols = [row[0] for row in cursor.fetchall()]
+            symbols_json = json.dumps(symbols)
+            atomic_masses = self.read_atomic_masses(cursor)
+            cursor.execute('''
+                SELECT id, composition FROM saved_compounds WHERE id IN (
+                    SELECT compound_id FROM compound_mass_percents WHERE symbol IN (SELECT value FROM json_each(?))
+                )
+            ''', (symbols_json,))
+            saved_updates = []
+            for compound_id, composition in cursor.fetchall():
+                try:
+                    molar_mass = calculate_molar_mass(parse_composition(composition), atomic_masses)
+                except FormulaError:
+                    continue
+                saved_updates.append((molar_mass, compound_id))
+                self.store_mass_percents(cursor, compound_id, composition, atomic_masses)
+            cursor.executemany('UPDATE saved_compounds SET molar_mass = ? WHERE id = ?', saved_updates)
+            cursor.execute('''
+                SELECT id, formula FROM common_compounds WHERE id IN (
+                    SELECT compound_id FROM common_compound_elements WHERE symbol IN (SELECT value FROM json_each(?))
+                )
+            ''', (symbols_json,))
+            common_updates = []
+            for compound_id, formula in cursor.fetchall():
+                try:
+                    composition = parse_formula(formula)
+                    common_updates.append((calculate_molar_mass(composition, atomic_masses), format_composition(composition), compound_id))
+                except FormulaError:
+                    continue
+            cursor.executemany('UPDATE common_compounds SET molar_mass = ?, composition = ? WHERE id = ?', common_updates)
+            cursor.execute('UPDATE element_mass_changes SET applied = 1 WHERE applied = 0 AND id <= ?', (last_change,))
+            conn.commit()
+            return {'elements': symbols, 'saved_compounds': len(saved_updates), 'common_compounds': len(common_updates)}
+        except Exception:
+            conn.rollback()
+            return None
+        finally:
+            conn.close()
+
+    def get_common_compounds_page(self, filter_text="", offset=0, limit=200):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name, formula, molar_mass, description, composition FROM common_compounds WHERE name LIKE ? OR formula LIKE ? ORDER BY name LIMIT ? OFFSET ?',
+                       (f'%{filter_text}%', f'%{filter_text}%', limit, offset))
+        compounds = cursor.fetchall()
+        conn.close()
+        return compounds
+
+    def import_common_compounds(self, filename):
+        try:
+            atomic_masses = self.get_atomic_masses()
+            compounds = []
+            with open(filename, 'r', encoding='utf-8') as file:
+                reader = csv.reader(file)
+                next(reader)
+                for row in reader:
+                    if len(row) < 2:
+                        continue
+                    name, formula = row[0].strip(), row[1].strip()
+                    description = row[2].strip() if len(row) > 2 else ""
+                    try:
+                        composition = parse_formula(formula)
+                        molar_mass = calculate_molar_mass(composition, atomic_masses)
+                    except FormulaError:
+                        continue
+                    compounds.append((name, formula, molar_mass, description, format_composition(composition)))
+            conn = sqlite3.connect(self.db_name)
+            cursor = conn.cursor()
+            try:
+                cursor.executemany('INSERT INTO common_compounds (name, formula, molar_mass, description, composition) VALUES (?, ?, ?, ?, ?)', compounds)
+                self.index_common_compounds(cursor)
+                conn.commit()
+            finally:
+                conn.close()
+            return len(compounds)
+        except Exception:
+            return -1
+
     def get_common_compounds(self):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
@@ -178,27 +789,231 @@ class DatabaseManager:
         conn.close()
         return compounds
 
+    UPSERT_COMPOUND = '''
+        INSERT INTO saved_compounds (name, formula, molar_mass, composition, composition_key) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (composition_key) DO UPDATE SET
+            name = excluded.name, formula = excluded.formula, molar_mass = excluded.molar_mass, composition = excluded.composition
+    '''
+
+    def find_compound_by_composition(self, composition):
+        key = composition_key(parse_composition(composition))
+        if not key:
+            return None
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds WHERE composition_key = ?', (key,))
+        compound = cursor.fetchone()
+        conn.close()
+        return compound
+
     def save_compound(self, name, formula, molar_mass, composition):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
         try:
-            cursor.execute('INSERT INTO saved_compounds (name, formula, molar_mass, composition) VALUES (?, ?, ?, ?)', (name, formula, molar_mass, composition))
+            key = composition_key(parse_composition(composition)) or None
+            cursor.execute(self.UPSERT_COMPOUND, (name, formula, molar_mass, composition, key))
+            compound_id = cursor.lastrowid
+            if key is not None:
+                cursor.execute('SELECT id FROM saved_compounds WHERE composition_key = ?', (key,))
+                compound_id = cursor.fetchone()[0]
+            self.store_mass_percents(cursor, compound_id, composition, self.read_atomic_masses(cursor))
             conn.commit()
-            success = True
         except Exception:
-            success = False
+            compound_id = None
         finally:
             conn.close()
-        return success
+        return compound_id
+
+    def save_compounds(self, compounds):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            atomic_masses = self.read_atomic_masses(cursor)
+            rows = []
+            for name, formula, composition in compounds:
+                parsed = parse_composition(composition)
+                try:
+                    molar_mass = calculate_molar_mass(parsed, atomic_masses)
+                except FormulaError:
+                    continue
+                rows.append((name, formula, molar_mass, composition, composition_key(parsed) or None))
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.executemany(self.UPSERT_COMPOUND, rows)
+            cursor.execute('SELECT id, composition FROM saved_compounds WHERE composition_key IN (SELECT value FROM json_each(?))',
+                           (json.dumps([row[4] for row in rows if row[4] is not None]),))
+            stored = cursor.fetchall()
+            cursor.execute('DELETE FROM compound_mass_percents WHERE compound_id IN (SELECT value FROM json_each(?))',
+                           (json.dumps([compound_id for compound_id, composition in stored]),))
+            cursor.executemany('INSERT INTO compound_mass_percents (compound_id, symbol, mass_percent) VALUES (?, ?, ?)',
+                               [(compound_id, symbol, percent)
+                                for compound_id, composition in stored
+                                for symbol, percent in calculate_mass_percents(parse_composition(composition), atomic_masses).items()])
+            conn.commit()
+            saved = len(rows)
+        except Exception:
+            conn.rollback()
+            saved = -1
+        finally:
+            conn.close()
+        return saved
 
     def get_saved_compounds(self):
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
-        cursor.execute('SELECT name, formula, molar_mass, composition, created_date FROM saved_compounds ORDER BY created_date DESC')
+        cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds ORDER BY created_date DESC, id DESC')
         compounds = cursor.fetchall()
         conn.close()
         return compounds
 
+    def get_saved_compound(self, compound_id):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds WHERE id = ?', (compound_id,))
+        compound = cursor.fetchone()
+        conn.close()
+        return compound
+
+    def iter_saved_compounds(self, compound_ids=None, batch_size=1000):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            if compound_ids is None:
+                cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds ORDER BY id')
+            else:
+                cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id', (json.dumps(list(compound_ids)),))
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def find_compounds_by_mass_percent(self, ranges):
+        conditions = []
+        params = []
+        for symbol, (low, high) in ranges.items():
+            if low <= 0:
+                conditions.append('id NOT IN (SELECT compound_id FROM compound_mass_percents WHERE symbol = ? AND mass_percent > ?)')
+                params.extend((symbol, high))
+            else:
+                conditions.append('id IN (SELECT compound_id FROM compound_mass_percents WHERE symbol = ? AND mass_percent BETWEEN ? AND ?)')
+                params.extend((symbol, low, high))
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name, formula, molar_mass, composition, created_date, tags FROM saved_compounds WHERE '
+                       + ' AND '.join(conditions or ['1']) + ' ORDER BY created_date DESC, id DESC', params)
+        compounds = cursor.fetchall()
+        conn.close()
+        return compounds
+
+    def iter_molar_masses(self, batch_size=10000):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT 'saved', id, molar_mass FROM saved_compounds
+                UNION ALL
+                SELECT 'common', id, molar_mass FROM common_compounds
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def iter_compound_compositions(self, batch_size=10000):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                SELECT 'saved', id, name, formula, composition FROM saved_compounds
+                UNION ALL
+                SELECT 'common', id, name, formula, composition FROM common_compounds WHERE composition != ''
+            ''')
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def get_compound_summaries(self, keys):
+        saved_ids = [compound_id for source, compound_id in keys if source == 'saved']
+        common_ids = [compound_id for source, compound_id in keys if source == 'common']
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT 'saved', id, name, formula FROM saved_compounds WHERE id IN (SELECT value FROM json_each(?))
+            UNION ALL
+            SELECT 'common', id, name, formula FROM common_compounds WHERE id IN (SELECT value FROM json_each(?))
+        ''', (json.dumps(saved_ids), json.dumps(common_ids)))
+        summaries = {(source, compound_id): (name, formula) for source, compound_id, name, formula in cursor.fetchall()}
+        conn.close()
+        return summaries
+
+    def delete_compounds(self, compound_ids):
+        return self.update_compounds('DELETE FROM saved_compounds WHERE id IN (SELECT value FROM json_each(?))', compound_ids)
+
+    def rename_compounds(self, compound_ids, name):
+        return self.update_compounds('UPDATE saved_compounds SET name = ? WHERE id IN (SELECT value FROM json_each(?))', compound_ids, name)
+
+    def set_compound_tags(self, compound_ids, tags):
+        return self.update_compounds('UPDATE saved_compounds SET tags = ? WHERE id IN (SELECT value FROM json_each(?))', compound_ids, tags)
+
+    def update_compounds(self, query, compound_ids, *values):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, (*values, json.dumps(list(compound_ids))))
+            conn.commit()
+            affected = cursor.rowcount
+        except Exception:
+            conn.rollback()
+            affected = -1
+        finally:
+            conn.close()
+        return affected
+
+    def export_compound_archive(self, filename):
+        try:
+            return write_compound_archive(filename, self.iter_saved_compounds(batch_size=10000))
+        except Exception:
+            return -1
+
+    def import_compound_archive(self, filename, batch_size=10000):
+        conn = sqlite3.connect(self.db_name)
+        cursor = conn.cursor()
+        try:
+            with CompoundArchive(filename) as archive:
+                atomic_masses = self.read_atomic_masses(cursor)
+                imported = 0
+                for start in range(0, len(archive), batch_size):
+                    rows = list(archive.iter_rows(start, start + batch_size))
+                    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM saved_compounds')
+                    first_id = cursor.fetchone()[0] + 1
+                    cursor.executemany('''
+                        INSERT INTO saved_compounds (id, name, formula, molar_mass, composition, created_date, tags, composition_key)
+                        VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?) ON CONFLICT (composition_key) DO NOTHING
+                    ''', [(first_id + offset, name, formula, molar_mass, composition, created_date or None, tags,
+                           composition_key(parse_composition(composition)) or None)
+                          for offset, (compound_id, name, formula, molar_mass, composition, created_date, tags) in enumerate(rows)])
+                    imported += cursor.rowcount
+                    cursor.executemany('INSERT INTO compound_mass_percents (compound_id, symbol, mass_percent) SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM saved_compounds WHERE id = ?)',
+                                       [(first_id + offset, symbol, percent, first_id + offset)
+                                        for offset, row in enumerate(rows)
+                                        for symbol, percent in calculate_mass_percents(parse_composition(row[4]), atomic_masses).items()])
+                conn.commit()
+        except Exception:
+            conn.rollback()
+            imported = -1
+        finally:
+            conn.close()
+        return imported
+
     def export_to_csv(self, filename):
         try:
             elements = self.get_all_elements()
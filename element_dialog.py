@@ -28,6 +28,11 @@ class AddElementDialog(QDialog):
         self.atomic_mass_input.setDecimals(4)
         self.atomic_mass_input.setSingleStep(0.1)
         self.atomic_mass_input.setValue(12.011)
+        self.uncertainty_input = QDoubleSpinBox()
+        self.uncertainty_input.setRange(0.0, 10.0)
+        self.uncertainty_input.setDecimals(5)
+        self.uncertainty_input.setSingleStep(0.001)
+        self.uncertainty_input.setValue(0.0)
         self.atomic_number_input = QSpinBox()
         self.atomic_number_input.setRange(1, 200)
         self.atomic_number_input.setValue(6)
@@ -43,6 +48,7 @@ class AddElementDialog(QDialog):
         form_layout.addRow("Символ элемента*:", self.symbol_input)
         form_layout.addRow("Название*:", self.name_input)
         form_layout.addRow("Атомная масса*:", self.atomic_mass_input)
+        form_layout.addRow("Погрешность массы:", self.uncertainty_input)
         form_layout.addRow("Атомный номер*:", self.atomic_number_input)
         form_layout.addRow("Категория:", self.category_combo)
         form_layout.addRow("Год открытия:", self.discovered_year_input)
@@ -82,9 +88,10 @@ class AddElementDialog(QDialog):
         if discovered_year == -5000:
             discovered_year = None
         return {
-            'symbol': self.symbol_input.text().strip(),
+            'symbol': self.symbol_input.text().strip().upper(),
             'name': self.name_input.text().strip(),
             'atomic_mass': self.atomic_mass_input.value(),
+            'atomic_mass_uncertainty': self.uncertainty_input.value(),
             'atomic_number': self.atomic_number_input.value(),
             'category': category,
             'discovered_year': discovered_year
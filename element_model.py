@@ -0,0 +1,168 @@
+from bisect import bisect_right
+from operator import itemgetter
+from PyQt6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QSortFilterProxyModel, QModelIndex
+
+SYMBOL_ROLE = Qt.ItemDataRole.UserRole
+ELEMENT_ROLE = Qt.ItemDataRole.UserRole + 1
+SORT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+class ElementListModel(QAbstractListModel):
+    def __init__(self, async_db, parent=None):
+        super().__init__(parent)
+        self.async_db = async_db
+        self.elements = []
+        self.rows = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.elements)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.elements):
+            return None
+        element = self.elements[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{element[0]} - {element[1]} ({element[2]})"
+        if role in (Qt.ItemDataRole.EditRole, SYMBOL_ROLE):
+            return element[0]
+        if role == ELEMENT_ROLE:
+            return element
+        return None
+
+    def reload(self):
+        self.async_db.get_element_records('elements', self.set_elements)
+
+    def set_elements(self, elements):
+        self.beginResetModel()
+        self.elements = [tuple(element) for element in elements]
+        self.rows = {}
+        self.reindex(0)
+        self.endResetModel()
+
+    def reindex(self, start):
+        for row in range(start, len(self.elements)):
+            self.rows[self.elements[row][0]] = row
+
+    def row_of(self, symbol):
+        return self.rows.get(symbol, -1)
+
+    def element(self, symbol):
+        row = self.rows.get(symbol)
+        return None if row is None else self.elements[row]
+
+    def add_element(self, element):
+        element = tuple(element)
+        if element[0] in self.rows:
+            self.update_element(element[0], element)
+            return
+        row = bisect_right(self.elements, element[4], key=itemgetter(4))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.elements.insert(row, element)
+        self.reindex(row)
+        self.endInsertRows()
+
+    def update_element(self, symbol, element):
+        element = tuple(element)
+        row = self.rows.get(symbol)
+        if row is None:
+            self.add_element(element)
+            return
+        if element[4] != self.elements[row][4]:
+            self.remove_element(symbol)
+            self.add_element(element)
+            return
+        del self.rows[symbol]
+        self.elements[row] = element
+        self.rows[element[0]] = row
+        self.dataChanged.emit(self.index(row), self.index(row))
+
+    def remove_element(self, symbol):
+        row = self.rows.pop(symbol, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.elements[row]
+        self.reindex(row)
+        self.endRemoveRows()
+
+class ElementTableModel(QAbstractTableModel):
+    HEADERS = ["Символ", "Название", "Атомная масса", "Атомный номер", "Категория", "Год открытия"]
+
+    def __init__(self, element_model, parent=None):
+        super().__init__(parent)
+        self.element_model = element_model
+        element_model.rowsAboutToBeInserted.connect(lambda parent, first, last: self.beginInsertRows(QModelIndex(), first, last))
+        element_model.rowsInserted.connect(self.endInsertRows)
+        element_model.rowsAboutToBeRemoved.connect(lambda parent, first, last: self.beginRemoveRows(QModelIndex(), first, last))
+        element_model.rowsRemoved.connect(self.endRemoveRows)
+        element_model.modelAboutToBeReset.connect(self.beginResetModel)
+        element_model.modelReset.connect(self.endResetModel)
+        element_model.dataChanged.connect(self.on_data_changed)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.element_model.elements)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.element_model.elements):
+            return None
+        element = self.element_model.elements[index.row()]
+        symbol, name, atomic_mass, category, atomic_number, discovered_year = element
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return symbol
+            if column == 1:
+                return name
+            if column == 2:
+                return f"{atomic_mass:.4f}"
+            if column == 3:
+                return str(atomic_number)
+            if column == 4:
+                return category if category else "Не указана"
+            return str(discovered_year) if discovered_year else "Неизвестно"
+        if role == SORT_ROLE:
+            return (symbol, name, atomic_mass, atomic_number, category or "", discovered_year or 0)[column]
+        if role == SYMBOL_ROLE:
+            return symbol
+        if role == ELEMENT_ROLE:
+            return element
+        return None
+
+    def on_data_changed(self, top_left, bottom_right):
+        self.dataChanged.emit(self.index(top_left.row(), 0), self.index(bottom_right.row(), len(self.HEADERS) - 1))
+
+class ElementFilterModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self.category = None
+        self.setSortRole(SORT_ROLE)
+
+    def set_query(self, query):
+        self.query = query.strip().casefold()
+        self.invalidateFilter()
+
+    def set_category(self, category):
+        self.category = category
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        element = self.sourceModel().index(source_row, 0, source_parent).data(ELEMENT_ROLE)
+        if element is None:
+            return False
+        if self.category is not None and element[3] != self.category:
+            return False
+        return not self.query or self.query in element[0].casefold() or self.query in element[1].casefold()
\ No newline at end of file
@@ -1,18 +1,21 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QTableView, QPushButton,
                              QLineEdit, QHeaderView, QMessageBox, QDialog,
                              QGroupBox, QComboBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 from element_dialog import AddElementDialog
+from element_model import ElementTableModel, ElementFilterModel, ELEMENT_ROLE
 
 class ElementsBrowser(QWidget):
-    def __init__(self, db_manager, parent=None):
+    def __init__(self, db_manager, async_db, element_model, parent=None):
         super().__init__(parent)
         self.db_manager = db_manager
+        self.async_db = async_db
+        self.element_model = element_model
         self.parent = parent
+        self.async_db.loading.connect(self.on_loading)
         self.init_ui()
-        self.refresh_elements()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -35,13 +38,17 @@ class ElementsBrowser(QWidget):
         search_layout.addWidget(self.category_combo)
         search_layout.addStretch()
         search_group.setLayout(search_layout)
-        self.elements_table = QTableWidget()
-        self.elements_table.setColumnCount(6)
-        self.elements_table.setHorizontalHeaderLabels([
-            "Символ", "Название", "Атомная масса", "Атомный номер", "Категория", "Год открытия"
-        ])
+        self.table_model = ElementTableModel(self.element_model, self)
+        self.filter_model = ElementFilterModel(self)
+        self.filter_model.setSourceModel(self.table_model)
+        self.elements_table = QTableView()
+        self.elements_table.setModel(self.filter_model)
         self.elements_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.elements_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.elements_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.elements_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.elements_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.elements_table.setSortingEnabled(True)
+        self.elements_table.sortByColumn(3, Qt.SortOrder.AscendingOrder)
         self.elements_table.doubleClicked.connect(self.edit_selected_element)
         control_layout = QHBoxLayout()
         self.add_button = QPushButton("Добавить элемент")
@@ -58,6 +65,11 @@ class ElementsBrowser(QWidget):
         control_layout.addStretch()
         control_layout.addWidget(self.refresh_button)
         self.stats_label = QLabel()
+        self.filter_model.rowsInserted.connect(self.update_stats)
+        self.filter_model.rowsRemoved.connect(self.update_stats)
+        self.filter_model.modelReset.connect(self.update_stats)
+        self.filter_model.layoutChanged.connect(self.update_stats)
+        self.update_stats()
         layout.addWidget(title_label)
         layout.addWidget(search_group)
         layout.addWidget(self.elements_table)
@@ -66,37 +78,31 @@ class ElementsBrowser(QWidget):
         self.setLayout(layout)
 
     def refresh_elements(self):
-        elements = self.db_manager.get_all_elements()
-        self.display_elements(elements)
+        self.element_model.reload()
 
-    def display_elements(self, elements):
-        self.elements_table.setRowCount(len(elements))
-        for row, (symbol, name, atomic_mass, category) in enumerate(elements):
-            full_data = self.db_manager.get_element_by_symbol(symbol)
-            self.elements_table.setItem(row, 0, QTableWidgetItem(symbol))
-            self.elements_table.setItem(row, 1, QTableWidgetItem(name))
-            self.elements_table.setItem(row, 2, QTableWidgetItem(f"{atomic_mass:.4f}"))
-            atomic_number = row + 1
-            self.elements_table.setItem(row, 3, QTableWidgetItem(str(atomic_number)))
-            self.elements_table.setItem(row, 4, QTableWidgetItem(category if category else "Не указана"))
-            self.elements_table.setItem(row, 5, QTableWidgetItem("Неизвестно"))
-        self.stats_label.setText(f"Всего элементов: {len(elements)}")
-
-    def search_elements(self):
-        query = self.search_input.text().strip()
-        if query:
-            elements = self.db_manager.search_elements(query)
-            self.display_elements(elements)
+    def on_loading(self, key, loading):
+        if key != 'elements':
+            return
+        self.refresh_button.setEnabled(not loading)
+        if loading:
+            self.stats_label.setText("Загрузка элементов...")
         else:
-            self.refresh_elements()
+            self.update_stats()
+
+    def update_stats(self):
+        self.stats_label.setText(f"Всего элементов: {self.filter_model.rowCount()}")
+
+    def search_elements(self, query):
+        self.filter_model.set_query(query)
 
     def filter_by_category(self, category):
-        if category == "Все категории":
-            self.refresh_elements()
-        else:
-            all_elements = self.db_manager.get_all_elements()
-            filtered = [elem for elem in all_elements if elem[3] == category]
-            self.display_elements(filtered)
+        self.filter_model.set_category(None if category == "Все категории" else category)
+
+    def selected_element(self):
+        index = self.elements_table.currentIndex()
+        if not index.isValid():
+            return None
+        return index.data(ELEMENT_ROLE)
 
     def add_element(self):
         dialog = AddElementDialog(self)
@@ -108,29 +114,32 @@ class ElementsBrowser(QWidget):
                 element_data['atomic_mass'],
                 element_data['atomic_number'],
                 element_data['category'],
-                element_data['discovered_year']
+                element_data['discovered_year'],
+                element_data['atomic_mass_uncertainty']
             )
             if success:
                 QMessageBox.information(self, "Успех", "Элемент успешно добавлен!")
-                self.refresh_elements()
+                self.element_model.add_element((element_data['symbol'], element_data['name'], element_data['atomic_mass'],
+                                                element_data['category'], element_data['atomic_number'],
+                                                element_data['discovered_year']))
                 if self.parent:
+                    self.parent.on_elements_changed()
                     self.parent.status_bar.showMessage("Элемент добавлен в базу")
             else:
                 QMessageBox.warning(self, "Ошибка", "Не удалось добавить элемент!")
 
     def edit_selected_element(self):
-        current_row = self.elements_table.currentRow()
-        if current_row >= 0:
-            symbol = self.elements_table.item(current_row, 0).text()
+        element = self.selected_element()
+        if element is not None:
+            symbol = element[0]
             QMessageBox.information(self, "Редактирование", f"Редактирование элемента {symbol}")
         else:
             QMessageBox.warning(self, "Ошибка", "Выберите элемент для редактирования!")
 
     def delete_selected_element(self):
-        current_row = self.elements_table.currentRow()
-        if current_row >= 0:
-            symbol = self.elements_table.item(current_row, 0).text()
-            name = self.elements_table.item(current_row, 1).text()
+        element = self.selected_element()
+        if element is not None:
+            symbol, name = element[0], element[1]
             reply = QMessageBox.question(
                 self, "Подтверждение",
                 f"Вы уверены, что хотите удалить элемент {symbol} ({name})?",
@@ -140,8 +149,9 @@ class ElementsBrowser(QWidget):
                 success = self.db_manager.delete_element(symbol)
                 if success:
                     QMessageBox.information(self, "Успех", "Элемент успешно удален!")
-                    self.refresh_elements()
+                    self.element_model.remove_element(symbol)
                     if self.parent:
+                        self.parent.on_elements_changed()
                         self.parent.status_bar.showMessage("Элемент удален из базы")
                 else:
                     QMessageBox.warning(self, "Ошибка", "Не удалось удалить элемент!")
@@ -0,0 +1,88 @@
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor
+from formula_parser import FormulaError, IncrementalFormulaParser, calculate_molar_mass
+
+class FormulaHighlighter(QSyntaxHighlighter):
+    def __init__(self, parser, document):
+        super().__init__(document)
+        self.parser = parser
+        self.unknown_format = QTextCharFormat()
+        self.unknown_format.setForeground(QColor("#c62828"))
+        self.unknown_format.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+        self.unknown_format.setUnderlineColor(QColor("#c62828"))
+        self.bracket_format = QTextCharFormat()
+        self.bracket_format.setBackground(QColor("#ffcdd2"))
+        self.bracket_format.setFontWeight(700)
+
+    def highlightBlock(self, text):
+        for start in self.parser.unknown:
+            self.setFormat(start, 2 if text[start + 1:start + 2].islower() else 1, self.unknown_format)
+        for start in self.parser.invalid_positions():
+            self.setFormat(start, 1, self.unknown_format)
+        for start in self.parser.unbalanced:
+            self.setFormat(start, 1, self.bracket_format)
+
+class FormulaEdit(QPlainTextEdit):
+    evaluated = pyqtSignal(object, object, str)
+    submitted = pyqtSignal()
+
+    def __init__(self, atomic_masses=None, delay=150, parent=None):
+        super().__init__(parent)
+        self.parser = IncrementalFormulaParser(atomic_masses)
+        self.composition = None
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setTabChangesFocus(True)
+        self.setFixedHeight(self.fontMetrics().height() + 2 * int(self.document().documentMargin()) + 2 * self.frameWidth())
+        self.document().contentsChange.connect(self.on_contents_change)
+        self.highlighter = FormulaHighlighter(self.parser, self.document())
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(delay)
+        self.debounce_timer.timeout.connect(self.evaluate)
+
+    def formula(self):
+        return self.parser.text
+
+    def set_atomic_masses(self, atomic_masses):
+        self.parser.set_atomic_masses(atomic_masses)
+        self.highlighter.rehighlight()
+        self.evaluate()
+
+    def on_contents_change(self, position, removed, added):
+        text = self.toPlainText()
+        removed = added - (len(text) - len(self.parser.text))
+        if position + added > len(text) or removed < 0 or position + removed > len(self.parser.text):
+            self.parser.set_text(text)
+        else:
+            self.parser.update(position, removed, text[position:position + added])
+        self.debounce_timer.start()
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self.debounce_timer.stop()
+            self.evaluate()
+            self.submitted.emit()
+            return
+        super().keyPressEvent(event)
+
+    def insertFromMimeData(self, source):
+        if source.hasText():
+            self.insertPlainText(" ".join(source.text().split()))
+
+    def evaluate(self):
+        self.debounce_timer.stop()
+        self.composition = None
+        if not self.parser.text.strip():
+            self.evaluated.emit(None, None, "")
+            return
+        try:
+            composition = self.parser.parse()
+            molar_mass = calculate_molar_mass(composition, self.parser.atomic_masses)
+        except FormulaError as error:
+            self.evaluated.emit(None, None, str(error))
+            return
+        self.composition = composition
+        self.evaluated.emit(composition, molar_mass, "")
\ No newline at end of file
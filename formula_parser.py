@@ -0,0 +1,198 @@
+import re
+from bisect import bisect_left
+from operator import itemgetter
+
+TOKEN_RE = re.compile(r'([A-Z][a-z]?)|(0\.\d+|\d+(?:\.\d+(?![\d\sA-Z(\[{]))?)|([(\[{])|([)\]}])|([·*.])|(\s+)')
+CLOSING_BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+class FormulaError(ValueError):
+    def __init__(self, message, position=None):
+        super().__init__(message)
+        self.position = position
+
+def tokenize_formula(formula):
+    tokens = []
+    position = 0
+    while position < len(formula):
+        match = TOKEN_RE.match(formula, position)
+        if not match:
+            raise FormulaError(f"Недопустимый символ '{formula[position]}' в позиции {position + 1}", position)
+        kind = match.lastindex
+        if kind != 6:
+            tokens.append((kind, match.group(), match.start(), match.end()))
+        position = match.end()
+    return tokens
+
+def parse_formula(formula):
+    return parse_tokens(tokenize_formula(formula.strip()))
+
+def parse_tokens(tokens):
+    if not tokens:
+        raise FormulaError("Пустая формула")
+    stack = [{}]
+    openers = []
+    segment_multiplier = 1.0
+    segment_started = False
+    index = 0
+    while index < len(tokens):
+        kind, value, start, end = tokens[index]
+        count = 1.0
+        if index + 1 < len(tokens) and tokens[index + 1][0] == 2 and kind in (1, 4):
+            count = float(tokens[index + 1][1])
+            index += 1
+        if kind == 1:
+            symbol = value.upper()
+            if len(stack) == 1:
+                count *= segment_multiplier
+            stack[-1][symbol] = stack[-1].get(symbol, 0.0) + count
+        elif kind == 2:
+            if segment_started:
+                raise FormulaError(f"Неожиданное число в позиции {start + 1}", start)
+            segment_multiplier = float(value)
+        elif kind == 3:
+            stack.append({})
+            openers.append((value, start))
+        elif kind == 4:
+            if not openers:
+                raise FormulaError(f"Лишняя закрывающая скобка в позиции {start + 1}", start)
+            opener, opener_start = openers.pop()
+            if CLOSING_BRACKETS[opener] != value:
+                raise FormulaError(f"Скобка в позиции {start + 1} не соответствует открывающей", start)
+            group = stack.pop()
+            if len(stack) == 1:
+                count *= segment_multiplier
+            for symbol, group_count in group.items():
+                stack[-1][symbol] = stack[-1].get(symbol, 0.0) + group_count * count
+        elif kind == 5:
+            if openers:
+                raise FormulaError(f"Разделитель внутри скобок в позиции {start + 1}", start)
+            segment_multiplier = 1.0
+            segment_started = False
+            index += 1
+            continue
+        segment_started = True
+        index += 1
+    if openers:
+        opener, opener_start = openers[-1]
+        raise FormulaError(f"Незакрытая скобка в позиции {opener_start + 1}", opener_start)
+    if not stack[0]:
+        raise FormulaError("Формула не содержит элементов")
+    return stack[0]
+
+class IncrementalFormulaParser:
+    def __init__(self, atomic_masses=None):
+        self.atomic_masses = atomic_masses or {}
+        self.text = ""
+        self.tokens = []
+        self.unknown = set()
+        self.unbalanced = []
+
+    def set_atomic_masses(self, atomic_masses):
+        self.atomic_masses = atomic_masses
+        self.unknown = {token[2] for token in self.tokens if token[0] == 1 and token[1].upper() not in atomic_masses}
+
+    def set_text(self, text):
+        self.update(0, len(self.text), text)
+
+    def scan(self, text, position):
+        match = TOKEN_RE.match(text, position)
+        if not match:
+            return (0, text[position], position, position + 1)
+        return (match.lastindex, match.group(), match.start(), match.end())
+
+    def lookahead_sensitive(self, token):
+        return token[0] == 2 or token[1] == '.'
+
+    def update(self, position, removed, added_text):
+        text = self.text[:position] + added_text + self.text[position + removed:]
+        delta = len(added_text) - removed
+        edit_end = position + len(added_text)
+        first = max(0, bisect_left(self.tokens, position, key=itemgetter(3)) - 1)
+        while first > 0 and self.lookahead_sensitive(self.tokens[first - 1]):
+            first -= 1
+        last = first
+        scan_position = self.tokens[first][2] if first < len(self.tokens) else len(self.text)
+        scan_position = min(scan_position, position)
+        scanned = []
+        while scan_position < len(text):
+            if scan_position >= edit_end and not (scanned and self.lookahead_sensitive(scanned[-1])):
+                while last < len(self.tokens) and self.tokens[last][2] + delta < scan_position:
+                    last += 1
+                if last < len(self.tokens) and self.tokens[last][2] + delta == scan_position:
+                    break
+            token = self.scan(text, scan_position)
+            scanned.append(token)
+            scan_position = token[3]
+        else:
+            last = len(self.tokens)
+        for token in self.tokens[first:last]:
+            self.unknown.discard(token[2])
+        tail = self.tokens[last:]
+        if delta:
+            self.unknown = {start + delta if start >= position + removed else start for start in self.unknown}
+            tail = [(kind, value, start + delta, end + delta) for kind, value, start, end in tail]
+        for kind, value, start, end in scanned:
+            if kind == 1 and value.upper() not in self.atomic_masses:
+                self.unknown.add(start)
+        self.tokens[first:] = scanned + tail
+        self.text = text
+        self.unbalanced = self.match_brackets()
+        return scanned
+
+    def match_brackets(self):
+        openers = []
+        unbalanced = []
+        for kind, value, start, end in self.tokens:
+            if kind == 3:
+                openers.append((value, start))
+            elif kind == 4:
+                if openers and CLOSING_BRACKETS[openers[-1][0]] == value:
+                    openers.pop()
+                else:
+                    unbalanced.append(start)
+        unbalanced.extend(start for value, start in openers)
+        return sorted(unbalanced)
+
+    def invalid_positions(self):
+        return [token[2] for token in self.tokens if token[0] == 0]
+
+    def parse(self):
+        for kind, value, start, end in self.tokens:
+            if kind == 0:
+                raise FormulaError(f"Недопустимый символ '{value}' в позиции {start + 1}", start)
+        return parse_tokens([token for token in self.tokens if token[0] != 6])
+
+def calculate_molar_mass(composition, atomic_masses):
+    total_mass = 0.0
+    for symbol, count in composition.items():
+        atomic_mass = atomic_masses.get(symbol)
+        if atomic_mass is None:
+            raise FormulaError(f"Элемент '{symbol}' не найден в базе данных")
+        total_mass += atomic_mass * count
+    return total_mass
+
+def calculate_mass_percents(composition, atomic_masses):
+    contributions = {symbol: atomic_masses[symbol] * count for symbol, count in composition.items() if symbol in atomic_masses}
+    total_mass = sum(contributions.values())
+    if total_mass <= 0:
+        return {}
+    return {symbol: contribution * 100.0 / total_mass for symbol, contribution in contributions.items()}
+
+def format_composition(composition):
+    return ";".join(f"{symbol}:{count}" for symbol, count in composition.items())
+
+def composition_key(composition):
+    counts = {}
+    for symbol, count in composition.items():
+        counts[symbol.upper()] = counts.get(symbol.upper(), 0.0) + count
+    symbols = sorted(counts, key=lambda symbol: (symbol != 'C', symbol != 'H', symbol)) if 'C' in counts else sorted(counts)
+    return ";".join(f"{symbol}:{counts[symbol]:.10g}" for symbol in symbols if counts[symbol] > 0)
+
+def parse_composition(composition_str):
+    composition = {}
+    for part in composition_str.split(";"):
+        if not part:
+            continue
+        symbol, count = part.split(":")
+        composition[symbol] = composition.get(symbol, 0.0) + float(count)
+    return composition
\ No newline at end of file
@@ -0,0 +1,89 @@
+from datetime import datetime
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from report_generator import format_molar_mass
+
+class HistoryModel(QAbstractTableModel):
+    HEADERS = ["Время", "Название", "Формула", "Молярная масса", "Набор масс"]
+
+    def __init__(self, db_manager, page_size=500, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.page_size = page_size
+        self.entries = []
+        self.since = None
+        self.until = None
+        self.exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.entries):
+            return None
+        entry_id, created_at, name, formula, molar_mass, uncertainty, composition, dataset = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S')
+            if column == 1:
+                return name
+            if column == 2:
+                return formula
+            if column == 3:
+                return format_molar_mass(molar_mass, uncertainty)
+            return dataset
+        if role == Qt.ItemDataRole.UserRole:
+            return self.entries[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        before = (self.entries[-1][1], self.entries[-1][0]) if self.entries else None
+        rows = self.db_manager.get_history_page(before, self.page_size, self.since, self.until)
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.entries), len(self.entries) + len(rows) - 1)
+            self.entries.extend(rows)
+            self.endInsertRows()
+
+    def set_range(self, since=None, until=None):
+        self.beginResetModel()
+        self.since = since
+        self.until = until
+        self.entries = []
+        self.exhausted = False
+        self.endResetModel()
+
+    def reload(self):
+        self.set_range(self.since, self.until)
+
+    def fetch_newest(self):
+        if not self.entries:
+            self.reload()
+            return
+        if self.until is not None:
+            return
+        rows = self.db_manager.get_history_after(self.entries[0][0], self.page_size)
+        if len(rows) >= self.page_size:
+            self.reload()
+        elif rows:
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self.entries[:0] = rows
+            self.endInsertRows()
\ No newline at end of file
@@ -0,0 +1,118 @@
+from datetime import datetime
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QHeaderView, QComboBox, QTableView,
+                             QGroupBox, QSpinBox, QMessageBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from history_model import HistoryModel
+
+class HistoryPanel(QWidget):
+    PERIODS = [("Все время", None), ("Сегодня", 0), ("7 дней", 7), ("30 дней", 30), ("365 дней", 365)]
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.parent = parent
+        self.init_ui()
+        self.update_stats()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        title_label = QLabel("История расчетов")
+        title_label.setFont(QFont("Arial", 16, QFont.Weight.Bold))
+        filter_layout = QHBoxLayout()
+        self.period_combo = QComboBox()
+        for label, days in self.PERIODS:
+            self.period_combo.addItem(label, days)
+        self.period_combo.currentIndexChanged.connect(self.apply_period)
+        filter_layout.addWidget(QLabel("Период:"))
+        filter_layout.addWidget(self.period_combo)
+        filter_layout.addStretch()
+        self.model = HistoryModel(self.db_manager, parent=self)
+        self.history_view = QTableView()
+        self.history_view.setModel(self.model)
+        self.history_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.history_view.verticalHeader().setVisible(False)
+        self.history_view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.history_view.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.history_view.doubleClicked.connect(self.load_entry)
+        retention_group = QGroupBox("Хранение истории")
+        retention_layout = QHBoxLayout()
+        self.retention_days_input = QSpinBox()
+        self.retention_days_input.setRange(0, 36500)
+        self.retention_days_input.setSpecialValueText("без ограничения")
+        self.retention_days_input.setSuffix(" дн.")
+        self.retention_days_input.setValue(int(float(self.db_manager.get_setting('history_retention_days', 365))))
+        self.max_entries_input = QSpinBox()
+        self.max_entries_input.setRange(0, 100000000)
+        self.max_entries_input.setSingleStep(100000)
+        self.max_entries_input.setSpecialValueText("без ограничения")
+        self.max_entries_input.setValue(int(self.db_manager.get_setting('history_max_entries', 1000000)))
+        self.compact_button = QPushButton("Применить и сжать")
+        self.compact_button.clicked.connect(self.compact)
+        retention_layout.addWidget(QLabel("Хранить:"))
+        retention_layout.addWidget(self.retention_days_input)
+        retention_layout.addWidget(QLabel("Не более записей:"))
+        retention_layout.addWidget(self.max_entries_input)
+        retention_layout.addStretch()
+        retention_layout.addWidget(self.compact_button)
+        retention_group.setLayout(retention_layout)
+        control_layout = QHBoxLayout()
+        self.load_button = QPushButton("Загрузить в калькулятор")
+        self.load_button.clicked.connect(lambda: self.load_entry(self.history_view.currentIndex()))
+        self.refresh_button = QPushButton("Обновить")
+        self.refresh_button.clicked.connect(self.refresh)
+        self.stats_label = QLabel()
+        control_layout.addWidget(self.load_button)
+        control_layout.addWidget(self.stats_label)
+        control_layout.addStretch()
+        control_layout.addWidget(self.refresh_button)
+        layout.addWidget(title_label)
+        layout.addLayout(filter_layout)
+        layout.addWidget(self.history_view)
+        layout.addWidget(retention_group)
+        layout.addLayout(control_layout)
+        self.setLayout(layout)
+
+    def apply_period(self):
+        days = self.period_combo.currentData()
+        since = None
+        if days is not None:
+            midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+            since = midnight - days * 86400
+        self.model.set_range(since)
+
+    def refresh(self):
+        self.model.reload()
+        self.update_stats()
+
+    def on_history_appended(self, count):
+        self.model.fetch_newest()
+        self.update_stats()
+
+    def update_stats(self):
+        self.stats_label.setText(f"Всего записей: {self.db_manager.count_history()}")
+
+    def compact(self):
+        self.db_manager.set_setting('history_retention_days', self.retention_days_input.value())
+        self.db_manager.set_setting('history_max_entries', self.max_entries_input.value())
+        if self.parent:
+            self.parent.compact_history(requested=True)
+
+    def on_history_compacted(self, removed, elapsed=None):
+        if removed < 0:
+            if elapsed is not None:
+                QMessageBox.warning(self, "Ошибка", "Не удалось сжать историю расчетов!")
+            return
+        if removed > 0 or elapsed is not None:
+            self.refresh()
+        if elapsed is not None and self.parent:
+            self.parent.status_bar.showMessage(f"Удалено записей истории: {removed} ({elapsed:.2f} с)")
+
+    def load_entry(self, index):
+        if not index.isValid():
+            QMessageBox.warning(self, "Ошибка", "Выберите запись истории!")
+            return
+        entry = index.data(Qt.ItemDataRole.UserRole)
+        if self.parent:
+            self.parent.load_history_entry(entry)
\ No newline at end of file
@@ -0,0 +1,76 @@
+import time
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+class HistoryRecorder(QObject):
+    flushed = pyqtSignal(int)
+
+    def __init__(self, db_manager, interval=2000, batch_size=100, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.pending = []
+        self.writer = None
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(interval)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def record(self, name, formula, molar_mass, uncertainty, composition, dataset=""):
+        self.pending.append((time.time(), name, formula, molar_mass, uncertainty, composition, dataset))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        self.flush_timer.stop()
+        if not self.pending or self.writer is not None:
+            return
+        entries, self.pending = self.pending, []
+        self.writer = HistoryWriter(self.db_manager, entries, self)
+        self.writer.finished.connect(self.on_writer_finished)
+        self.writer.start()
+
+    def on_writer_finished(self):
+        if self.writer is None:
+            return
+        writer, self.writer = self.writer, None
+        writer.deleteLater()
+        if writer.success:
+            self.flushed.emit(len(writer.entries))
+        else:
+            self.pending[:0] = writer.entries
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.pending and not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def close(self):
+        self.flush_timer.stop()
+        if self.writer is not None:
+            self.writer.wait()
+            if not self.writer.success:
+                self.pending[:0] = self.writer.entries
+            self.writer = None
+        if self.pending and self.db_manager.append_history(self.pending):
+            self.pending = []
+
+class HistoryWriter(QThread):
+    def __init__(self, db_manager, entries, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.entries = entries
+        self.success = False
+
+    def run(self):
+        self.success = self.db_manager.append_history(self.entries)
+
+class HistoryCompactionWorker(QThread):
+    compacted = pyqtSignal(int)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+
+    def run(self):
+        self.compacted.emit(self.db_manager.compact_history())
\ No newline at end of file
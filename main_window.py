@@ -1,28 +1,75 @@
 import sys
+import math
+import time
+import sqlite3
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QLabel, QLineEdit, QPushButton,
                              QTableWidget, QTableWidgetItem, QMessageBox,
                              QDialog, QFormLayout, QDoubleSpinBox, QSpinBox,
                              QTextEdit, QHeaderView, QGroupBox, QSplitter,
-                             QTabWidget, QComboBox, QListWidget, QListWidgetItem,
+                             QTabWidget, QComboBox, QListView,
                              QFileDialog, QProgressBar, QToolBar,
-                             QStatusBar, QMenu, QInputDialog)
-from PyQt6.QtCore import Qt
+                             QStatusBar, QMenu, QInputDialog, QCompleter)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QColor, QIcon, QPixmap, QAction
 from database_manager import DatabaseManager
 from result_window import ResultWindow
 from element_dialog import AddElementDialog
 from elements_browser import ElementsBrowser
 from compound_manager import CompoundManager
+from similarity_index import CompositionIndex
+from similar_compounds_dialog import SimilarCompoundsDialog
+from mass_index import MassIndex, SAVED_COMPOUND
+from mass_search_dialog import MassSearchDialog
+from common_compounds_model import CommonCompoundsModel
+from uncertainty import UncertaintyCalculator
+from formula_parser import parse_composition, format_composition
+from recalculation_worker import RecalculationWorker
+from backup_manager import BackupManager
+from backup_worker import BackupWorker
+from formula_editor import FormulaEdit
+from atomic_weights import AtomicWeightLibrary, BASE_DATASET
+from atomic_weights_dialog import AtomicWeightsDialog
+from history_recorder import HistoryRecorder, HistoryCompactionWorker
+from history_panel import HistoryPanel
+from archive_viewer_dialog import ArchiveViewerDialog
+from async_database import AsyncDatabase
+from element_model import ElementListModel
+from molecule_import_worker import MoleculeImportWorker
+from sync_manager import SyncManager, KEEP_LOCAL, TAKE_INCOMING, DELTA_EXTENSION
 
 class ChemicalCalculator(QMainWindow):
     def __init__(self):
         super().__init__()
         self.db_manager = DatabaseManager()
+        self.async_db = AsyncDatabase(self.db_manager, self)
+        self.async_db.loading.connect(self.on_database_loading)
+        self.async_db.failed.connect(self.on_database_failed)
+        self.element_model = ElementListModel(self.async_db, self)
         self.elements_list = []
         self.current_formula_name = ""
+        self.similarity_index = None
+        self.mass_index = None
+        self.recalculation_worker = None
+        self.recalculation_pending = False
+        self.atomic_weights = AtomicWeightLibrary(self.db_manager)
+        self.backup_manager = BackupManager(self.db_manager.db_name, schema_version=self.db_manager.schema_version())
+        self.backup_worker = None
+        self.molecule_import_worker = None
+        self.sync_manager = SyncManager(self.db_manager)
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.setInterval(60 * 60 * 1000)
+        self.snapshot_timer.timeout.connect(self.create_snapshot)
+        self.history_recorder = HistoryRecorder(self.db_manager, parent=self)
+        self.history_compaction_worker = None
+        self.history_compaction_timer = QTimer(self)
+        self.history_compaction_timer.setInterval(60 * 60 * 1000)
+        self.history_compaction_timer.timeout.connect(self.compact_history)
+        self.history_compaction_timer.start()
         self.init_ui()
+        self.element_model.reload()
         self.load_common_compounds()
+        self.recalculate_changed_masses()
 
     def init_ui(self):
         self.setWindowTitle("Химический калькулятор молярной массы")
@@ -35,10 +82,13 @@ class ChemicalCalculator(QMainWindow):
         self.tab_widget = QTabWidget()
         self.calculator_tab = self.create_calculator_tab()
         self.tab_widget.addTab(self.calculator_tab, "Калькулятор")
-        self.elements_tab = ElementsBrowser(self.db_manager, self)
+        self.elements_tab = ElementsBrowser(self.db_manager, self.async_db, self.element_model, self)
         self.tab_widget.addTab(self.elements_tab, "База элементов")
-        self.compounds_tab = CompoundManager(self.db_manager, self)
+        self.compounds_tab = CompoundManager(self.db_manager, self.async_db, self.element_model, self)
         self.tab_widget.addTab(self.compounds_tab, "Мои соединения")
+        self.history_tab = HistoryPanel(self.db_manager, self)
+        self.tab_widget.addTab(self.history_tab, "История")
+        self.history_recorder.flushed.connect(self.history_tab.on_history_appended)
         main_layout.addWidget(self.tab_widget)
         self.create_menus()
         self.create_toolbar()
@@ -70,6 +120,36 @@ class ChemicalCalculator(QMainWindow):
         import_action = QAction('Импорт элементов...', self)
         import_action.triggered.connect(self.import_elements)
         file_menu.addAction(import_action)
+        import_library_action = QAction('Импорт библиотеки соединений...', self)
+        import_library_action.triggered.connect(self.import_common_compounds)
+        file_menu.addAction(import_library_action)
+        export_archive_action = QAction('Экспорт соединений в архив...', self)
+        export_archive_action.triggered.connect(self.export_compound_archive)
+        file_menu.addAction(export_archive_action)
+        open_archive_action = QAction('Открыть архив соединений...', self)
+        open_archive_action.triggered.connect(self.open_compound_archive)
+        file_menu.addAction(open_archive_action)
+        import_molecules_action = QAction('Импорт молекул (SMILES/SDF)...', self)
+        import_molecules_action.triggered.connect(self.import_molecules)
+        file_menu.addAction(import_molecules_action)
+        export_delta_action = QAction('Экспорт изменений...', self)
+        export_delta_action.triggered.connect(self.export_delta)
+        file_menu.addAction(export_delta_action)
+        import_delta_action = QAction('Импорт изменений...', self)
+        import_delta_action.triggered.connect(self.import_delta)
+        file_menu.addAction(import_delta_action)
+        file_menu.addSeparator()
+        backup_action = QAction('Резервная копия базы...', self)
+        backup_action.triggered.connect(self.backup_database)
+        file_menu.addAction(backup_action)
+        restore_action = QAction('Восстановить базу из копии...', self)
+        restore_action.triggered.connect(self.restore_database)
+        file_menu.addAction(restore_action)
+        snapshot_action = QAction('Автоматические снимки (каждый час)', self)
+        snapshot_action.setCheckable(True)
+        snapshot_action.toggled.connect(self.set_snapshots_enabled)
+        snapshot_action.setChecked(True)
+        file_menu.addAction(snapshot_action)
         file_menu.addSeparator()
         exit_action = QAction('Выход', self)
         exit_action.setShortcut('Ctrl+Q')
@@ -93,6 +173,22 @@ class ChemicalCalculator(QMainWindow):
         add_element_action = QAction('Элемент', self)
         add_element_action.triggered.connect(self.show_add_element_dialog)
         toolbar.addAction(add_element_action)
+        toolbar.addSeparator()
+        self.similar_action = QAction('Похожие соединения', self)
+        self.similar_action.triggered.connect(self.show_similar_compounds)
+        toolbar.addAction(self.similar_action)
+        self.mass_search_action = QAction('Поиск по массе', self)
+        self.mass_search_action.triggered.connect(self.show_mass_search_dialog)
+        toolbar.addAction(self.mass_search_action)
+        toolbar.addSeparator()
+        atomic_weights_action = QAction('Атомные массы', self)
+        atomic_weights_action.triggered.connect(self.show_atomic_weights_dialog)
+        toolbar.addAction(atomic_weights_action)
+        self.dataset_combo = QComboBox()
+        self.dataset_combo.setToolTip("Активный набор атомных масс")
+        self.dataset_combo.activated.connect(self.switch_atomic_weights)
+        toolbar.addWidget(self.dataset_combo)
+        self.update_dataset_combo()
 
     def create_calculator_tab(self):
         tab = QWidget()
@@ -110,17 +206,30 @@ class ChemicalCalculator(QMainWindow):
     def create_input_panel(self):
         panel = QWidget()
         layout = QVBoxLayout()
+        formula_group = QGroupBox("Ввод формулы")
+        formula_layout = QVBoxLayout()
+        self.formula_input = FormulaEdit(self.atomic_weights.active.masses)
+        self.formula_input.setPlaceholderText("Например: CuSO4·5H2O")
+        self.formula_input.evaluated.connect(self.on_formula_evaluated)
+        self.formula_input.submitted.connect(self.load_formula)
+        self.load_formula_button = QPushButton("Загрузить формулу в состав")
+        self.load_formula_button.clicked.connect(self.load_formula)
+        formula_layout.addWidget(self.formula_input)
+        formula_layout.addWidget(self.load_formula_button)
+        formula_group.setLayout(formula_layout)
         input_group = QGroupBox("Добавление элемента")
         input_layout = QFormLayout()
         self.element_input = QLineEdit()
         self.element_input.setPlaceholderText("Введите символ элемента (C, H, O...)")
-        self.element_input.textChanged.connect(self.on_element_input_changed)
+        self.element_completer = QCompleter(self.element_model, self)
+        self.element_completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.element_input.setCompleter(self.element_completer)
         self.element_combo = QComboBox()
-        self.element_combo.addItem("-- Выберите элемент --")
-        elements = self.db_manager.get_all_elements()
-        for symbol, name, mass, category in elements:
-            self.element_combo.addItem(f"{symbol} - {name} ({mass})", symbol)
-        self.element_combo.currentIndexChanged.connect(self.on_element_combo_changed)
+        self.element_combo.setPlaceholderText("-- Выберите элемент --")
+        self.element_combo.setModel(self.element_model)
+        self.element_combo.setCurrentIndex(-1)
+        self.element_model.modelReset.connect(self.on_elements_reloaded, Qt.ConnectionType.QueuedConnection)
+        self.element_combo.activated.connect(self.on_element_combo_changed)
         self.quantity_input = QLineEdit()
         self.quantity_input.setPlaceholderText("Введите количество")
         self.quantity_input.setText("1")
@@ -133,8 +242,15 @@ class ChemicalCalculator(QMainWindow):
         input_group.setLayout(input_layout)
         common_group = QGroupBox("Распространенные соединения")
         common_layout = QVBoxLayout()
-        self.common_compounds_list = QListWidget()
-        self.common_compounds_list.itemDoubleClicked.connect(self.load_common_compound)
+        self.common_filter_input = QLineEdit()
+        self.common_filter_input.setPlaceholderText("Поиск по названию или формуле...")
+        self.common_filter_input.textChanged.connect(self.filter_common_compounds)
+        self.common_compounds_model = CommonCompoundsModel(self.db_manager, parent=self)
+        self.common_compounds_list = QListView()
+        self.common_compounds_list.setModel(self.common_compounds_model)
+        self.common_compounds_list.setUniformItemSizes(True)
+        self.common_compounds_list.doubleClicked.connect(self.load_common_compound)
+        common_layout.addWidget(self.common_filter_input)
         common_layout.addWidget(self.common_compounds_list)
         common_group.setLayout(common_layout)
         control_group = QGroupBox("Управление")
@@ -157,6 +273,7 @@ class ChemicalCalculator(QMainWindow):
         control_layout.addWidget(self.add_new_element_button)
         control_layout.addStretch()
         control_group.setLayout(control_layout)
+        layout.addWidget(formula_group)
         layout.addWidget(input_group)
         layout.addWidget(common_group)
         layout.addWidget(control_group)
@@ -183,9 +300,13 @@ class ChemicalCalculator(QMainWindow):
         info_group = QGroupBox("Информация")
         info_layout = QVBoxLayout()
         self.info_label = QLabel("Добавьте элементы для расчета")
+        self.formula_info_label = QLabel()
+        self.formula_info_label.setWordWrap(True)
+        self.formula_info_label.setVisible(False)
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         info_layout.addWidget(self.info_label)
+        info_layout.addWidget(self.formula_info_label)
         info_layout.addWidget(self.progress_bar)
         info_group.setLayout(info_layout)
         self.remove_button = QPushButton("Удалить выбранный элемент")
@@ -199,29 +320,71 @@ class ChemicalCalculator(QMainWindow):
         return panel
 
     def load_common_compounds(self):
-        compounds = self.db_manager.get_common_compounds()
-        self.common_compounds_list.clear()
-        for name, formula, molar_mass, description in compounds:
-            item = QListWidgetItem(f"{name} - {formula} ({molar_mass} г/моль)")
-            item.setData(Qt.ItemDataRole.UserRole, (name, formula))
-            self.common_compounds_list.addItem(item)
-
-    def load_common_compound(self, item):
-        name, formula = item.data(Qt.ItemDataRole.UserRole)
+        self.common_compounds_model.reload()
+
+    def filter_common_compounds(self, text):
+        self.common_compounds_model.set_filter(text.strip())
+
+    def load_common_compound(self, index):
+        compound_id, name, formula, molar_mass, description, composition = index.data(Qt.ItemDataRole.UserRole)
+        if not composition:
+            QMessageBox.warning(self, "Ошибка", f"Состав соединения '{name}' не удалось определить по формуле {formula}!")
+            return
+        self.elements_list = list(parse_composition(composition).items())
         self.compound_name_input.setText(name)
-        QMessageBox.information(self, "Информация", f"Соединение '{name}' загружено.\nФормула: {formula}")
+        self.update_elements_table()
+        self.update_formula_display()
+        self.calculate_button.setEnabled(True)
+        self.status_bar.showMessage(f"Соединение '{name}' ({formula}) загружено в калькулятор")
+
+    def on_formula_evaluated(self, composition, molar_mass, error):
+        formula = self.formula_input.formula().strip()
+        if error:
+            self.formula_info_label.setStyleSheet("color: #c62828;")
+            self.formula_info_label.setText(f"{formula}: {error}")
+        elif composition:
+            self.formula_info_label.setStyleSheet("")
+            self.formula_info_label.setText(f"{formula}: {molar_mass:.4f} г/моль")
+        self.formula_info_label.setVisible(bool(formula))
+
+    def load_formula(self):
+        self.formula_input.evaluate()
+        composition = self.formula_input.composition
+        if not composition:
+            QMessageBox.warning(self, "Ошибка", self.formula_info_label.text() or "Введите формулу!")
+            return
+        self.elements_list = list(composition.items())
+        self.update_elements_table()
+        self.update_formula_display()
+        self.calculate_button.setEnabled(True)
+        self.status_bar.showMessage(f"Формула {self.formula_input.formula().strip()} загружена в калькулятор")
+
+    def on_database_loading(self, key, loading):
+        if key == 'elements':
+            self.element_combo.setEnabled(not loading)
+            self.element_combo.setPlaceholderText("Загрузка элементов..." if loading else "-- Выберите элемент --")
+        elif key == 'similarity_index':
+            self.similar_action.setEnabled(not loading)
+            if loading:
+                self.status_bar.showMessage("Построение индекса похожих соединений...")
+        elif key == 'mass_index':
+            self.mass_search_action.setEnabled(not loading)
+            if loading:
+                self.status_bar.showMessage("Построение индекса молярных масс...")
+
+    def on_elements_reloaded(self):
+        self.element_combo.setCurrentIndex(-1)
 
-    def on_element_input_changed(self, text):
-        if text:
-            self.element_input.setText(text.upper())
+    def on_database_failed(self, key, message):
+        self.status_bar.showMessage(f"Ошибка чтения базы данных: {message}")
 
     def on_element_combo_changed(self, index):
-        if index > 0:
+        if index >= 0:
             symbol = self.element_combo.itemData(index)
             self.element_input.setText(symbol)
 
     def add_element_to_list(self):
-        symbol = self.element_input.text().strip()
+        symbol = self.element_input.text().strip().upper()
         quantity_text = self.quantity_input.text().strip()
         if not symbol:
             QMessageBox.warning(self, "Ошибка", "Введите символ элемента!")
@@ -237,16 +400,19 @@ class ChemicalCalculator(QMainWindow):
         except ValueError:
             QMessageBox.warning(self, "Ошибка", "Количество должно быть числом!")
             return
-        element_data = self.db_manager.get_element_by_symbol(symbol)
+        element_data = self.element_model.element(symbol)
         if not element_data:
-            QMessageBox.warning(self, "Ошибка", f"Элемент '{symbol}' не найден в базе данных!")
+            if self.async_db.is_loading('elements'):
+                QMessageBox.information(self, "Информация", "Список элементов еще загружается, повторите через мгновение.")
+            else:
+                QMessageBox.warning(self, "Ошибка", f"Элемент '{symbol}' не найден в базе данных!")
             return
         self.elements_list.append((symbol, quantity))
         self.update_elements_table()
         self.update_formula_display()
         self.element_input.clear()
         self.quantity_input.setText("1")
-        self.element_combo.setCurrentIndex(0)
+        self.element_combo.setCurrentIndex(-1)
         self.calculate_button.setEnabled(len(self.elements_list) > 0)
         self.status_bar.showMessage(f"Элемент {symbol} добавлен. Всего элементов: {len(self.elements_list)}")
 
@@ -264,9 +430,10 @@ class ChemicalCalculator(QMainWindow):
         self.elements_table.setRowCount(len(self.elements_list))
         total_mass = 0
         for row, (symbol, quantity) in enumerate(self.elements_list):
-            element_data = self.db_manager.get_element_by_symbol(symbol)
+            element_data = self.element_model.element(symbol)
             if element_data:
-                symbol_db, name, atomic_mass, category = element_data
+                symbol_db, name, atomic_mass, category = element_data[:4]
+                atomic_mass = self.atomic_weights.active.masses.get(symbol_db, atomic_mass)
                 element_mass = atomic_mass * quantity
                 total_mass += element_mass
                 self.elements_table.setItem(row, 0, QTableWidgetItem(name))
@@ -308,9 +475,10 @@ class ChemicalCalculator(QMainWindow):
         total_mass = 0.0
         elements_data = []
         for i, (symbol, quantity) in enumerate(self.elements_list):
-            element_data = self.db_manager.get_element_by_symbol(symbol)
+            element_data = self.element_model.element(symbol)
             if element_data:
-                symbol_db, name, atomic_mass, category = element_data
+                symbol_db, name, atomic_mass, category = element_data[:4]
+                atomic_mass = self.atomic_weights.active.masses.get(symbol_db, atomic_mass)
                 element_mass = atomic_mass * quantity
                 total_mass += element_mass
                 elements_data.append((symbol, quantity, element_mass, atomic_mass, name))
@@ -327,8 +495,14 @@ class ChemicalCalculator(QMainWindow):
         compound_name = self.compound_name_input.text().strip()
         if not compound_name:
             compound_name = "Неизвестное соединение"
-        self.result_window.show_results(compound_name, formula, total_mass, elements_data)
-        self.status_bar.showMessage(f"Расчет завершен: {total_mass:.2f} г/моль")
+        calculator = UncertaintyCalculator(self.atomic_weights.active.masses, self.atomic_weights.active.uncertainties)
+        uncertainty = calculator.calculate([self.current_composition()])[1][0]
+        if math.isnan(uncertainty):
+            uncertainty = None
+        self.history_recorder.record(compound_name, formula, total_mass, uncertainty,
+                                     format_composition(self.current_composition()), self.atomic_weights.active.name)
+        self.result_window.show_results(compound_name, formula, total_mass, elements_data, uncertainty)
+        self.status_bar.showMessage(f"Расчет завершен: {total_mass:.2f} г/моль (набор атомных масс: {self.atomic_weights.active.name})")
 
     def show_add_element_dialog(self):
         dialog = AddElementDialog(self)
@@ -343,15 +517,15 @@ class ChemicalCalculator(QMainWindow):
                 element_data['atomic_mass'],
                 element_data['atomic_number'],
                 element_data['category'],
-                element_data['discovered_year']
+                element_data['discovered_year'],
+                element_data['atomic_mass_uncertainty']
             )
             if success:
                 QMessageBox.information(self, "Успех", f"Элемент {element_data['symbol']} успешно добавлен в базу данных!")
-                self.element_combo.clear()
-                self.element_combo.addItem("-- Выберите элемент --")
-                elements = self.db_manager.get_all_elements()
-                for symbol, name, mass, category in elements:
-                    self.element_combo.addItem(f"{symbol} - {name} ({mass})", symbol)
+                self.element_model.add_element((element_data['symbol'], element_data['name'], element_data['atomic_mass'],
+                                                element_data['category'], element_data['atomic_number'],
+                                                element_data['discovered_year']))
+                self.on_elements_changed()
                 self.status_bar.showMessage(f"Элемент {element_data['symbol']} добавлен в базу")
             else:
                 QMessageBox.warning(self, "Ошибка", f"Элемент с символом {element_data['symbol']} уже существует в базе данных!")
@@ -368,20 +542,210 @@ class ChemicalCalculator(QMainWindow):
         total_mass = 0.0
         composition = []
         for symbol, quantity in self.elements_list:
-            element_data = self.db_manager.get_element_by_symbol(symbol)
+            element_data = self.element_model.element(symbol)
             if element_data:
-                symbol_db, name, atomic_mass, category = element_data
+                symbol_db, name, atomic_mass, category = element_data[:4]
                 total_mass += atomic_mass * quantity
                 composition.append(f"{symbol}:{quantity}")
         formula = self.formula_display.toPlainText()
         composition_str = ";".join(composition)
-        success = self.db_manager.save_compound(compound_name, formula, total_mass, composition_str)
-        if success:
-            QMessageBox.information(self, "Успех", "Соединение успешно сохранено!")
+        existing = self.db_manager.find_compound_by_composition(composition_str)
+        if existing:
+            reply = QMessageBox.question(
+                self, "Подтверждение",
+                f"Соединение с таким составом уже сохранено как '{existing[1]}'. Обновить его?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        compound_id = self.db_manager.save_compound(compound_name, formula, total_mass, composition_str)
+        if compound_id:
+            if not existing:
+                self.on_compound_saved(compound_id, composition_str, total_mass)
+            self.compounds_tab.load_saved_compounds()
+            QMessageBox.information(self, "Успех", "Соединение обновлено!" if existing else "Соединение успешно сохранено!")
             self.status_bar.showMessage(f"Соединение '{compound_name}' сохранено")
         else:
             QMessageBox.warning(self, "Ошибка", "Не удалось сохранить соединение!")
 
+    def build_similarity_index(self):
+        compounds = ((row[0], row[4]) for row in self.db_manager.iter_saved_compounds())
+        return CompositionIndex.from_compounds(compounds)
+
+    def build_mass_index(self):
+        return MassIndex(self.db_manager.iter_molar_masses())
+
+    def load_similarity_index(self):
+        self.async_db.request('similarity_index', self.build_similarity_index, callback=self.on_similarity_index_loaded)
+
+    def load_mass_index(self):
+        self.async_db.request('mass_index', self.build_mass_index, callback=self.on_mass_index_loaded)
+
+    def on_similarity_index_loaded(self, index):
+        self.similarity_index = index
+        self.show_similar_compounds()
+
+    def on_mass_index_loaded(self, index):
+        self.mass_index = index
+        self.show_mass_search_dialog()
+
+    def invalidate_similarity_index(self):
+        self.similarity_index = None
+        if self.async_db.is_loading('similarity_index'):
+            self.load_similarity_index()
+
+    def invalidate_mass_index(self):
+        self.mass_index = None
+        if self.async_db.is_loading('mass_index'):
+            self.load_mass_index()
+
+    def on_compound_saved(self, compound_id, composition_str, molar_mass):
+        if self.similarity_index is not None:
+            self.similarity_index.add(compound_id, parse_composition(composition_str))
+        else:
+            self.invalidate_similarity_index()
+        if self.mass_index is not None:
+            self.mass_index.add(SAVED_COMPOUND, compound_id, molar_mass)
+        else:
+            self.invalidate_mass_index()
+
+    def on_compounds_deleted(self, compound_ids):
+        if self.similarity_index is not None:
+            for compound_id in compound_ids:
+                self.similarity_index.remove(compound_id)
+        else:
+            self.invalidate_similarity_index()
+        if self.mass_index is not None:
+            self.mass_index.remove(SAVED_COMPOUND, compound_ids)
+        else:
+            self.invalidate_mass_index()
+
+    def on_elements_changed(self):
+        self.invalidate_mass_index()
+        self.atomic_weights.reload()
+        self.on_atomic_weights_changed()
+        self.load_common_compounds()
+        self.recalculate_changed_masses()
+
+    def recalculate_changed_masses(self):
+        if self.recalculation_worker is not None:
+            self.recalculation_pending = True
+            return
+        self.recalculation_worker = RecalculationWorker(self.db_manager, self)
+        self.recalculation_worker.recalculated.connect(self.on_masses_recalculated)
+        self.recalculation_worker.finished.connect(self.on_recalculation_finished)
+        self.recalculation_worker.start()
+
+    def on_masses_recalculated(self, summary):
+        if summary is None:
+            self.status_bar.showMessage("Не удалось пересчитать молярные массы")
+            return
+        if not summary['elements']:
+            return
+        self.invalidate_mass_index()
+        self.load_common_compounds()
+        self.compounds_tab.load_saved_compounds()
+        self.status_bar.showMessage(
+            f"Пересчитаны массы после изменения {', '.join(summary['elements'])}: "
+            f"мои соединения - {summary['saved_compounds']}, распространенные - {summary['common_compounds']}"
+        )
+
+    def on_recalculation_finished(self):
+        self.recalculation_worker.deleteLater()
+        self.recalculation_worker = None
+        if self.recalculation_pending:
+            self.recalculation_pending = False
+            self.recalculate_changed_masses()
+
+    def update_dataset_combo(self):
+        self.dataset_combo.clear()
+        self.dataset_combo.addItem(self.atomic_weights.dataset_name(0), 0)
+        for dataset_id in sorted(self.atomic_weights.datasets, key=self.atomic_weights.dataset_name):
+            self.dataset_combo.addItem(self.atomic_weights.dataset_name(dataset_id), dataset_id)
+        self.dataset_combo.setCurrentIndex(self.dataset_combo.findData(self.atomic_weights.active.dataset_id))
+
+    def switch_atomic_weights(self, index):
+        self.atomic_weights.activate(self.dataset_combo.itemData(index))
+        self.on_atomic_weights_changed()
+        self.status_bar.showMessage(f"Активный набор атомных масс: {self.atomic_weights.active.name}")
+
+    def on_atomic_weights_changed(self):
+        self.update_dataset_combo()
+        self.formula_input.set_atomic_masses(self.atomic_weights.active.masses)
+        self.update_elements_table()
+
+    def show_atomic_weights_dialog(self):
+        dialog = AtomicWeightsDialog(self.db_manager, self.atomic_weights, self)
+        dialog.exec()
+
+    def load_history_entry(self, entry):
+        entry_id, created_at, name, formula, molar_mass, uncertainty, composition, dataset = entry
+        self.elements_list = list(parse_composition(composition).items())
+        self.compound_name_input.setText(name)
+        self.update_elements_table()
+        self.update_formula_display()
+        self.calculate_button.setEnabled(bool(self.elements_list))
+        self.tab_widget.setCurrentWidget(self.calculator_tab)
+        self.status_bar.showMessage(f"Расчет '{name}' из истории загружен в калькулятор")
+
+    def compact_history(self, requested=False):
+        if self.history_compaction_worker is not None:
+            return
+        self.history_recorder.flush()
+        self.history_tab.compact_button.setEnabled(False)
+        self.history_compaction_worker = HistoryCompactionWorker(self.db_manager, self)
+        started = time.perf_counter()
+        self.history_compaction_worker.compacted.connect(
+            lambda removed: self.history_tab.on_history_compacted(removed, time.perf_counter() - started if requested else None))
+        self.history_compaction_worker.finished.connect(self.on_history_compaction_finished)
+        self.history_compaction_worker.start()
+
+    def on_history_compaction_finished(self):
+        self.history_compaction_worker.deleteLater()
+        self.history_compaction_worker = None
+        self.history_tab.compact_button.setEnabled(True)
+
+    def closeEvent(self, event):
+        self.snapshot_timer.stop()
+        self.history_compaction_timer.stop()
+        self.recalculation_pending = False
+        self.history_recorder.close()
+        if self.molecule_import_worker is not None:
+            self.molecule_import_worker.requestInterruption()
+        workers = [self.molecule_import_worker, self.backup_worker, self.recalculation_worker, self.history_compaction_worker]
+        if any(worker is not None and worker.isRunning() for worker in workers):
+            self.status_bar.showMessage("Ожидание завершения фоновых операций...")
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            for worker in workers:
+                if worker is not None:
+                    worker.wait()
+            QApplication.restoreOverrideCursor()
+        self.async_db.stop()
+        super().closeEvent(event)
+
+    def current_composition(self):
+        composition = {}
+        for symbol, quantity in self.elements_list:
+            composition[symbol.upper()] = composition.get(symbol.upper(), 0.0) + quantity
+        return composition
+
+    def show_similar_compounds(self):
+        if not self.elements_list:
+            QMessageBox.warning(self, "Ошибка", "Добавьте элементы для поиска похожих соединений!")
+            return
+        if self.similarity_index is None:
+            self.load_similarity_index()
+            return
+        dialog = SimilarCompoundsDialog(self.db_manager, self.similarity_index, self.current_composition(), self)
+        dialog.exec()
+
+    def show_mass_search_dialog(self):
+        if self.mass_index is None:
+            self.load_mass_index()
+            return
+        dialog = MassSearchDialog(self.db_manager, self.mass_index, self)
+        dialog.exec()
+
     def export_elements(self):
         filename, _ = QFileDialog.getSaveFileName(self, "Экспорт элементов", "chemical_elements.csv", "CSV Files (*.csv)")
         if filename:
@@ -399,12 +763,219 @@ class ChemicalCalculator(QMainWindow):
             if result > 0:
                 QMessageBox.information(self, "Успех", f"Успешно импортировано {result} элементов!")
                 self.elements_tab.refresh_elements()
+                self.on_elements_changed()
                 self.status_bar.showMessage(f"Импортировано {result} элементов")
             elif result == 0:
                 QMessageBox.information(self, "Информация", "Нет новых элементов для импорта.")
             else:
                 QMessageBox.warning(self, "Ошибка", "Не удалось импортировать элементы!")
 
+    def export_compound_archive(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Экспорт соединений в архив", "compounds.ccol", "Compound Archive (*.ccol)")
+        if filename:
+            result = self.db_manager.export_compound_archive(filename)
+            if result >= 0:
+                QMessageBox.information(self, "Успех", f"В архив записано соединений: {result}")
+                self.status_bar.showMessage(f"Соединения экспортированы в {filename}")
+            else:
+                QMessageBox.warning(self, "Ошибка", "Не удалось экспортировать соединения!")
+
+    def open_compound_archive(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Открыть архив соединений", "", "Compound Archive (*.ccol)")
+        if not filename:
+            return
+        try:
+            dialog = ArchiveViewerDialog(self.db_manager, filename, self)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось открыть архив: {error}")
+            return
+        dialog.exec()
+        if dialog.imported:
+            self.invalidate_similarity_index()
+            self.invalidate_mass_index()
+            self.compounds_tab.load_saved_compounds()
+            self.status_bar.showMessage(f"Импортировано {dialog.imported} соединений из архива")
+
+    def import_molecules(self):
+        if self.molecule_import_worker is not None:
+            QMessageBox.information(self, "Информация", "Импорт молекул уже выполняется.")
+            return
+        filename, _ = QFileDialog.getOpenFileName(self, "Импорт молекул", "",
+                                                  "Molecule Files (*.smi *.smiles *.sdf *.sd *.mol);;All Files (*)")
+        if not filename:
+            return
+        self.molecule_import_worker = MoleculeImportWorker(self.db_manager, filename, self.atomic_weights.weights(BASE_DATASET), parent=self)
+        self.molecule_import_worker.progress.connect(self.on_molecule_import_progress)
+        self.molecule_import_worker.completed.connect(self.on_molecules_imported)
+        self.molecule_import_worker.failed.connect(
+            lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось импортировать молекулы: {error}"))
+        self.molecule_import_worker.finished.connect(self.on_molecule_import_finished)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.status_bar.showMessage(f"Импорт молекул из {filename}...")
+        self.molecule_import_worker.start()
+
+    def on_molecule_import_progress(self, processed, errors):
+        self.status_bar.showMessage(f"Импорт молекул: обработано записей {processed}, с ошибками {errors}")
+
+    def on_molecules_imported(self, summary):
+        message = f"Обработано записей: {summary['processed']}\nСохранено соединений: {summary['saved']}\nС ошибками: {summary['errors']}"
+        if summary['cancelled']:
+            message = "Импорт прерван.\n" + message
+        if summary['messages']:
+            message += "\n\n" + "\n".join(summary['messages'][:20])
+            if summary['errors'] > 20:
+                message += f"\n... и еще {summary['errors'] - 20}"
+        QMessageBox.information(self, "Импорт молекул", message)
+        self.status_bar.showMessage(f"Импортировано {summary['saved']} соединений из файла молекул")
+
+    def on_molecule_import_finished(self):
+        self.progress_bar.setVisible(False)
+        self.progress_bar.setRange(0, 100)
+        self.molecule_import_worker.deleteLater()
+        self.molecule_import_worker = None
+        self.invalidate_similarity_index()
+        self.invalidate_mass_index()
+        self.compounds_tab.load_saved_compounds()
+
+    def export_delta(self):
+        peers = self.sync_manager.peers()
+        items = ["Все изменения"] + [f"{database_id} (подтверждено до {acknowledged})" for database_id, imported, acknowledged, synced_at in peers]
+        item, ok = QInputDialog.getItem(self, "Экспорт изменений", "Получатель:", items, 1 if peers else 0, False)
+        if not ok:
+            return
+        peer_id = peers[items.index(item) - 1][0] if items.index(item) > 0 else None
+        filename, _ = QFileDialog.getSaveFileName(self, "Экспорт изменений", "changes" + DELTA_EXTENSION, "Delta Files (*.json)")
+        if not filename:
+            return
+        try:
+            summary = self.sync_manager.export_delta(filename, peer_id, None if peer_id else 0)
+        except (OSError, sqlite3.Error) as error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось экспортировать изменения: {error}")
+            return
+        self.status_bar.showMessage(f"Экспортировано изменений: {summary['rows']} (номера {summary['since'] + 1}..{summary['until']})")
+
+    def import_delta(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Импорт изменений", "", "Delta Files (*.json)")
+        if not filename:
+            return
+        try:
+            result = self.sync_manager.import_delta(filename)
+            if result['status'] == 'conflicts':
+                lines = [f"{conflict.table}: {conflict.key} — локально {conflict.local}, входящее {conflict.incoming}"
+                         for conflict in result['conflicts'][:20]]
+                box = QMessageBox(QMessageBox.Icon.Question, "Конфликты изменений",
+                                  f"Найдено конфликтов: {len(result['conflicts'])}\n\n" + "\n".join(lines), parent=self)
+                incoming_button = box.addButton("Принять входящие", QMessageBox.ButtonRole.AcceptRole)
+                local_button = box.addButton("Оставить локальные", QMessageBox.ButtonRole.AcceptRole)
+                box.addButton(QMessageBox.StandardButton.Cancel)
+                box.exec()
+                if box.clickedButton() not in (incoming_button, local_button):
+                    return
+                result = self.sync_manager.import_delta(filename, TAKE_INCOMING if box.clickedButton() is incoming_button else KEEP_LOCAL)
+        except (OSError, ValueError, sqlite3.Error) as error:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось импортировать изменения: {error}")
+            return
+        if result['status'] == 'gap':
+            QMessageBox.warning(self, "Ошибка", f"Пропущены изменения {result['missing'][0] + 1}..{result['missing'][1]} этой базы. "
+                                                "Запросите у отправителя полный экспорт изменений.")
+            return
+        if result['status'] == 'up_to_date':
+            self.status_bar.showMessage("Изменения уже были импортированы")
+            return
+        self.invalidate_similarity_index()
+        self.invalidate_mass_index()
+        self.compounds_tab.load_saved_compounds()
+        if result['elements_changed']:
+            self.elements_tab.refresh_elements()
+            self.on_elements_changed()
+        QMessageBox.information(self, "Успех", f"Применено изменений: {result['applied']}, оставлено локальных: {result['skipped']}")
+        self.status_bar.showMessage(f"Импортировано изменений: {result['applied']}")
+
+    def import_common_compounds(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Импорт библиотеки соединений", "", "CSV Files (*.csv)")
+        if filename:
+            result = self.db_manager.import_common_compounds(filename)
+            if result >= 0:
+                self.load_common_compounds()
+                self.invalidate_mass_index()
+                QMessageBox.information(self, "Успех", f"Импортировано соединений: {result}")
+                self.status_bar.showMessage(f"Импортировано {result} соединений в библиотеку")
+            else:
+                QMessageBox.warning(self, "Ошибка", "Не удалось импортировать библиотеку соединений!")
+
+    def start_backup_operation(self, completed, failed, operation, *args):
+        if self.backup_worker is not None:
+            return False
+        self.backup_worker = BackupWorker(operation, *args, parent=self)
+        self.backup_worker.completed.connect(completed)
+        self.backup_worker.failed.connect(failed)
+        self.backup_worker.progress.connect(self.on_backup_progress)
+        self.backup_worker.finished.connect(self.on_backup_finished)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.backup_worker.start()
+        return True
+
+    def on_backup_progress(self, copied, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(copied)
+
+    def on_backup_finished(self):
+        self.progress_bar.setVisible(False)
+        self.backup_worker.deleteLater()
+        self.backup_worker = None
+
+    def backup_database(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Резервная копия базы", self.backup_manager.snapshot_name(), "SQLite Database (*.db)")
+        if filename:
+            if not self.start_backup_operation(
+                    lambda path: self.status_bar.showMessage(f"Резервная копия сохранена: {path}"),
+                    lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось создать резервную копию: {error}"),
+                    self.backup_manager.backup, filename):
+                QMessageBox.information(self, "Информация", "Резервное копирование уже выполняется.")
+
+    def set_snapshots_enabled(self, enabled):
+        if enabled:
+            self.snapshot_timer.start()
+        else:
+            self.snapshot_timer.stop()
+
+    def create_snapshot(self):
+        self.start_backup_operation(
+            lambda path: self.status_bar.showMessage(f"Создан снимок базы: {path}"),
+            lambda error: self.status_bar.showMessage(f"Не удалось создать снимок базы: {error}"),
+            self.backup_manager.snapshot)
+
+    def restore_database(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Восстановление базы", self.backup_manager.backup_dir, "SQLite Database (*.db)")
+        if not filename:
+            return
+        reply = QMessageBox.question(
+            self, "Подтверждение",
+            "Текущая база будет заменена содержимым копии. Перед заменой будет создан снимок. Продолжить?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        if not self.start_backup_operation(
+                self.on_database_restored,
+                lambda error: QMessageBox.warning(self, "Ошибка", f"Не удалось восстановить базу: {error}"),
+                self.backup_manager.restore, filename):
+            QMessageBox.information(self, "Информация", "Резервное копирование уже выполняется.")
+
+    def on_database_restored(self, problems):
+        if problems:
+            QMessageBox.warning(self, "Ошибка", "Копия не прошла проверку:\n" + "\n".join(problems))
+            return
+        self.db_manager.migrate_database()
+        self.invalidate_similarity_index()
+        self.elements_tab.refresh_elements()
+        self.compounds_tab.load_saved_compounds()
+        self.on_elements_changed()
+        QMessageBox.information(self, "Успех", "База данных восстановлена из резервной копии!")
+        self.status_bar.showMessage("База данных восстановлена")
+
     def show_about(self):
         about_text = """
         <h2>Химический калькулятор</h2>
@@ -0,0 +1,34 @@
+import numpy as np
+
+SAVED_COMPOUND = 'saved'
+COMMON_COMPOUND = 'common'
+
+class MassIndex:
+    def __init__(self, entries=()):
+        entries = sorted(entries, key=lambda entry: entry[2])
+        self.masses = np.array([entry[2] for entry in entries], dtype=np.float64)
+        self.keys = [(entry[0], entry[1]) for entry in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, source, compound_id, molar_mass):
+        position = int(np.searchsorted(self.masses, molar_mass, side='right'))
+        self.masses = np.insert(self.masses, position, molar_mass)
+        self.keys.insert(position, (source, compound_id))
+
+    def remove(self, source, compound_ids):
+        removed = {(source, compound_id) for compound_id in compound_ids}
+        keep = [key not in removed for key in self.keys]
+        self.masses = self.masses[np.array(keep, dtype=bool)]
+        self.keys = [key for key, kept in zip(self.keys, keep) if kept]
+        return len(keep) - len(self.keys)
+
+    def lookup(self, molar_mass, tolerance, limit=None):
+        start = int(np.searchsorted(self.masses, molar_mass - tolerance, side='left'))
+        stop = int(np.searchsorted(self.masses, molar_mass + tolerance, side='right'))
+        errors = self.masses[start:stop] - molar_mass
+        order = np.argsort(np.abs(errors), kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [(*self.keys[start + i], float(self.masses[start + i]), float(errors[i])) for i in order]
\ No newline at end of file
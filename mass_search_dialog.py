@@ -0,0 +1,72 @@
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QDoubleSpinBox, QFormLayout)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from mass_index import SAVED_COMPOUND
+
+class MassSearchDialog(QDialog):
+    def __init__(self, db_manager, index, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.index = index
+        self.setWindowTitle("Поиск соединений по молярной массе")
+        self.resize(700, 450)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        title_label = QLabel("Соединения с молярной массой в заданном интервале")
+        title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        form_layout = QFormLayout()
+        self.mass_input = QDoubleSpinBox()
+        self.mass_input.setRange(0.0, 1000000.0)
+        self.mass_input.setDecimals(4)
+        self.mass_input.setValue(18.015)
+        self.mass_input.setSuffix(" г/моль")
+        self.tolerance_input = QDoubleSpinBox()
+        self.tolerance_input.setRange(0.0, 10000.0)
+        self.tolerance_input.setDecimals(4)
+        self.tolerance_input.setValue(0.5)
+        self.tolerance_input.setPrefix("± ")
+        self.tolerance_input.setSuffix(" г/моль")
+        form_layout.addRow("Измеренная масса:", self.mass_input)
+        form_layout.addRow("Допуск:", self.tolerance_input)
+        self.search_button = QPushButton("Найти")
+        self.search_button.clicked.connect(self.search)
+        self.results_table = QTableWidget()
+        self.results_table.setColumnCount(5)
+        self.results_table.setHorizontalHeaderLabels(["Источник", "Название", "Формула", "Молярная масса", "Отклонение"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.stats_label = QLabel()
+        self.close_button = QPushButton("Закрыть")
+        self.close_button.clicked.connect(self.close)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.stats_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+        layout.addWidget(title_label)
+        layout.addLayout(form_layout)
+        layout.addWidget(self.search_button)
+        layout.addWidget(self.results_table)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def search(self):
+        started = time.perf_counter()
+        matches = self.index.lookup(self.mass_input.value(), self.tolerance_input.value(), 1000)
+        elapsed = (time.perf_counter() - started) * 1000
+        summaries = self.db_manager.get_compound_summaries([(source, compound_id) for source, compound_id, _, _ in matches])
+        self.results_table.setRowCount(len(matches))
+        for row, (source, compound_id, molar_mass, error) in enumerate(matches):
+            name, formula = summaries.get((source, compound_id), ("", ""))
+            self.results_table.setItem(row, 0, QTableWidgetItem("Мои соединения" if source == SAVED_COMPOUND else "Распространенные"))
+            self.results_table.setItem(row, 1, QTableWidgetItem(name))
+            self.results_table.setItem(row, 2, QTableWidgetItem(formula))
+            self.results_table.setItem(row, 3, QTableWidgetItem(f"{molar_mass:.4f} г/моль"))
+            self.results_table.setItem(row, 4, QTableWidgetItem(f"{error:+.4f}"))
+        self.stats_label.setText(f"Найдено: {len(matches)} из {len(self.index)} ({elapsed:.2f} мс)")
\ No newline at end of file
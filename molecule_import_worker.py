@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+from batch_calculator import BatchCalculator
+from molecule_reader import read_molecule_file
+
+class MoleculeImportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, db_manager, filename, atomic_weights, batch_size=1000, max_messages=200, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.filename = filename
+        self.atomic_weights = atomic_weights
+        self.batch_size = batch_size
+        self.max_messages = max_messages
+
+    def save_batch(self, batch, summary):
+        if not batch:
+            return
+        saved = self.db_manager.save_compounds(batch)
+        if saved < 0:
+            raise OSError("Не удалось сохранить соединения в базу данных")
+        summary['saved'] += saved
+
+    def run(self):
+        calculator = BatchCalculator(self.atomic_weights.masses, uncertainties=self.atomic_weights.uncertainties,
+                                     chunk_size=self.batch_size)
+        summary = {'processed': 0, 'saved': 0, 'errors': 0, 'messages': [], 'cancelled': False}
+        records = read_molecule_file(self.filename)
+        batch = []
+        try:
+            for result in calculator.calculate_molecules(records):
+                summary['processed'] += 1
+                if result.error is None:
+                    batch.append((result.name, result.formula, result.composition))
+                else:
+                    summary['errors'] += 1
+                    if len(summary['messages']) < self.max_messages:
+                        summary['messages'].append(f"Запись {result.line_number} ({result.name}): {result.error}")
+                if summary['processed'] % self.batch_size == 0:
+                    self.save_batch(batch, summary)
+                    batch = []
+                    self.progress.emit(summary['processed'], summary['errors'])
+                    if self.isInterruptionRequested():
+                        summary['cancelled'] = True
+                        break
+            self.save_batch(batch, summary)
+        except Exception as error:
+            self.failed.emit(str(error))
+            return
+        finally:
+            records.close()
+        self.completed.emit(summary)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import re
+from collections import namedtuple
+from formula_parser import FormulaError
+
+MoleculeRecord = namedtuple('MoleculeRecord', ['record_number', 'name', 'formula', 'composition', 'error'])
+
+SMILES_EXTENSIONS = ('.smi', '.smiles')
+SDF_EXTENSIONS = ('.sdf', '.sd', '.mol')
+MOLECULE_EXTENSIONS = SMILES_EXTENSIONS + SDF_EXTENSIONS
+
+DEFAULT_VALENCES = {'B': (3,), 'C': (4,), 'N': (3, 5), 'O': (2,), 'P': (3, 5), 'S': (2, 4, 6),
+                    'F': (1,), 'Cl': (1,), 'Br': (1,), 'I': (1,)}
+SMILES_TOKEN_RE = re.compile(r'(\[[^\]]*\])|(Cl|Br|[BCNOPSFI])|([bcnops])|(%\d\d|\d)|([-=#$:/\\])|(\()|(\))|(\.)')
+BRACKET_ATOM_RE = re.compile(r'\[(\d*)([A-Z][a-z]?|se|as|[bcnops])(@(?:@|TH[12]|AL[12]|SP[123]|TB\d\d?|OH\d\d?)?)?(H\d*)?(\+\+|--|[+-]\d*)?(:\d+)?\]')
+SMILES_BONDS = {'-': 1, '=': 2, '#': 3, '$': 4, ':': 1, '/': 1, '\\': 1}
+MOLFILE_BONDS = {1: 1, 2: 2, 3: 3, 4: 1}
+MOLFILE_CHARGES = {1: 3, 2: 2, 3: 1, 5: -1, 6: -2, 7: -3}
+HYDROGEN_ISOTOPES = {'D': 'H', 'T': 'H'}
+QUERY_ATOMS = {'A', 'Q', '*', 'L', 'LP', 'R', 'R#'}
+
+def charged_valence(element, valence, charge):
+    if element == 'C':
+        return valence - abs(charge)
+    if element == 'B':
+        return valence - charge
+    return valence + charge
+
+def implicit_hydrogens(element, bond_orders, charge=0, aromatic=False):
+    used = bond_orders + (1 if aromatic else 0)
+    valences = DEFAULT_VALENCES.get(element, ())
+    for valence in valences[:1] if aromatic else valences:
+        valence = charged_valence(element, valence, charge)
+        if valence >= used:
+            return valence - used
+    return 0
+
+def hill_formula(counts):
+    if 'C' in counts:
+        symbols = sorted(counts, key=lambda symbol: (symbol != 'C', symbol != 'H', symbol))
+    else:
+        symbols = sorted(counts)
+    return "".join(symbol + (str(counts[symbol]) if counts[symbol] != 1 else "") for symbol in symbols if counts[symbol])
+
+def molecule_record(record_number, name, counts):
+    formula = hill_formula(counts)
+    if not formula:
+        return MoleculeRecord(record_number, name, formula, None, "Молекула не содержит атомов")
+    composition = {}
+    for symbol, count in counts.items():
+        composition[symbol.upper()] = composition.get(symbol.upper(), 0.0) + count
+    return MoleculeRecord(record_number, name, formula, composition, None)
+
+def bracket_atom(token, position):
+    match = BRACKET_ATOM_RE.fullmatch(token)
+    if not match:
+        raise FormulaError(f"Недопустимый атом {token} в позиции {position + 1}", position)
+    isotope, symbol, chirality, hydrogens, charge, atom_class = match.groups()
+    return [symbol.capitalize(), symbol.islower(), int(hydrogens[1:] or 1) if hydrogens else 0, 0]
+
+def smiles_element_counts(smiles):
+    atoms = []
+    branches = []
+    rings = {}
+    previous = None
+    bond = None
+    position = 0
+    if not smiles:
+        raise FormulaError("Пустая строка SMILES")
+    while position < len(smiles):
+        match = SMILES_TOKEN_RE.match(smiles, position)
+        if not match:
+            raise FormulaError(f"Недопустимый символ '{smiles[position]}' в позиции {position + 1}", position)
+        kind = match.lastindex
+        token = match.group()
+        if kind <= 3:
+            atoms.append(bracket_atom(token, position) if kind == 1 else [token.capitalize(), kind == 3, None, 0])
+            if previous is not None:
+                order = SMILES_BONDS[bond] if bond else 1
+                atoms[previous][3] += order
+                atoms[-1][3] += order
+            previous = len(atoms) - 1
+            bond = None
+        elif kind == 4:
+            if previous is None:
+                raise FormulaError(f"Номер цикла без атома в позиции {position + 1}", position)
+            number = token.lstrip('%')
+            if number in rings:
+                other, ring_bond = rings.pop(number)
+                if other == previous:
+                    raise FormulaError(f"Цикл {number} замкнут на тот же атом в позиции {position + 1}", position)
+                order = SMILES_BONDS[bond or ring_bond] if bond or ring_bond else 1
+                atoms[other][3] += order
+                atoms[previous][3] += order
+            else:
+                rings[number] = (previous, bond)
+            bond = None
+        elif kind == 5:
+            if bond is not None or previous is None:
+                raise FormulaError(f"Неожиданная связь '{token}' в позиции {position + 1}", position)
+            bond = token
+        elif kind == 6:
+            if previous is None or bond is not None:
+                raise FormulaError(f"Неожиданная скобка в позиции {position + 1}", position)
+            branches.append(previous)
+        elif kind == 7:
+            if not branches or bond is not None:
+                raise FormulaError(f"Лишняя закрывающая скобка в позиции {position + 1}", position)
+            previous = branches.pop()
+        else:
+            if bond is not None or branches:
+                raise FormulaError(f"Неожиданная точка в позиции {position + 1}", position)
+            previous = None
+        position = match.end()
+    if bond is not None:
+        raise FormulaError("Строка SMILES заканчивается связью", len(smiles) - 1)
+    if branches:
+        raise FormulaError("Не закрыта скобка ветвления", len(smiles) - 1)
+    if rings:
+        raise FormulaError(f"Не замкнут цикл {next(iter(rings))}", len(smiles) - 1)
+    counts = {}
+    for element, aromatic, hydrogens, bond_orders in atoms:
+        if hydrogens is None:
+            hydrogens = implicit_hydrogens(element, bond_orders, aromatic=aromatic)
+        counts[element] = counts.get(element, 0) + 1
+        if hydrogens:
+            counts['H'] = counts.get('H', 0) + hydrogens
+    return counts
+
+def read_smiles(lines):
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(None, 1)
+        smiles = parts[0]
+        name = parts[1].strip() if len(parts) > 1 else smiles
+        try:
+            counts = smiles_element_counts(smiles)
+        except FormulaError as e:
+            yield MoleculeRecord(line_number, name, smiles, None, str(e))
+            continue
+        yield molecule_record(line_number, name, counts)
+
+def molfile_element_counts(atoms, bonds):
+    for first, second, order in bonds:
+        if first not in atoms or second not in atoms:
+            raise FormulaError(f"Связь ссылается на несуществующий атом {first}-{second}")
+        if order not in MOLFILE_BONDS:
+            raise FormulaError(f"Неподдерживаемый тип связи {order}")
+        for atom in (first, second):
+            atoms[atom][3] += MOLFILE_BONDS[order]
+            atoms[atom][4] = atoms[atom][4] or order == 4
+    counts = {}
+    for symbol, charge, valence, bond_orders, aromatic in atoms.values():
+        if symbol in QUERY_ATOMS:
+            raise FormulaError(f"Неопределенный атом '{symbol}'")
+        symbol = HYDROGEN_ISOTOPES.get(symbol, symbol)
+        if valence == -1:
+            hydrogens = 0
+        elif valence:
+            hydrogens = max(valence - bond_orders, 0)
+        else:
+            hydrogens = implicit_hydrogens(symbol, bond_orders, charge, aromatic)
+        counts[symbol] = counts.get(symbol, 0) + 1
+        if hydrogens:
+            counts['H'] = counts.get('H', 0) + hydrogens
+    return counts
+
+def parse_v2000(lines):
+    atom_count = int(lines[3][0:3])
+    bond_count = int(lines[3][3:6])
+    if len(lines) < 4 + atom_count + bond_count:
+        raise FormulaError("Блок атомов или связей обрезан")
+    atoms = {}
+    for number, line in enumerate(lines[4:4 + atom_count], 1):
+        charge = MOLFILE_CHARGES.get(int(line[36:39].strip() or 0), 0)
+        valence = int(line[48:51].strip() or 0)
+        atoms[number] = [line[31:34].strip(), charge, -1 if valence == 15 else valence, 0, False]
+    bonds = [(int(line[0:3]), int(line[3:6]), int(line[6:9])) for line in lines[4 + atom_count:4 + atom_count + bond_count]]
+    charges_reset = False
+    for line in lines[4 + atom_count + bond_count:]:
+        if line.startswith('M  CHG'):
+            if not charges_reset:
+                for atom in atoms.values():
+                    atom[1] = 0
+                charges_reset = True
+            values = [int(value) for value in line[6:].split()]
+            for atom, charge in zip(values[1::2], values[2::2]):
+                atoms[atom][1] = charge
+    return molfile_element_counts(atoms, bonds)
+
+def v3000_lines(lines):
+    continued = ""
+    for line in lines:
+        if not line.startswith('M  V30 '):
+            continue
+        line = continued + line[7:]
+        if line.endswith('-'):
+            continued = line[:-1]
+            continue
+        continued = ""
+        yield line
+
+def parse_v3000(lines):
+    atoms = {}
+    bonds = []
+    section = None
+    for line in v3000_lines(lines):
+        fields = line.split()
+        if fields[0] in ('BEGIN', 'END'):
+            section = fields[1] if fields[0] == 'BEGIN' else None
+        elif section == 'ATOM':
+            options = dict(field.split('=', 1) for field in fields[6:] if '=' in field)
+            valence = int(options.get('VAL', 0))
+            atoms[int(fields[0])] = [fields[1], int(options.get('CHG', 0)), valence, 0, False]
+        elif section == 'BOND':
+            bonds.append((int(fields[2]), int(fields[3]), int(fields[1])))
+    return molfile_element_counts(atoms, bonds)
+
+def molfile_record(record_number, lines):
+    name = lines[0].strip() if lines else ""
+    name = name or f"Запись {record_number}"
+    try:
+        if len(lines) < 4:
+            raise FormulaError("Неполный блок молекулы")
+        counts = parse_v3000(lines[4:]) if 'V3000' in lines[3] else parse_v2000(lines)
+    except FormulaError as e:
+        return MoleculeRecord(record_number, name, "", None, str(e))
+    except (ValueError, IndexError, KeyError):
+        return MoleculeRecord(record_number, name, "", None, "Поврежденный блок молекулы")
+    return molecule_record(record_number, name, counts)
+
+def read_sdf(lines):
+    record_number = 0
+    block = []
+    in_molfile = True
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line.startswith('$$$$'):
+            record_number += 1
+            yield molfile_record(record_number, block)
+            block = []
+            in_molfile = True
+        elif in_molfile:
+            block.append(line)
+            in_molfile = not line.startswith('M  END')
+    if any(line.strip() for line in block):
+        yield molfile_record(record_number + 1, block)
+
+def read_molecule_file(filename):
+    reader = read_sdf if filename.lower().endswith(SDF_EXTENSIONS) else read_smiles
+    with open(filename, 'r', encoding='utf-8', errors='replace') as file:
+        yield from reader(file)
\ No newline at end of file
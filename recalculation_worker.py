@@ -0,0 +1,11 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class RecalculationWorker(QThread):
+    recalculated = pyqtSignal(object)
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+
+    def run(self):
+        self.recalculated.emit(self.db_manager.recalculate_changed_masses())
\ No newline at end of file
@@ -0,0 +1,141 @@
+import csv
+import datetime
+import json
+import math
+import os
+from collections import namedtuple
+from formula_parser import parse_composition
+from uncertainty import ANALYTIC
+
+ReportRecord = namedtuple('ReportRecord', ['reference', 'name', 'formula', 'molar_mass', 'elements', 'error', 'uncertainty'],
+                          defaults=(None,))
+
+REPORT_FORMATS = {
+    'txt': "Text Files (*.txt)",
+    'csv': "CSV Files (*.csv)",
+    'json': "JSON Files (*.json)",
+}
+
+def report_format_for(filename, selected_filter="", default='txt'):
+    extension = os.path.splitext(filename)[1].lower().lstrip('.')
+    if extension in REPORT_FORMATS:
+        return extension
+    for report_format, file_filter in REPORT_FORMATS.items():
+        if file_filter == selected_filter:
+            return report_format
+    return default
+
+def format_molar_mass(molar_mass, uncertainty=None):
+    if uncertainty is None:
+        return f"{molar_mass:.4f} г/моль"
+    return f"{molar_mass:.4f} ± {uncertainty:.4f} г/моль"
+
+def element_table_from_rows(elements):
+    return {symbol: (name, atomic_mass) for symbol, name, atomic_mass, category in elements}
+
+def build_elements_data(composition, element_table):
+    elements_data = []
+    for symbol, quantity in composition.items():
+        name, atomic_mass = element_table.get(symbol, (symbol, None))
+        contribution = atomic_mass * quantity if atomic_mass is not None else None
+        elements_data.append((symbol, quantity, contribution, atomic_mass, name))
+    return elements_data
+
+def records_from_saved_compounds(compounds, element_table, uncertainty_calculator=None, method=ANALYTIC, batch_size=5000):
+    batch = []
+    for compound in compounds:
+        batch.append(compound)
+        if len(batch) >= batch_size:
+            yield from saved_compound_records(batch, element_table, uncertainty_calculator, method)
+            batch = []
+    if batch:
+        yield from saved_compound_records(batch, element_table, uncertainty_calculator, method)
+
+def saved_compound_records(compounds, element_table, uncertainty_calculator, method):
+    compositions = [parse_composition(compound[4]) for compound in compounds]
+    uncertainties = [None] * len(compounds)
+    if uncertainty_calculator is not None:
+        sigmas = uncertainty_calculator.calculate(compositions, method)[1]
+        uncertainties = [None if math.isnan(sigma) else sigma for sigma in sigmas.tolist()]
+    for (compound_id, name, formula, molar_mass, composition, created_date, tags), elements, uncertainty in zip(compounds, compositions, uncertainties):
+        yield ReportRecord(compound_id, name, formula, molar_mass, build_elements_data(elements, element_table), None, uncertainty)
+
+def records_from_batch_results(results, element_table):
+    for result in results:
+        elements_data = []
+        if result.composition:
+            elements_data = build_elements_data(parse_composition(result.composition), element_table)
+        yield ReportRecord(result.line_number, result.name, result.formula, result.molar_mass, elements_data, result.error,
+                           result.uncertainty)
+
+class ReportGenerator:
+    def write(self, records, filename, report_format=None):
+        with open(filename, 'w', newline='', encoding='utf-8') as file:
+            return self.write_to(records, file, report_format or report_format_for(filename))
+
+    def write_to(self, records, file, report_format):
+        writer = {'csv': self.write_csv, 'json': self.write_json, 'txt': self.write_text}[report_format]
+        return writer(records, file)
+
+    def write_csv(self, records, file):
+        writer = csv.writer(file)
+        writer.writerow(['№', 'Название', 'Формула', 'Молярная масса', 'Погрешность', 'Состав', 'Ошибка'])
+        count = 0
+        for record in records:
+            molar_mass = f"{record.molar_mass:.4f}" if record.molar_mass is not None else ""
+            uncertainty = f"{record.uncertainty:.4g}" if record.uncertainty is not None else ""
+            composition = ";".join(f"{symbol}:{quantity:g}" for symbol, quantity, _, _, _ in record.elements)
+            writer.writerow([record.reference, record.name, record.formula, molar_mass, uncertainty, composition, record.error or ""])
+            count += 1
+        return count
+
+    def write_json(self, records, file):
+        file.write('{"generated": %s, "compounds": [' % json.dumps(self.timestamp()))
+        count = 0
+        for record in records:
+            item = {
+                'reference': record.reference,
+                'name': record.name,
+                'formula': record.formula,
+                'molar_mass': record.molar_mass,
+                'uncertainty': record.uncertainty,
+                'elements': [
+                    {'symbol': symbol, 'name': name, 'quantity': quantity,
+                     'atomic_mass': atomic_mass, 'contribution': contribution}
+                    for symbol, quantity, contribution, atomic_mass, name in record.elements
+                ],
+            }
+            if record.error:
+                item['error'] = record.error
+            file.write((',\n' if count else '\n') + json.dumps(item, ensure_ascii=False))
+            count += 1
+        file.write('\n]}\n')
+        return count
+
+    def write_text(self, records, file):
+        file.write("РЕЗУЛЬТАТЫ РАСЧЕТА МОЛЯРНОЙ МАССЫ\n")
+        file.write("=" * 50 + "\n")
+        file.write(f"Дата расчета: {self.timestamp()}\n")
+        count = 0
+        for record in records:
+            file.write("\n")
+            file.write(f"Соединение: {record.name}\n")
+            file.write(f"Формула: {record.formula}\n")
+            if record.error:
+                file.write(f"Ошибка: {record.error}\n")
+                count += 1
+                continue
+            file.write(f"Молярная масса: {format_molar_mass(record.molar_mass, record.uncertainty)}\n\n")
+            file.write("ДЕТАЛИ РАСЧЕТА:\n")
+            file.write("-" * 50 + "\n")
+            file.write(f"{'Элемент':<15} {'Символ':<10} {'Кол-во':<10} {'Ат. масса':<12} {'Вклад':<12}\n")
+            file.write("-" * 50 + "\n")
+            for symbol, quantity, contribution, atomic_mass, name in record.elements:
+                atomic_mass_text = f"{atomic_mass:.4f}" if atomic_mass is not None else "-"
+                contribution_text = f"{contribution:.4f}" if contribution is not None else "-"
+                file.write(f"{name:<15} {symbol:<10} {quantity:<10g} {atomic_mass_text:<12} {contribution_text:<12}\n")
+            count += 1
+        return count
+
+    def timestamp(self):
+        return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
\ No newline at end of file
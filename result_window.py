@@ -3,13 +3,14 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                              QHeaderView, QGroupBox, QTextEdit, QFileDialog, QMessageBox)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
-import datetime
+from report_generator import ReportGenerator, ReportRecord, REPORT_FORMATS, report_format_for, format_molar_mass
 
 class ResultWindow(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Результаты расчета молярной массы")
         self.resize(700, 600)
+        self.current_record = None
         self.init_ui()
 
     def init_ui(self):
@@ -58,11 +59,12 @@ class ResultWindow(QDialog):
         layout.addLayout(button_layout)
         self.setLayout(layout)
 
-    def show_results(self, compound_name, formula, total_mass, elements_data):
+    def show_results(self, compound_name, formula, total_mass, elements_data, uncertainty=None):
         self.title_label.setText(f"Результаты расчета: {compound_name}")
         self.compound_info.setText(f"Соединение: {compound_name}")
+        self.current_record = ReportRecord(None, compound_name, formula, total_mass, elements_data, None, uncertainty)
         self.formula_display.setPlainText(formula)
-        self.mass_label.setText(f"Молярная масса: {total_mass:.4f} г/моль")
+        self.mass_label.setText(f"Молярная масса: {format_molar_mass(total_mass, uncertainty)}")
         self.details_table.setRowCount(len(elements_data))
         for row, (symbol, count, mass_contribution, atomic_mass, name) in enumerate(elements_data):
             self.details_table.setItem(row, 0, QTableWidgetItem(name))
@@ -73,27 +75,12 @@ class ResultWindow(QDialog):
         self.exec()
 
     def save_results(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Сохранить результаты", "chemical_results.txt", "Text Files (*.txt)")
+        if self.current_record is None:
+            return
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Сохранить результаты", "chemical_results.txt", ";;".join(REPORT_FORMATS.values()))
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as file:
-                    file.write("РЕЗУЛЬТАТЫ РАСЧЕТА МОЛЯРНОЙ МАССЫ\n")
-                    file.write("=" * 50 + "\n")
-                    file.write(f"Дата расчета: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    file.write(f"Соединение: {self.compound_info.text().replace('Соединение: ', '')}\n")
-                    file.write(f"Формула: {self.formula_display.toPlainText()}\n")
-                    file.write(f"Молярная масса: {self.mass_label.text().replace('Молярная масса: ', '')}\n\n")
-                    file.write("ДЕТАЛИ РАСЧЕТА:\n")
-                    file.write("-" * 50 + "\n")
-                    file.write(f"{'Элемент':<15} {'Символ':<10} {'Кол-во':<10} {'Ат. масса':<12} {'Вклад':<12}\n")
-                    file.write("-" * 50 + "\n")
-                    for row in range(self.details_table.rowCount()):
-                        element = self.details_table.item(row, 0).text()
-                        symbol = self.details_table.item(row, 1).text()
-                        count = self.details_table.item(row, 2).text()
-                        atomic_mass = self.details_table.item(row, 3).text()
-                        contribution = self.details_table.item(row, 4).text()
-                        file.write(f"{element:<15} {symbol:<10} {count:<10} {atomic_mass:<12} {contribution:<12}\n")
+                ReportGenerator().write([self.current_record], filename, report_format_for(filename, selected_filter))
                 QMessageBox.information(self, "Успех", "Результаты успешно сохранены!")
             except Exception as e:
                 QMessageBox.warning(self, "Ошибка", f"Не удалось сохранить результаты: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,66 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QComboBox, QSpinBox)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+class SimilarCompoundsDialog(QDialog):
+    def __init__(self, db_manager, index, composition, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.index = index
+        self.composition = composition
+        self.setWindowTitle("Похожие соединения")
+        self.resize(700, 450)
+        self.init_ui()
+        self.find_similar()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        title_label = QLabel("Соединения с близким элементным составом")
+        title_label.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        options_layout = QHBoxLayout()
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItem("Косинусное расстояние", 'cosine')
+        self.metric_combo.addItem("Расстояние L1", 'l1')
+        self.metric_combo.currentIndexChanged.connect(self.find_similar)
+        self.count_input = QSpinBox()
+        self.count_input.setRange(1, 500)
+        self.count_input.setValue(20)
+        self.count_input.valueChanged.connect(self.find_similar)
+        options_layout.addWidget(QLabel("Метрика:"))
+        options_layout.addWidget(self.metric_combo)
+        options_layout.addWidget(QLabel("Количество:"))
+        options_layout.addWidget(self.count_input)
+        options_layout.addStretch()
+        self.results_table = QTableWidget()
+        self.results_table.setColumnCount(4)
+        self.results_table.setHorizontalHeaderLabels(["Название", "Формула", "Молярная масса", "Расстояние"])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.stats_label = QLabel()
+        self.close_button = QPushButton("Закрыть")
+        self.close_button.clicked.connect(self.close)
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.stats_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+        layout.addWidget(title_label)
+        layout.addLayout(options_layout)
+        layout.addWidget(self.results_table)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def find_similar(self):
+        matches = self.index.query(self.composition, self.count_input.value(), self.metric_combo.currentData())
+        compounds = {row[0]: row for row in self.db_manager.iter_saved_compounds([compound_id for compound_id, _ in matches])}
+        matches = [(compounds[compound_id], distance) for compound_id, distance in matches if compound_id in compounds]
+        self.results_table.setRowCount(len(matches))
+        for row, ((compound_id, name, formula, molar_mass, composition, created_date, tags), distance) in enumerate(matches):
+            self.results_table.setItem(row, 0, QTableWidgetItem(name))
+            self.results_table.setItem(row, 1, QTableWidgetItem(formula))
+            self.results_table.setItem(row, 2, QTableWidgetItem(f"{molar_mass:.4f} г/моль"))
+            self.results_table.setItem(row, 3, QTableWidgetItem(f"{distance:.4f}"))
+        self.stats_label.setText(f"Соединений в индексе: {len(self.index)}")
\ No newline at end of file
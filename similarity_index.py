@@ -0,0 +1,133 @@
+import numpy as np
+from formula_parser import parse_composition
+
+class CompositionIndex:
+    def __init__(self, capacity=1024, block_size=65536):
+        self.columns = {}
+        self.vectors = np.zeros((capacity, 16), dtype=np.float32)
+        self.norms = np.zeros(capacity, dtype=np.float32)
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.rows = {}
+        self.size = 0
+        self.block_size = block_size
+
+    @classmethod
+    def from_compounds(cls, compounds):
+        columns = {}
+        ids = []
+        rows = []
+        cols = []
+        values = []
+        for compound_id, composition in compounds:
+            composition = parse_composition(composition)
+            total = sum(count for count in composition.values() if count > 0)
+            row = len(ids)
+            ids.append(compound_id)
+            if total <= 0:
+                continue
+            for symbol, count in composition.items():
+                rows.append(row)
+                cols.append(columns.setdefault(symbol, len(columns)))
+                values.append(count / total)
+        index = cls(capacity=max(len(ids), 1024))
+        index.columns = columns
+        index.vectors = np.zeros((index.vectors.shape[0], max(len(columns), 16)), dtype=np.float32)
+        np.add.at(index.vectors, (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)), np.array(values, dtype=np.float32))
+        index.norms[:len(ids)] = np.linalg.norm(index.vectors[:len(ids)], axis=1)
+        index.ids[:len(ids)] = ids
+        index.rows = {compound_id: row for row, compound_id in enumerate(ids)}
+        index.size = len(ids)
+        return index
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, compound_id):
+        return compound_id in self.rows
+
+    def encode(self, composition, grow=False):
+        if grow:
+            for symbol in composition:
+                if symbol not in self.columns:
+                    self.columns[symbol] = len(self.columns)
+            if len(self.columns) > self.vectors.shape[1]:
+                extra = max(len(self.columns) - self.vectors.shape[1], self.vectors.shape[1])
+                self.vectors = np.hstack([self.vectors, np.zeros((self.vectors.shape[0], extra), dtype=np.float32)])
+        vector = np.zeros(self.vectors.shape[1], dtype=np.float32)
+        total = sum(count for count in composition.values() if count > 0)
+        if total <= 0:
+            return vector, False
+        complete = True
+        for symbol, count in composition.items():
+            column = self.columns.get(symbol)
+            if column is None:
+                complete = False
+            else:
+                vector[column] += count / total
+        return vector, complete
+
+    def add(self, compound_id, composition):
+        if compound_id in self.rows:
+            self.remove(compound_id)
+        vector, _ = self.encode(composition, grow=True)
+        if self.size == self.vectors.shape[0]:
+            capacity = self.size * 2
+            self.vectors = np.resize(self.vectors, (capacity, self.vectors.shape[1]))
+            self.norms = np.resize(self.norms, capacity)
+            self.ids = np.resize(self.ids, capacity)
+        row = self.size
+        self.vectors[row] = vector
+        self.norms[row] = np.linalg.norm(vector)
+        self.ids[row] = compound_id
+        self.rows[compound_id] = row
+        self.size += 1
+
+    def remove(self, compound_id):
+        row = self.rows.pop(compound_id, None)
+        if row is None:
+            return False
+        last = self.size - 1
+        if row != last:
+            self.vectors[row] = self.vectors[last]
+            self.norms[row] = self.norms[last]
+            self.ids[row] = self.ids[last]
+            self.rows[int(self.ids[row])] = row
+        self.size -= 1
+        return True
+
+    def distances(self, vector, metric):
+        if metric == 'cosine':
+            query_norm = np.linalg.norm(vector)
+            if query_norm == 0:
+                return np.ones(self.size, dtype=np.float32)
+            dots = self.vectors[:self.size] @ vector
+            with np.errstate(divide='ignore', invalid='ignore'):
+                similarity = np.where(self.norms[:self.size] > 0, dots / (self.norms[:self.size] * query_norm), 0.0)
+            return 1.0 - similarity
+        if metric == 'l1':
+            result = np.empty(self.size, dtype=np.float32)
+            for start in range(0, self.size, self.block_size):
+                stop = min(start + self.block_size, self.size)
+                result[start:stop] = np.abs(self.vectors[start:stop] - vector).sum(axis=1)
+            return result
+        raise ValueError(f"Неизвестная метрика: {metric}")
+
+    def query(self, composition, k=10, metric='cosine', exclude=()):
+        if self.size == 0:
+            return []
+        vector, complete = self.encode(composition)
+        if not complete and metric == 'l1':
+            missing = sum(count for symbol, count in composition.items() if symbol not in self.columns)
+            vector_total = sum(count for count in composition.values() if count > 0)
+            penalty = missing / vector_total if vector_total else 0.0
+        else:
+            penalty = 0.0
+        distances = self.distances(vector, metric) + penalty
+        for compound_id in exclude:
+            row = self.rows.get(compound_id)
+            if row is not None:
+                distances[row] = np.inf
+        k = min(k, self.size)
+        candidates = np.argpartition(distances, k - 1)[:k]
+        candidates = candidates[np.argsort(distances[candidates], kind='stable')]
+        return [(int(self.ids[row]), float(distances[row])) for row in candidates if np.isfinite(distances[row])]
\ No newline at end of file
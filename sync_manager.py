@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+
+DELTA_FORMAT = 'chemical-calculator-delta'
+DELTA_VERSION = 1
+DELTA_EXTENSION = '.delta.json'
+KEEP_LOCAL = 'local'
+TAKE_INCOMING = 'incoming'
+COMPARED_COLUMNS = {
+    'elements': ('name', 'atomic_mass', 'atomic_number', 'category', 'discovered_year', 'atomic_mass_uncertainty'),
+    'saved_compounds': ('name', 'formula', 'composition', 'tags'),
+}
+
+SyncConflict = namedtuple('SyncConflict', ['table', 'key', 'local', 'incoming'])
+
+class SyncManager:
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+
+    def connect(self):
+        return sqlite3.connect(self.db_manager.db_name, timeout=30)
+
+    def database_id(self):
+        return self.db_manager.get_setting('database_id')
+
+    def peers(self):
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT database_id, imported_change, acknowledged_change, synced_at FROM sync_peers ORDER BY synced_at DESC')
+        peers = cursor.fetchall()
+        conn.close()
+        return peers
+
+    def export_delta(self, filename, peer_id=None, since=None):
+        conn = self.connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN')
+            if since is None:
+                cursor.execute('SELECT acknowledged_change FROM sync_peers WHERE database_id = ?', (peer_id,))
+                row = cursor.fetchone()
+                since = row[0] if row else 0
+            cursor.execute('SELECT COALESCE(MAX(change_id), 0) FROM row_changes')
+            until = cursor.fetchone()[0]
+            cursor.execute('SELECT database_id, imported_change FROM sync_peers')
+            delta = {'format': DELTA_FORMAT, 'version': DELTA_VERSION, 'database_id': self.database_id(),
+                     'since': since, 'until': until, 'acknowledged': dict(cursor.fetchall()), 'tables': {}}
+            for table, (key, columns) in self.db_manager.TRACKED_TABLES.items():
+                extra = ', t.created_date' if table == 'saved_compounds' else ''
+                cursor.execute(f'''
+                    SELECT c.row_key, c.deleted, {', '.join(f't.{column}' for column in columns)}{extra}
+                    FROM row_changes c LEFT JOIN {table} t ON t.{key} = c.row_key
+                    WHERE c.table_name = ? AND c.change_id > ? AND (? IS NULL OR c.origin IS NOT ?)
+                    ORDER BY c.change_id
+                ''', (table, since, peer_id, peer_id))
+                names = [key, 'deleted', *columns] + (['created_date'] if extra else [])
+                delta['tables'][table] = [dict(zip(names, row[:2])) if row[1] else dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+        partial = filename + '.part'
+        with open(partial, 'w', encoding='utf-8') as file:
+            json.dump(delta, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(partial, filename)
+        return {'since': since, 'until': until, 'rows': sum(len(rows) for rows in delta['tables'].values())}
+
+    def read_delta(self, filename):
+        with open(filename, 'r', encoding='utf-8') as file:
+            delta = json.load(file)
+        if not isinstance(delta, dict) or delta.get('format') != DELTA_FORMAT:
+            raise ValueError("Файл не является файлом изменений")
+        if delta.get('version') != DELTA_VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла изменений: {delta.get('version')}")
+        if not isinstance(delta.get('database_id'), str) or not isinstance(delta.get('acknowledged'), dict) or \
+                not all(isinstance(delta.get(field), int) for field in ('since', 'until')):
+            raise ValueError("В файле изменений нет заголовка database_id/since/until/acknowledged")
+        if not isinstance(delta.get('tables'), dict):
+            raise ValueError("В файле изменений нет таблиц")
+        unknown = set(delta['tables']) - set(self.db_manager.TRACKED_TABLES)
+        if unknown:
+            raise ValueError(f"Неизвестные таблицы в файле изменений: {', '.join(sorted(unknown))}")
+        for table, rows in delta['tables'].items():
+            key, columns = self.db_manager.TRACKED_TABLES[table]
+            required = [key, *columns] + (['created_date'] if table == 'saved_compounds' else [])
+            if not isinstance(rows, list):
+                raise ValueError(f"Таблица {table} в файле изменений повреждена")
+            for number, row in enumerate(rows, 1):
+                if not isinstance(row, dict) or key not in row or 'deleted' not in row:
+                    raise ValueError(f"Запись {number} таблицы {table} повреждена")
+                missing = [] if row['deleted'] else [column for column in required if column not in row]
+                if missing:
+                    raise ValueError(f"В записи {row[key]} таблицы {table} нет полей: {', '.join(missing)}")
+        return delta
+
+    def find_conflicts(self, cursor, delta, acknowledged):
+        conflicts = []
+        for table, rows in delta['tables'].items():
+            key, columns = self.db_manager.TRACKED_TABLES[table]
+            compared = COMPARED_COLUMNS[table]
+            for row in rows:
+                cursor.execute('SELECT change_id, origin FROM row_changes WHERE table_name = ? AND row_key = ?', (table, row[key]))
+                change = cursor.fetchone()
+                if change is None or change[0] <= acknowledged or change[1] == delta['database_id']:
+                    continue
+                cursor.execute(f'SELECT {", ".join(compared)} FROM {table} WHERE {key} = ?', (row[key],))
+                local = cursor.fetchone()
+                incoming = None if row['deleted'] else tuple(row[column] for column in compared)
+                if local != incoming:
+                    conflicts.append(SyncConflict(table, row[key], local, incoming))
+        return conflicts
+
+    def apply_row(self, cursor, table, row):
+        key, columns = self.db_manager.TRACKED_TABLES[table]
+        if row['deleted']:
+            cursor.execute(f'DELETE FROM {table} WHERE {key} = ?', (row[key],))
+            return
+        inserted = [key, *columns] + (['created_date'] if table == 'saved_compounds' else [])
+        cursor.execute(f'''
+            INSERT INTO {table} ({', '.join(inserted)}) VALUES ({', '.join('?' * len(inserted))})
+            ON CONFLICT ({key}) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in columns)}
+        ''', [row[column] for column in inserted])
+
+    def import_delta(self, filename, resolution=None):
+        delta = self.read_delta(filename)
+        source = delta['database_id']
+        if source == self.database_id():
+            raise ValueError("Файл изменений создан этой же базой данных")
+        conn = self.connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT imported_change, acknowledged_change FROM sync_peers WHERE database_id = ?', (source,))
+            imported, acknowledged = cursor.fetchone() or (0, 0)
+            result = {'status': 'applied', 'applied': 0, 'skipped': 0, 'conflicts': [], 'elements_changed': False}
+            if delta['since'] > imported:
+                conn.rollback()
+                return dict(result, status='gap', missing=(imported, delta['since']))
+            if delta['until'] <= imported:
+                result['status'] = 'up_to_date'
+            else:
+                conflicts = self.find_conflicts(cursor, delta, acknowledged)
+                if conflicts and resolution not in (KEEP_LOCAL, TAKE_INCOMING):
+                    conn.rollback()
+                    return dict(result, status='conflicts', conflicts=conflicts)
+                skipped = {(conflict.table, conflict.key) for conflict in conflicts} if resolution == KEEP_LOCAL else set()
+                atomic_masses = None
+                for table, rows in delta['tables'].items():
+                    key = self.db_manager.TRACKED_TABLES[table][0]
+                    applied = []
+                    for row in rows:
+                        if (table, row[key]) in skipped:
+                            continue
+                        self.apply_row(cursor, table, row)
+                        applied.append(row[key])
+                    cursor.execute('UPDATE row_changes SET origin = ? WHERE table_name = ? AND row_key IN (SELECT value FROM json_each(?))',
+                                   (source, table, json.dumps(applied)))
+                    if table == 'elements' and applied:
+                        result['elements_changed'] = True
+                    if table == 'saved_compounds' and applied:
+                        atomic_masses = atomic_masses or self.db_manager.read_atomic_masses(cursor)
+                        cursor.execute('SELECT id, composition FROM saved_compounds WHERE composition_key IN (SELECT value FROM json_each(?))',
+                                       (json.dumps(applied),))
+                        for compound_id, composition in cursor.fetchall():
+                            self.db_manager.store_mass_percents(cursor, compound_id, composition, atomic_masses)
+                    result['applied'] += len(applied)
+                result['skipped'] = len(skipped)
+                result['conflicts'] = conflicts
+            cursor.execute('''
+                INSERT INTO sync_peers (database_id, imported_change, acknowledged_change, synced_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (database_id) DO UPDATE SET
+                    imported_change = MAX(imported_change, excluded.imported_change),
+                    acknowledged_change = MAX(acknowledged_change, excluded.acknowledged_change),
+                    synced_at = excluded.synced_at
+            ''', (source, delta['until'], delta['acknowledged'].get(self.database_id(), 0)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Обмен изменениями между базами химических элементов")
+    parser.add_argument('--db', default='chemical_elements.db', help="файл базы данных")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    export_parser = subparsers.add_parser('export', help="записать изменения в файл")
+    export_parser.add_argument('filename')
+    export_parser.add_argument('--peer', default=None, help="идентификатор базы получателя")
+    export_parser.add_argument('--since', type=int, default=None, help="номер изменения, с которого выгружать")
+    import_parser = subparsers.add_parser('import', help="применить файл изменений")
+    import_parser.add_argument('filename')
+    import_parser.add_argument('--resolution', choices=[KEEP_LOCAL, TAKE_INCOMING], default=None,
+                               help="как разрешать конфликты (по умолчанию импорт отменяется)")
+    subparsers.add_parser('status', help="показать идентификатор базы и известные базы")
+    args = parser.parse_args()
+    from database_manager import DatabaseManager
+    manager = SyncManager(DatabaseManager(args.db))
+    if args.command == 'export':
+        summary = manager.export_delta(args.filename, args.peer, args.since)
+        print(f"Изменения {summary['since']}..{summary['until']}: записей {summary['rows']}")
+    elif args.command == 'import':
+        result = manager.import_delta(args.filename, args.resolution)
+        for conflict in result['conflicts']:
+            print(f"Конфликт {conflict.table} {conflict.key}: {conflict.local} / {conflict.incoming}", file=sys.stderr)
+        if result['status'] == 'gap':
+            print(f"Пропущены изменения {result['missing'][0] + 1}..{result['missing'][1]}", file=sys.stderr)
+            sys.exit(1)
+        if result['status'] == 'conflicts':
+            sys.exit(1)
+        print(f"Применено записей: {result['applied']}, оставлено локальных: {result['skipped']}")
+    else:
+        print(f"База данных: {manager.database_id()}")
+        for database_id, imported_change, acknowledged_change, synced_at in manager.peers():
+            print(f"{database_id}\tполучено до {imported_change}\tподтверждено до {acknowledged_change}\t{synced_at}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import numpy as np
+
+ANALYTIC = 'analytic'
+MONTE_CARLO = 'monte_carlo'
+
+class UncertaintyCalculator:
+    def __init__(self, atomic_masses, uncertainties, samples=10000, distribution='normal', seed=None, max_block=4000000):
+        self.symbols = list(atomic_masses)
+        self.columns = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.masses = np.array([atomic_masses[symbol] for symbol in self.symbols], dtype=np.float64)
+        self.uncertainties = np.array([uncertainties.get(symbol, 0.0) for symbol in self.symbols], dtype=np.float64)
+        self.samples = samples
+        self.distribution = distribution
+        self.rng = np.random.default_rng(seed)
+        self.max_block = max_block
+
+    @classmethod
+    def from_arrays(cls, symbols, masses, uncertainties, **options):
+        calculator = cls({}, {}, **options)
+        calculator.symbols = list(symbols)
+        calculator.columns = {symbol: i for i, symbol in enumerate(calculator.symbols)}
+        calculator.masses = masses
+        calculator.uncertainties = uncertainties
+        return calculator
+
+    def composition_matrix(self, compositions):
+        counts = np.zeros((len(compositions), len(self.symbols)), dtype=np.float64)
+        valid = np.ones(len(compositions), dtype=bool)
+        for row, composition in enumerate(compositions):
+            for symbol, count in composition.items():
+                column = self.columns.get(symbol)
+                if column is None:
+                    valid[row] = False
+                    break
+                counts[row, column] += count
+        counts[~valid] = 0.0
+        return counts, valid
+
+    def analytic(self, counts):
+        values = counts @ self.masses
+        sigmas = np.sqrt((counts ** 2) @ (self.uncertainties ** 2))
+        return values, sigmas
+
+    def draw_masses(self, size):
+        if self.distribution == 'uniform':
+            half_width = np.sqrt(3.0) * self.uncertainties
+            return self.rng.uniform(self.masses - half_width, self.masses + half_width, size=(size, len(self.masses)))
+        return self.rng.normal(self.masses, self.uncertainties, size=(size, len(self.masses)))
+
+    def monte_carlo(self, counts):
+        draws = self.draw_masses(self.samples)
+        values = np.empty(len(counts))
+        sigmas = np.empty(len(counts))
+        block = max(1, self.max_block // self.samples)
+        for start in range(0, len(counts), block):
+            totals = draws @ counts[start:start + block].T
+            values[start:start + block] = totals.mean(axis=0)
+            sigmas[start:start + block] = totals.std(axis=0, ddof=1)
+        return values, sigmas
+
+    def calculate(self, compositions, method=ANALYTIC):
+        counts, valid = self.composition_matrix(compositions)
+        if method == MONTE_CARLO:
+            values, sigmas = self.monte_carlo(counts)
+        else:
+            values, sigmas = self.analytic(counts)
+        values[~valid] = np.nan
+        sigmas[~valid] = np.nan
+        return values, sigmas
\ No newline at end of file